@@ -30,12 +30,13 @@
      dscan family: dscan, d2scan, d3scan, d4scan and dmultiscan
      mesh
      fscan
+     region scans: rscan and xafsscan
      scanhist
 """
 
 __all__ = ["a2scan", "a3scan", "a4scan", "amultiscan", "aNscan", "ascan",
            "d2scan", "d3scan", "d4scan", "dmultiscan", "dNscan", "dscan",
-           "fscan", "mesh", 
+           "fscan", "mesh", "aRegionscan", "rscan", "xafsscan",
            "a2scanc", "a3scanc", "a4scanc", "ascanc",
            "d2scanc", "d3scanc", "d4scanc", "dNScanc", "dscanc",
            "meshc", 
@@ -63,6 +64,10 @@ from sardana.util.tree import BranchNode, LeafNode, Tree
 
 UNCONSTRAINED="unconstrained"
 
+#: conversion factor from the photoelectron wave number squared (1/A^2) to
+#: energy above the edge (eV): hbar^2 / (2 * electron mass)
+K2E = 3.80998212
+
 StepMode = 's'
 ContinuousMode = 'c' #TODO: change it to be more verbose e.g. ContinuousSwMode
 ContinuousHwTimeMode = 'ct'
@@ -275,7 +280,9 @@ class aNscan(Hookable):
             motion_time = max_step0_time + self.nr_interv * max_step_time
             # calculate acquisition time
             acq_time = self.nr_points * self.integ_time
-            total_time = motion_time + acq_time
+            # dead time learned from the previous scans
+            dead_time = self.nr_points * gScan.get_point_dead_time()
+            total_time = motion_time + acq_time + dead_time
 
         elif mode == ContinuousMode:
             total_time = gScan.waypoint_estimation()
@@ -596,6 +603,10 @@ class mesh(Macro,Hookable):
     (or monitor counts, if integ_time is negative).
     The scan of motor1 is done at each point scanned by motor2. That is, the
     first motor scan is nested within the second motor scan.
+    In bidirectional mode, the first motor scans each line in the opposite
+    direction of the previous one (s-shaped). In this mode, each record
+    contains the logical grid indexes of the point (mesh_index_1 and
+    mesh_index_2 columns) so the map can be reconstructed.
     """
     
     hints = { 'scan' : 'mesh', 'allowsHooks': ('pre-scan', 'pre-move', 'post-move', 'pre-acq', 'post-acq', 'post-step', 'post-scan') }
@@ -630,12 +641,19 @@ class mesh(Macro,Hookable):
         moveables=self.motors
         env=opts.get('env',{})
         constrains=[getCallable(cns) for cns in opts.get('constrains',[UNCONSTRAINED])]
+        extrainfodesc = []
+        if self.bidirectional_mode:
+            extrainfodesc = [ColumnDesc(name='mesh_index_%d' % (i + 1),
+                                        label='%s index' % motor.getName(),
+                                        dtype='int64', shape=(1,))
+                             for i, motor in enumerate(self.motors)]
     
         #Hooks are not always set at this point. We will call getHooks later on in the scan_loop
         #self.pre_scan_hooks = self.getHooks('pre-scan')
         #self.post_scan_hooks = self.getHooks('post-scan')
 
-        self._gScan=SScan(self, generator, moveables, env, constrains)
+        self._gScan=SScan(self, generator, moveables, env, constrains,
+                          extrainfodesc)
 
     def _generator(self):
         step = {}
@@ -651,15 +669,20 @@ class mesh(Macro,Hookable):
         points1,points2=self.nr_intervs+1
         point_no=1
         m1_space = numpy.linspace(m1start,m1end,points1)
-        m1_space_inv = numpy.linspace(m1end,m1start,points1)
+        m1_indexes = range(points1)
+        if self.bidirectional_mode:
+            extrainfo = step["extrainfo"] = {}
                                 
         for i, m2pos in enumerate(numpy.linspace(m2start,m2end,points2)):
-            space = m1_space
+            indexes = m1_indexes
             if i % 2 != 0 and self.bidirectional_mode:
-                space = m1_space_inv
-            for m1pos in space:
-                step["positions"] = numpy.array([m1pos,m2pos])
+                indexes = reversed(m1_indexes)
+            for j in indexes:
+                step["positions"] = numpy.array([m1_space[j],m2pos])
                 step["point_id"]= point_no  #TODO: maybe another ID would be better? (e.g. "(A,B)")
+                if self.bidirectional_mode:
+                    extrainfo["mesh_index_1"] = j
+                    extrainfo["mesh_index_2"] = i
                 point_no+=1
                 yield step
     
@@ -738,6 +761,17 @@ class fscan(Macro, Hookable):
     time to each acquisition point.
     -If integ_time is positive, it specifies seconds and if negative, specifies
     monitor counts.
+    -Each func is evaluated for all the points at once, with the independent
+    variables as arrays, unless it can only be evaluated point by point
+    (e.g. it uses python conditionals) or it uses random functions (e.g.
+    rand(), which is then called once per point). Long paths evaluated point
+    by point are evaluated in chunks while scanning.
+    -The points are visited in the given order unless the ScanPointOrder
+    environment variable is set to "nearest". In this case the points are
+    visited in the order which minimizes the motion time (the next point
+    is the one that can be reached faster from the current one). Each record
+    then contains the index of the point in the paths (point_index column).
+    This is meant for point sets of up to a few thousand points.
 
     IMPORTANT Notes:
     -no spaces are allowed in the indepvar string.
@@ -760,6 +794,16 @@ class fscan(Macro, Hookable):
          None, 'List of motor and path curves']
     ]
 
+    #: maximum number of points evaluated at once when the path expressions
+    #: have to be evaluated point by point
+    PathChunkSize = 10000
+
+    #: names of the functions giving a different value at each call. The
+    #: expressions using them are evaluated point by point so each point
+    #: gets its own value
+    RandomFunctions = ('rand', 'randn', 'randint', 'random', 'random_sample',
+                       'uniform', 'normal', 'choice', 'shuffle')
+
     def prepare(self, *args, **opts):
         if args[0].lower() in ["!", "*", "none", None]:
             indepvars = {}
@@ -770,33 +814,23 @@ class fscan(Macro, Hookable):
         self.motors = [item[0] for item in args[2]]
         self.funcstrings = [item[1] for item in args[2]]
 
-        globals_lst = [dict(zip(indepvars, values)) for values in zip(*indepvars.values())]
-        self.paths = [[SafeEvaluator(globals).eval(func) for globals in globals_lst] for func in self.funcstrings]
-
         self.integ_time = numpy.array(eval(args[1]), dtype='d')
 
         self.opts = opts
-        if len(self.motors) == len(self.paths) > 0:
+        if len(self.motors) == len(self.funcstrings) > 0:
             self.N = len(self.motors)
         else:
             raise ValueError('Moveable and func lists must be non-empty and same length')
-        npoints = len(self.paths[0])
-        try:
-            # if everything is OK, the following lines should return a 2D array
-            # n which each motor path is a row.
-            # Typical failure is due to shape mismatch due to inconsistent input
-            self.paths = numpy.array(self.paths, dtype='d')
-            self.paths.reshape((self.N, npoints))
-        except:  # shape mismatch?
-            # try to give a meaningful description of the error
-            for p, fs in zip(self.paths, self.funcstrings):
-                if len(p) != npoints:
-                    raise ValueError(
-                        '"%s" and "%s" yield different number of points (%i vs %i)'
-                        % (self.funcstrings[0], fs, npoints, len(p)))
-            raise  # the problem wasn't a shape mismatch
+        # there is one point for each value of the (shortest) independent
+        # variable
+        npoints = 0
+        if indepvars:
+            npoints = min(map(len, indepvars.values()))
+        self.indepvars = indepvars
         self.nr_points = npoints
 
+        self._preparePaths()
+
         if self.integ_time.size == 1:
             self.integ_time = self.integ_time * numpy.ones(self.nr_points)  # extend integ_time
         elif self.integ_time.size != self.nr_points:
@@ -809,11 +843,117 @@ class fscan(Macro, Hookable):
         env = opts.get('env', {})
         constrains = [getCallable(cns) for cns in opts.get('constrains', [UNCONSTRAINED])]
 
+        point_order = opts.get('point_order')
+        if point_order is None:
+            try:
+                point_order = self.getEnv('ScanPointOrder')
+            except UnknownEnv:
+                point_order = 'given'
+        point_order = point_order.lower()
+        if point_order not in ('given', 'nearest'):
+            raise ValueError('ScanPointOrder must be "given" or "nearest"')
+        extrainfodesc = []
+        self.point_indexes = None
+        if point_order == 'nearest':
+            extrainfodesc = [ColumnDesc(name='point_index', dtype='int64',
+                                        shape=(1,))]
+
         # Hooks are not always set at this point. We will call getHooks later on in the scan_loop
         # self.pre_scan_hooks = self.getHooks('pre-scan')
         # self.post_scan_hooks = self.getHooks('post-scan'
 
-        self._gScan = SScan(self, generator, moveables, env, constrains)
+        self._gScan = SScan(self, generator, moveables, env, constrains,
+                            extrainfodesc)
+
+        if point_order == 'nearest':
+            self._sortPoints()
+
+    def _preparePaths(self):
+        """Evaluates each path over all points at once when possible. Paths
+        too long to be evaluated point by point now are evaluated in chunks
+        while scanning: their first point is evaluated now so that a wrong
+        expression fails before the scan starts"""
+        npoints = self.nr_points
+        self._paths = [self._evalPath(func) for func in self.funcstrings]
+        self.paths = None
+        if npoints <= self.PathChunkSize:
+            self.paths = self._getPaths(0, npoints)
+        else:
+            self._getPaths(0, 1)
+
+    def _evalPath(self, func):
+        """Evaluates the path expression with the independent variables as
+        arrays so all points are calculated at once. Returns None if the
+        expression does not give one value per point this way (ex: it uses
+        python conditionals or functions which are not element-wise) or if
+        it uses random functions (a single call would give the same value to
+        all points).
+        Floating point errors (ex: division by zero) are raised as they
+        would be when evaluating point by point"""
+        try:
+            names = compile(func, '<path>', 'eval').co_names
+        except SyntaxError:
+            return None
+        if set(names).intersection(self.RandomFunctions):
+            return None
+        npoints = self.nr_points
+        variables = dict((name, numpy.asarray(values)[:npoints])
+                         for name, values in self.indepvars.items())
+        try:
+            with numpy.errstate(divide='raise', invalid='raise'):
+                path = numpy.array(SafeEvaluator(variables).eval(func),
+                                   dtype='d')
+        except FloatingPointError, e:
+            raise ValueError('"%s" can not be evaluated: %s' % (func, e))
+        except Exception:
+            return None
+        if path.shape != (npoints,):
+            return None
+        return path
+
+    def _evalPathPoints(self, func, start, end):
+        """Evaluates the path expression point by point for the points in
+        [start, end)"""
+        evaluator = SafeEvaluator({})
+        safe_dict = evaluator.safe_dict
+        indepvars = self.indepvars.items()
+        path = numpy.empty(end - start)
+        for i in xrange(start, end):
+            for name, values in indepvars:
+                safe_dict[name] = values[i]
+            try:
+                with numpy.errstate(divide='raise', invalid='raise'):
+                    path[i - start] = evaluator.eval(func)
+            except FloatingPointError, e:
+                raise ValueError('"%s" can not be evaluated: %s' % (func, e))
+            except (TypeError, ValueError):
+                raise ValueError('"%s" must yield one value per point' % func)
+        return path
+
+    def _getPaths(self, start, end):
+        """Returns the motor paths (one row per motor) for the points in
+        [start, end)"""
+        if self.paths is not None:
+            return self.paths[:, start:end]
+        paths = numpy.empty((self.N, end - start))
+        for i, (func, path) in enumerate(zip(self.funcstrings, self._paths)):
+            if path is None:
+                paths[i] = self._evalPathPoints(func, start, end)
+            else:
+                paths[i] = path[start:end]
+        return paths
+
+    def _sortPoints(self):
+        """Reorders the points to minimize the motion time"""
+        if self.paths is None:
+            self.paths = self._getPaths(0, self.nr_points)
+        gScan = self._gScan
+        origin = gScan.motion.readPosition(force=True)
+        order = get_visit_order(gScan.get_virtual_motors(), origin,
+                                self.paths.T)
+        self.paths = self.paths[:, order]
+        self.integ_time = self.integ_time[order]
+        self.point_indexes = order
 
     def _generator(self):
         step = {}
@@ -824,10 +964,105 @@ class fscan(Macro, Hookable):
         step["post-step-hooks"] = self.getHooks('post-step')
 
         step["check_func"] = []
-        for i in xrange(self.nr_points):
-            step["positions"] = self.paths[:, i]
-            step["integ_time"] = self.integ_time[i]
-            step["point_id"] = i
+        point_indexes = self.point_indexes
+        if point_indexes is not None:
+            extrainfo = step["extrainfo"] = {}
+        # very long paths which could not be evaluated at once are evaluated
+        # in chunks while scanning
+        npoints, chunk_size = self.nr_points, self.PathChunkSize
+        for start in xrange(0, npoints, chunk_size):
+            end = min(start + chunk_size, npoints)
+            paths = self._getPaths(start, end)
+            for i in xrange(start, end):
+                step["positions"] = paths[:, i - start]
+                step["integ_time"] = self.integ_time[i]
+                step["point_id"] = i
+                if point_indexes is not None:
+                    step["point_id"] = extrainfo["point_index"] = point_indexes[i]
+                yield step
+
+    def run(self, *args):
+        for step in self._gScan.step_scan():
+            yield step
+
+    @property
+    def data(self):
+        return self._gScan.data
+
+def get_region_positions(start_pos, final_pos, step_size):
+    """Returns the positions of a region: from start_pos towards final_pos
+    every step_size. final_pos is included if it falls on a step"""
+    if step_size == 0:
+        raise ValueError('Region step size must not be 0')
+    length = abs(final_pos - start_pos)
+    step_size = abs(step_size)
+    # tolerate rounding errors when final_pos falls on a step
+    nr_interv = int(numpy.floor(length / step_size + 1e-9))
+    direction = 1 if final_pos >= start_pos else -1
+    return start_pos + direction * step_size * numpy.arange(nr_interv + 1)
+
+
+class aRegionscan(Hookable):
+    """Scan of one moveable through consecutive regions, each one with its
+    own positions and integration time. This is **not** meant to be called
+    by the user, but as a generic base to construct rscan and xafsscan.
+
+    All the regions are scanned as a single scan (single setup and record
+    list). A region starting where the previous one ended does not repeat
+    that point. Each record contains the index of its region (region
+    column)"""
+
+    hints = {'scan': 'aRegionscan', 'allowsHooks': ('pre-scan', 'pre-move', 'post-move', 'pre-acq', 'post-acq', 'post-step', 'post-scan')}
+
+    def _prepare(self, motor, regions, **opts):
+        """:param regions: sequence of (positions, integration time)"""
+        positions, integ_times, region_nbs = [], [], []
+        last_pos = None
+        for region_nb, (region_positions, integ_time) in enumerate(regions):
+            region_positions = numpy.asarray(region_positions, dtype='d')
+            if last_pos is not None and len(region_positions) and \
+                    numpy.isclose(region_positions[0], last_pos):
+                region_positions = region_positions[1:]
+            if not len(region_positions):
+                continue
+            nr_points = len(region_positions)
+            positions.append(region_positions)
+            integ_times.append(numpy.repeat(float(integ_time), nr_points))
+            region_nbs.append(numpy.repeat(region_nb, nr_points))
+            last_pos = region_positions[-1]
+        if not positions:
+            raise ValueError('Regions must contain at least one point')
+        self.motors = [motor]
+        self.positions = numpy.concatenate(positions)
+        self.integ_times = numpy.concatenate(integ_times)
+        self.region_nbs = numpy.concatenate(region_nbs)
+        self.nr_points = len(self.positions)
+        self.opts = opts
+        self.name = opts.get('name', 'rscan')
+
+        moveables = [MoveableDesc(moveable=motor, is_reference=True,
+                                  min_value=self.positions.min(),
+                                  max_value=self.positions.max())]
+        env = opts.get('env', {})
+        constrains = [getCallable(cns) for cns in opts.get('constrains', [UNCONSTRAINED])]
+        extrainfodesc = [ColumnDesc(name='region', dtype='int64', shape=(1,))]
+        self._gScan = SScan(self, self._generator, moveables, env, constrains,
+                            extrainfodesc)
+
+    def _generator(self):
+        step = {}
+        step["pre-move-hooks"] = self.getHooks('pre-move')
+        step["post-move-hooks"] = self.getHooks('post-move')
+        step["pre-acq-hooks"] = self.getHooks('pre-acq')
+        step["post-acq-hooks"] = self.getHooks('post-acq') + self.getHooks('_NOHINTS_')
+        step["post-step-hooks"] = self.getHooks('post-step')
+        step["check_func"] = []
+        extrainfo = step["extrainfo"] = {}
+        for point_no in xrange(self.nr_points):
+            step["positions"] = self.positions[point_no:point_no + 1]
+            step["integ_time"] = self.integ_times[point_no]
+            step["point_id"] = point_no
+            extrainfo["region"] = self.region_nbs[point_no]
             yield step
 
     def run(self, *args):
@@ -838,6 +1073,86 @@ class fscan(Macro, Hookable):
     def data(self):
         return self._gScan.data
 
+
+class rscan(aRegionscan, Macro):
+    """Region scan: absolute step scan of a moveable through a list of
+    consecutive regions, each one with its own step size and integration
+    time (ex: pre-edge, edge and post-edge of an absorption spectrum).
+    The regions are scanned as a single scan so they are recorded in a
+    single record list.
+
+    EXAMPLE: rscan energy [[7000 7100 5 1] [7100 7150 0.5 2] [7150 7500 2 1]]
+    """
+
+    hints = copy.deepcopy(aRegionscan.hints)
+    hints['scan'] = 'rscan'
+    env = ('ActiveMntGrp',)
+
+    param_def = [
+        ['motor', Type.Moveable, None, 'Moveable to move'],
+        ['regions',
+         ParamRepeat(['start_pos', Type.Float, None, 'Region start position'],
+                     ['final_pos', Type.Float, None, 'Region final position'],
+                     ['step_size', Type.Float, None, 'Region step size'],
+                     ['integ_time', Type.Float, None, 'Region integration time']),
+         None, 'List of regions: start, final, step size and integration time']
+    ]
+
+    def prepare(self, motor, regions, **opts):
+        regions = [(get_region_positions(start_pos, final_pos, step_size),
+                    integ_time)
+                   for start_pos, final_pos, step_size, integ_time in regions]
+        opts.setdefault('name', 'rscan')
+        self._prepare(motor, regions, **opts)
+
+
+class xafsscan(aRegionscan, Macro):
+    """X-ray absorption fine structure scan: region scan of an energy
+    moveable (eV) where each region is either defined in energy relative
+    to the edge (space E, eV) or in photoelectron wave number above the edge
+    (space k, 1/A). In k regions the points are equally spaced in k (so
+    they get further apart in energy).
+    The regions are scanned as a single scan so they are recorded in a
+    single record list.
+
+    EXAMPLE: xafsscan energy 7112 [[E -150 -20 5 1] [E -20 30 0.5 1] [k 2.9 12 0.05 2]]
+    """
+
+    hints = copy.deepcopy(aRegionscan.hints)
+    hints['scan'] = 'xafsscan'
+    env = ('ActiveMntGrp',)
+
+    param_def = [
+        ['motor', Type.Moveable, None, 'Energy moveable (eV)'],
+        ['edge_energy', Type.Float, None, 'Edge energy (eV)'],
+        ['regions',
+         ParamRepeat(['space', Type.String, None, 'E (energy relative to the edge) or k (wave number)'],
+                     ['start_pos', Type.Float, None, 'Region start (eV or 1/A)'],
+                     ['final_pos', Type.Float, None, 'Region final (eV or 1/A)'],
+                     ['step_size', Type.Float, None, 'Region step size (eV or 1/A)'],
+                     ['integ_time', Type.Float, None, 'Region integration time']),
+         None, 'List of regions: space, start, final, step size and integration time']
+    ]
+
+    def prepare(self, motor, edge_energy, regions, **opts):
+        energy_regions = []
+        for space, start_pos, final_pos, step_size, integ_time in regions:
+            positions = get_region_positions(start_pos, final_pos, step_size)
+            space = space.lower()
+            if space == 'e':
+                positions = edge_energy + positions
+            elif space == 'k':
+                if min(start_pos, final_pos) < 0:
+                    raise ValueError('k regions must be positive')
+                positions = edge_energy + K2E * positions ** 2
+            else:
+                raise ValueError('Invalid region space %s (must be E or k)'
+                                 % space)
+            energy_regions.append((positions, integ_time))
+        opts.setdefault('name', 'xafsscan')
+        self._prepare(motor, energy_regions, **opts)
+
+
 class ascanh(aNscan, Macro): 
     """Do an absolute scan of the specified motor.
     ascan scans one motor, as specified by motor. The motor starts at the
@@ -1290,7 +1605,12 @@ class ascanct(aNscan, Macro):
       and which will maintain during the InitialDelayTime.  
     +) following commands:
     - Start 
-    - Stop)'''
+    - Stop)
+    If "TriggerDevice" is not set, the experimental channels generate their
+    own triggers (ex: dummy counter/timer channels in gate mode): in time or
+    by the position of the first motor (physical motors only), depending on
+    the "TriggerSource" environment variable (time or position, default:
+    time).'''
 
     hints = {'scan' : 'ascanct', 'allowsHooks': ('pre-configuration', 
                                                  'post-configuration', 
@@ -1337,7 +1657,12 @@ class a2scanct(aNscan, Macro):
       and which will maintain during the InitialDelayTime.  
     +) following commands:
     - Start 
-    - Stop)'''
+    - Stop)
+    If "TriggerDevice" is not set, the experimental channels generate their
+    own triggers (ex: dummy counter/timer channels in gate mode): in time or
+    by the position of the first motor (physical motors only), depending on
+    the "TriggerSource" environment variable (time or position, default:
+    time).'''
 
     hints = {'scan' : 'a2scanct', 'allowsHooks': ('pre-configuration', 
                                                   'post-configuration',
@@ -1388,7 +1713,12 @@ class a3scanct(aNscan, Macro):
       and which will maintain during the InitialDelayTime.  
     +) following commands:
     - Start 
-    - Stop)'''
+    - Stop)
+    If "TriggerDevice" is not set, the experimental channels generate their
+    own triggers (ex: dummy counter/timer channels in gate mode): in time or
+    by the position of the first motor (physical motors only), depending on
+    the "TriggerSource" environment variable (time or position, default:
+    time).'''
     hints = {'scan' : 'a2scanct', 'allowsHooks': ('pre-configuration', 
                                                   'post-configuration',
                                                   'pre-start',
@@ -1439,7 +1769,12 @@ class a4scanct(aNscan, Macro):
       and which will maintain during the InitialDelayTime.  
     +) following commands:
     - Start 
-    - Stop)'''
+    - Stop)
+    If "TriggerDevice" is not set, the experimental channels generate their
+    own triggers (ex: dummy counter/timer channels in gate mode): in time or
+    by the position of the first motor (physical motors only), depending on
+    the "TriggerSource" environment variable (time or position, default:
+    time).'''
 
     hints = {'scan' : 'a2scanct', 'allowsHooks': ('pre-configuration', 
                                                   'post-configuration',
@@ -26,7 +26,8 @@
 """Tests for scan macros"""
 
 from taurus.external import unittest
-from sardana.macroserver.macros.test import (RunStopMacroTestCase,
+from sardana.macroserver.macros.test import (RunMacroTestCase,
+                                             RunStopMacroTestCase,
                                              testRun, testStop, getMotors)
 
 #get handy motor names from sardemo
@@ -166,3 +167,83 @@ class MeshTest(RunStopMacroTestCase, unittest.TestCase):
     stoped. See :class:`.RunStopMacroTestCase` for requirements.
     """
     macro_name = 'mesh'
+
+
+@testRun(macro_params=['x=[0,1,2]', '.1', _m1, 'x'], wait_timeout=30)
+class FscanTest(RunMacroTestCase, unittest.TestCase):
+
+    """Test of fscan macro. It verifies that macro fscan can be executed
+    when the optional ScanPointOrder environment variable is not defined.
+    See :class:`.RunMacroTestCase` for requirements.
+    """
+    macro_name = 'fscan'
+
+    def setUp(self):
+        """Preconditions:
+        - Those from :class:`.RunMacroTestCase`
+        - the ScanPointOrder environment variable is not defined
+        """
+        RunMacroTestCase.setUp(self)
+        self.macro_runs(macro_name='senv',
+                        macro_params=['ScanPointOrder', 'given'])
+        self.macro_runs(macro_name='usenv', macro_params=['ScanPointOrder'])
+
+
+@testRun(macro_params=[_m1, '0', '1', '5', '.2'], wait_timeout=60)
+class AscanctTest(RunMacroTestCase, unittest.TestCase):
+
+    """Test of ascanct macro with the dummy motor and counter/timer
+    controllers of sardemo (no trigger device: the channels trigger
+    themselves in time). It verifies that all the points are acquired.
+    See :class:`.RunMacroTestCase` for requirements.
+    """
+    macro_name = 'ascanct'
+    trigger_source = 'time'
+
+    def setUp(self):
+        """Preconditions:
+        - Those from :class:`.RunMacroTestCase`
+        - the TriggerDevice environment variable is not defined
+        - the TriggerSource environment variable is trigger_source
+        """
+        RunMacroTestCase.setUp(self)
+        RunMacroTestCase.macro_runs(self, macro_name='senv',
+                                    macro_params=['TriggerDevice', 'none'])
+        RunMacroTestCase.macro_runs(self, macro_name='usenv',
+                                    macro_params=['TriggerDevice'])
+        RunMacroTestCase.macro_runs(self, macro_name='senv',
+                                    macro_params=['TriggerSource',
+                                                  self.trigger_source])
+
+    def tearDown(self):
+        RunMacroTestCase.macro_runs(self, macro_name='usenv',
+                                    macro_params=['TriggerSource'])
+        RunMacroTestCase.tearDown(self)
+
+    def macro_runs(self, macro_params=None, wait_timeout=float("inf")):
+        """Reimplementation of macro_runs method for ascanct macro.
+        It verifies that one record is stored per scan point and that the
+        motor positions are within the scan range.
+        """
+        RunMacroTestCase.macro_runs(self, macro_params=macro_params,
+                                    wait_timeout=wait_timeout)
+        mot_name = macro_params[0]
+        start, end = float(macro_params[1]), float(macro_params[2])
+        nr_of_points = int(macro_params[3])
+        data = self.macro_executor.getData()
+        self.assertEqual(len(data), nr_of_points,
+                         "Number of records differs from the number of points")
+        for record in data.values():
+            position = record.data[mot_name]
+            self.assertTrue(min(start, end) <= position <= max(start, end),
+                            "Position %f is out of the scan range" % position)
+
+
+@testRun(macro_params=[_m1, '0', '1', '5', '.2'], wait_timeout=60)
+class AscanctPositionTest(AscanctTest):
+
+    """Test of ascanct macro when the channels trigger themselves by the
+    position of the motor (TriggerSource environment variable is position).
+    See :class:`AscanctTest` for requirements.
+    """
+    trigger_source = 'position'
@@ -52,11 +52,15 @@ from sardana.macroserver.msmacromanager import MacroManager
 from sardana.macroserver.msrecordermanager import RecorderManager
 from sardana.macroserver.mstypemanager import TypeManager
 from sardana.macroserver.msenvmanager import EnvironmentManager
+from sardana.macroserver.msindex import ElementIndex
 from sardana.macroserver.msparameter import ParamType
 from sardana.macroserver.msexception import UnknownMacroLibrary
 
 CHANGE_EVT_TYPES = TaurusEventType.Change, TaurusEventType.Periodic
 
+#: characters which make a find_objects parameter a regular expression
+_RE_SPECIAL_CHARS = frozenset(".^$*+?{}[]\\|()")
+
 ET = ElementType
 #: dictionary dict<:data:`~sardana.ElementType`, :class:`tuple`> 
 #: where tuple is a sequence:
@@ -145,6 +149,7 @@ class MacroServer(MSContainer, MSObject, SardanaElementManager, SardanaIDManager
         self._pools = CaselessDict()
         self._max_parallel_macros = self.MaxParalellMacros
         self._path_id = None
+        self._element_index = ElementIndex(self)
         
         MSContainer.__init__(self)
         MSObject.__init__(self, full_name=full_name, name=name, id=InvalidId,
@@ -207,6 +212,7 @@ class MacroServer(MSContainer, MSObject, SardanaElementManager, SardanaIDManager
             seq<str>
         """
         self.macro_manager.setMacroPath(macro_path)
+        self._element_index.invalidate_local()
 
     # --------------------------------------------------------------------------
     # Recorder path related methods
@@ -306,6 +312,7 @@ class MacroServer(MSContainer, MSObject, SardanaElementManager, SardanaIDManager
             self._pools[name] = pool
             elements_attr = pool.getAttribute("Elements")
             elements_attr.addListener(self.on_pool_elements_changed)
+        self._element_index.invalidate_pools()
     
     def get_pool_names(self):
         """Returns the list of names of the pools this macro server is connected
@@ -336,6 +343,7 @@ class MacroServer(MSContainer, MSObject, SardanaElementManager, SardanaIDManager
     def on_pool_elements_changed(self, evt_src, evt_type, evt_value):
         if evt_type not in CHANGE_EVT_TYPES:
             return
+        self._element_index.invalidate_pools()
         self.fire_event(EventType("PoolElementsChanged"), evt_value)
     
     # --------------------------------------------------------------------------
@@ -428,6 +436,10 @@ class MacroServer(MSContainer, MSObject, SardanaElementManager, SardanaIDManager
     @property
     def type_manager(self):
         return self._type_manager
+
+    @property
+    def element_index(self):
+        return self._element_index
     
     # --------------------------------------------------------------------------
     # (Re)load code
@@ -447,6 +459,7 @@ class MacroServer(MSContainer, MSObject, SardanaElementManager, SardanaIDManager
         new_elements, changed_elements, deleted_elements = [], [], []
         
         new_lib = manager.reloadMacroLib(lib_name)
+        self._element_index.invalidate_local()
         if new_lib.has_errors():
             return new_lib
 
@@ -737,8 +750,15 @@ class MacroServer(MSContainer, MSObject, SardanaElementManager, SardanaIDManager
             else:
                 type_name_list = type_class
         obj_set = set()
-        param = [ '^%s$' % x for x in param ]
-        re_objs = map(re.compile, param, len(param) * (re.IGNORECASE,))
+        # plain names are looked up directly in the element index. Only
+        # real patterns need to be matched against every object
+        names, patterns = [], []
+        for x in param:
+            if _RE_SPECIAL_CHARS.intersection(x):
+                patterns.append('^%s$' % x)
+            else:
+                names.append(x)
+        re_objs = [ re.compile(x, re.IGNORECASE) for x in patterns ]
         re_subtype = re.compile(subtype, re.IGNORECASE)
         for type_name in type_name_list:
             type_class_name = type_name
@@ -747,22 +767,26 @@ class MacroServer(MSContainer, MSObject, SardanaElementManager, SardanaIDManager
             type_inst = self.get_data_type(type_class_name)
             if not type_inst.hasCapability(ParamType.ItemList):
                 continue
-            if self.is_macroserver_interface(type_class_name):
-                for name, obj in type_inst.getObjDict(pool=pool).items():
+            obj_dict = type_inst.getObjDict(pool=pool, cache=True)
+            objs = [ obj_dict[name] for name in names if name in obj_dict ]
+            if re_objs:
+                for name, obj in obj_dict.items():
                     for re_obj in re_objs:
                         if re_obj.match(name) is not None:
-                            obj_type = ElementType[obj.get_type()]
-                            if subtype is MacroServer.All or re_subtype.match(obj_type):
-                                obj_set.add(obj)
+                            objs.append(obj)
+                            break
+            if self.is_macroserver_interface(type_class_name):
+                for obj in objs:
+                    obj_type = ElementType[obj.get_type()]
+                    if subtype is MacroServer.All or re_subtype.match(obj_type):
+                        obj_set.add(obj)
             else:
-                for name, obj in type_inst.getObjDict(pool=pool).items():
-                    for re_obj in re_objs:
-                        if re_obj.match(name) is not None:
-                            obj_type = obj.getType()
-                            if (subtype is MacroServer.All or \
-                                re_subtype.match(obj.getType())) and \
-                               obj_type != "MotorGroup":
-                                obj_set.add(obj)
+                for obj in objs:
+                    obj_type = obj.getType()
+                    if (subtype is MacroServer.All or \
+                        re_subtype.match(obj.getType())) and \
+                       obj_type != "MotorGroup":
+                        obj_set.add(obj)
         return list(obj_set)
     
     def get_motion(self, elems, motion_source=None, read_only=False, cache=True,
@@ -39,7 +39,8 @@ from sardana.sardanaevent import EventType
 
 from sardana.macroserver.msbase import MSObject
 from sardana.macroserver.msparameter import Type
-from sardana.macroserver.msexception import MacroServerException
+from sardana.macroserver.msexception import MacroServerException, \
+    UnknownMacro
 
 
 class MacroProxy(object):
@@ -69,6 +70,10 @@ class MacroProxy(object):
 
 
 class MacroProxyCache(dict):
+    """Macro proxies of a door indexed by macro name. A proxy is only created
+    the first time it is requested (as item or as attribute) and it is
+    recreated if the macro has been reloaded since then. Therefore, iterating
+    over the cache only gives the proxies requested so far."""
 
     def __init__(self, door):
         self._door = weakref.ref(door)
@@ -79,11 +84,41 @@ class MacroProxyCache(dict):
         return self._door()
 
     def rebuild(self):
+        """Discards all proxies. They are recreated on demand"""
         self.clear()
+
+    def __getitem__(self, macro_name):
         door = self.door
-        macros = self.door.get_macros()
-        for macro_name, macro_meta in macros.items():
-            self[macro_name] = MacroProxy(door, macro_meta)
+        try:
+            macro_meta = door.get_macro(macro_name)
+        except UnknownMacro:
+            raise KeyError(macro_name)
+        proxy = dict.get(self, macro_name)
+        if proxy is None or proxy.macro_info is not macro_meta:
+            proxy = MacroProxy(door, macro_meta)
+            dict.__setitem__(self, macro_name, proxy)
+        return proxy
+
+    def __contains__(self, macro_name):
+        try:
+            self.door.get_macro(macro_name)
+        except UnknownMacro:
+            return False
+        return True
+
+    def get(self, macro_name, default=None):
+        try:
+            return self[macro_name]
+        except KeyError:
+            return default
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        try:
+            return self[name]
+        except KeyError:
+            raise AttributeError(name)
 
 
 class BaseInputHandler(object):
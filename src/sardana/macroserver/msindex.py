@@ -0,0 +1,242 @@
+#!/usr/bin/env python
+
+##############################################################################
+##
+## This file is part of Sardana
+##
+## http://www.sardana-controls.org/
+##
+## Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+## Sardana is free software: you can redistribute it and/or modify
+## it under the terms of the GNU Lesser General Public License as published by
+## the Free Software Foundation, either version 3 of the License, or
+## (at your option) any later version.
+##
+## Sardana is distributed in the hope that it will be useful,
+## but WITHOUT ANY WARRANTY; without even the implied warranty of
+## MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+## GNU Lesser General Public License for more details.
+##
+## You should have received a copy of the GNU Lesser General Public License
+## along with Sardana.  If not, see <http://www.gnu.org/licenses/>.
+##
+##############################################################################
+
+"""This module is part of the Python Macro Server libray. It defines the
+index of elements (pool elements and macro server objects) used to resolve
+macro parameters"""
+
+__all__ = ["ElementIndex", "ElementTable"]
+
+__docformat__ = 'restructuredtext'
+
+import bisect
+import threading
+
+from taurus.core.util.containers import CaselessDict
+
+from sardana import ElementType
+
+#: special value meaning all pools
+All = 'All'
+
+
+class ElementTable(object):
+    """Elements of a single source (a pool or the macro server itself)
+    indexed by type, by interface and by name.
+
+    :param elements:
+        sequence of (element, type name, sequence of interface names)"""
+
+    def __init__(self, elements=()):
+        # dict<str, dict<str, element>> key is type/interface, value is
+        # dict where key is the element name and value is the element
+        self.types = CaselessDict()
+        self.interfaces = CaselessDict()
+        # dict<str, list<element>> key is the element name
+        self.names = CaselessDict()
+        for elem, elem_type, interfaces in elements:
+            self.add(elem, elem_type, interfaces)
+        self._sorted_names = None
+
+    def add(self, elem, elem_type, interfaces):
+        name = elem.name
+        type_elems = self.types.get(elem_type)
+        if type_elems is None:
+            self.types[elem_type] = type_elems = CaselessDict()
+        type_elems[name] = elem
+        for interface in interfaces:
+            interface_elems = self.interfaces.get(interface)
+            if interface_elems is None:
+                self.interfaces[interface] = interface_elems = CaselessDict()
+            interface_elems[name] = elem
+        self.names.setdefault(name, []).append(elem)
+        self._sorted_names = None
+
+    def get_elements_of_type(self, elem_type):
+        return self.types.get(elem_type, {})
+
+    def get_elements_with_interface(self, interface):
+        return self.interfaces.get(interface, {})
+
+    def get_elements_by_name(self, name):
+        return self.names.get(name, [])
+
+    def get_names_starting_with(self, prefix):
+        """Returns the (lower case) names starting with the given prefix
+        (case insensitive)"""
+        names = self._sorted_names
+        if names is None:
+            self._sorted_names = names = sorted(self.names.keys())
+        prefix = prefix.lower()
+        start = bisect.bisect_left(names, prefix)
+        ret = []
+        for name in names[start:]:
+            if not name.startswith(prefix):
+                break
+            ret.append(name)
+        return ret
+
+
+class ElementIndex(object):
+    """Index of the elements known to the macro server by type, by interface
+    and by name. The index is maintained lazily: each source (pool or macro
+    server) table is rebuilt on the first lookup after being invalidated
+    (see :meth:`invalidate_pools` and :meth:`invalidate_local`).
+
+    The returned dictionaries are shared and must not be modified."""
+
+    def __init__(self, macro_server):
+        self._macro_server = macro_server
+        self._lock = threading.RLock()
+        self._pool_tables = None
+        self._local_table = None
+        # merged (all pools) lookups: dict<tuple, CaselessDict>
+        self._merged = {}
+
+    def invalidate_pools(self):
+        """Marks the pool elements part of the index as outdated"""
+        with self._lock:
+            self._pool_tables = None
+            self._merged = {}
+
+    def invalidate_local(self):
+        """Marks the macro server objects part of the index as outdated"""
+        with self._lock:
+            self._local_table = None
+
+    def invalidate(self):
+        self.invalidate_pools()
+        self.invalidate_local()
+
+    def _build_pool_table(self, pool):
+        return ElementTable([(elem, elem.getType(), elem.interfaces)
+                             for elem in pool.getElements()])
+
+    def _build_local_table(self):
+        macro_server = self._macro_server
+        objs = macro_server.get_macro_libs().values() + \
+            macro_server.get_macros().values()
+        return ElementTable([(obj, ElementType[obj.get_type()],
+                              obj.get_interface_names()) for obj in objs])
+
+    def get_pool_tables(self):
+        """Returns the element tables of each pool
+
+        :return: dict where key is the pool name and value is the
+                 :class:`ElementTable`
+        :rtype: CaselessDict"""
+        with self._lock:
+            tables = self._pool_tables
+            if tables is None:
+                tables = CaselessDict()
+                for pool_name in self._macro_server.get_pool_names():
+                    pool = self._macro_server.get_pool(pool_name)
+                    tables[pool_name] = self._build_pool_table(pool)
+                self._pool_tables = tables
+            return tables
+
+    def get_local_table(self):
+        """Returns the element table of the macro server objects (macro
+        libraries and macros)
+
+        :return: the macro server element table
+        :rtype: :class:`ElementTable`"""
+        with self._lock:
+            table = self._local_table
+            if table is None:
+                self._local_table = table = self._build_local_table()
+            return table
+
+    def _get_pool_elements(self, kind, key, pool):
+        with self._lock:
+            tables = self.get_pool_tables()
+            if pool != All:
+                table = tables.get(pool)
+                if table is None:
+                    return {}
+                return getattr(table, kind).get(key, {})
+            merged_key = kind, key.lower()
+            ret = self._merged.get(merged_key)
+            if ret is None:
+                ret = CaselessDict()
+                for table in tables.values():
+                    ret.update(getattr(table, kind).get(key, {}))
+                self._merged[merged_key] = ret
+            return ret
+
+    def get_pool_elements_of_type(self, elem_type, pool=All):
+        """Returns the pool elements of the given type
+
+        :return: dict where key is the element name
+        :rtype: CaselessDict"""
+        return self._get_pool_elements('types', elem_type, pool)
+
+    def get_pool_elements_with_interface(self, interface, pool=All):
+        """Returns the pool elements which implement the given interface
+
+        :return: dict where key is the element name
+        :rtype: CaselessDict"""
+        return self._get_pool_elements('interfaces', interface, pool)
+
+    def get_local_elements_of_type(self, elem_type):
+        return self.get_local_table().get_elements_of_type(elem_type)
+
+    def get_local_elements_with_interface(self, interface):
+        return self.get_local_table().get_elements_with_interface(interface)
+
+    def get_elements_by_name(self, name, pool=All):
+        """Returns all elements (pool elements and macro server objects) with
+        the given name (case insensitive)
+
+        :return: list of elements
+        :rtype: list"""
+        with self._lock:
+            tables = self.get_pool_tables()
+            if pool != All:
+                tables = [tables[pool]] if pool in tables else []
+            else:
+                tables = tables.values()
+            ret = []
+            for table in tables:
+                ret.extend(table.get_elements_by_name(name))
+            ret.extend(self.get_local_table().get_elements_by_name(name))
+            return ret
+
+    def get_names_starting_with(self, prefix, pool=All):
+        """Returns the sorted (lower case) names of all elements starting with
+        the given prefix (case insensitive). Useful for name completion
+
+        :return: list of names
+        :rtype: list<str>"""
+        with self._lock:
+            tables = self.get_pool_tables()
+            if pool != All:
+                tables = [tables[pool]] if pool in tables else []
+            else:
+                tables = tables.values()
+            names = set(self.get_local_table().get_names_starting_with(prefix))
+            for table in tables:
+                names.update(table.get_names_starting_with(prefix))
+            return sorted(names)
@@ -193,6 +193,10 @@ class ElementParamType(ParamType):
         return elem.getType() == self._name
 
     def getObj(self, name, pool=ParamType.All, cache=False):
+        obj = self.getObjDict(pool=pool, cache=True).get(name)
+        if obj is not None:
+            return obj
+        # maybe it is a full name
         macro_server = self.macro_server
         if pool == ParamType.All:
             pools = macro_server.get_pools()
@@ -218,23 +222,16 @@ class ElementParamType(ParamType):
                               (self._name, name))
 
     def getObjDict(self, pool=ParamType.All, cache=False):
-        macro_server = self.macro_server
-        objs = CaselessDict()
-        if pool == ParamType.All:
-            pools = macro_server.get_pools()
-        else:
-            pools = macro_server.get_pool(pool),
-        for pool in pools:
-            for elem_info in pool.getElements():
-                if self.accepts(elem_info):
-                    objs[elem_info.name] = elem_info
-        for macro_lib_name, macro_lib in macro_server.get_macros().items():
-            if self.accepts(macro_lib):
-                objs[macro_lib_name] = macro_lib
-        for macro_name, macro in macro_server.get_macros().items():
-            if self.accepts(macro):
-                objs[macro_name] = macro
-
+        """Returns the objects of this type indexed by name. If cache is
+        True the returned dictionary may be shared with the macro server
+        element index and therefore it must not be modified"""
+        index = self.macro_server.element_index
+        pool_objs = index.get_pool_elements_of_type(self._name, pool=pool)
+        local_objs = index.get_local_elements_of_type(self._name)
+        if cache and not local_objs:
+            return pool_objs
+        objs = CaselessDict(pool_objs)
+        objs.update(local_objs)
         return objs
 
     def getObjListStr(self, pool=ParamType.All, cache=False):
@@ -266,6 +263,10 @@ class ElementParamInterface(ElementParamType):
         return self._name in elem_interfaces
 
     def getObj(self, name, pool=ParamType.All, cache=False):
+        obj = self.getObjDict(pool=pool, cache=True).get(name)
+        if obj is not None:
+            return obj
+        # maybe it is a full name
         macro_server = self.macro_server
         if pool == ParamType.All:
             pools = macro_server.get_pools()
@@ -291,20 +292,19 @@ class ElementParamInterface(ElementParamType):
                               (self._name, name))
 
     def getObjDict(self, pool=ParamType.All, cache=False):
+        """Returns the objects implementing this interface indexed by name.
+        If cache is True the returned dictionary is shared with the macro
+        server element index and therefore it must not be modified"""
         macro_server = self.macro_server
-        objs = CaselessDict()
+        index = macro_server.element_index
         if macro_server.is_macroserver_interface(self._name):
-            return macro_server.get_elements_with_interface(self._name)
-
-        if pool == ParamType.All:
-            pools = macro_server.get_pools()
+            objs = index.get_local_elements_with_interface(self._name)
         else:
-            pools = macro_server.get_pool(pool),
-        for pool in pools:
-            for elem_info in pool.getElementsWithInterface(self._name).values():
-                if self.accepts(elem_info):
-                    objs[elem_info.name] = elem_info
-        return objs
+            objs = index.get_pool_elements_with_interface(self._name,
+                                                          pool=pool)
+        if cache:
+            return objs
+        return CaselessDict(objs)
 
     def getObjListStr(self, pool=ParamType.All, cache=False):
         obj_dict = self.getObjDict(pool=pool, cache=cache)
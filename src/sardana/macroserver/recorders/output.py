@@ -141,6 +141,7 @@ class OutputRecorder(DataRecorder):
             cols = None
         self._columns = cols
         self._output_block = output_block
+        self._lines = []
 
     def _startRecordList(self, recordlist):
         starttime = recordlist.getEnvironValue('starttime').ctime()
@@ -210,16 +211,16 @@ class OutputRecorder(DataRecorder):
 
         header = "\n".join(head)
 
-        cell_t_number = '%%%%(%%s)%s' % number_fmt[1:]
-
-        self._scan_line_t = [(col_names[0], '%%(%s)8d' % col_names[0])]
-        self._scan_line_t += [(name, cell_t_number % name) for name in col_names[1:]]
+        # list<(column name, cell format, column size)>
+        cell_fmts = ['%8d'] + (nb_cols - 1) * [number_fmt]
+        self._row_cells = zip(col_names, cell_fmts, col_sizes)
 
         self._stream.output(header)
         self._stream.flushOutput()
+        self.flush_policy.reset()
 
     def _endRecordList(self, recordlist):
-        self._stream.flushOutput()
+        self._flushLines()
         starttime = recordlist.getEnvironValue('starttime')
         endtime = recordlist.getEnvironValue('endtime')
         deadtime = recordlist.getEnvironValue('deadtime')
@@ -244,10 +245,10 @@ class OutputRecorder(DataRecorder):
         self._stream.info(info_string % (serialno, endtime, totaltime,
                                          deadtime_perc, motiontime_perc))
 
-    def _writeRecord(self, record):
+    def _formatRow(self, data):
         cells = []
-        for i, (name, cell) in enumerate(self._scan_line_t):
-            cell_data = record.data[name]
+        for name, cell_fmt, col_size in self._row_cells:
+            cell_data = data[name]
             if isinstance(cell_data, numpy.ndarray):
                 cell = str(cell_data.shape)
             elif cell_data is None:
@@ -255,17 +256,27 @@ class OutputRecorder(DataRecorder):
             elif isinstance(cell_data, (str, unicode)):
                 cell = "<string>"
             else:
-                cell %= record.data
-            cell = string.center(cell.strip(), self._col_sizes[i])
-            cells.append(cell)
-        scan_line = self._col_sep.join(cells)
-
-        if self._output_block:
-            self._stream.outputBlock(scan_line)
-        else:
-            self._stream.output(scan_line)
-
+                cell = cell_fmt % (cell_data,)
+            cells.append(cell.strip().center(col_size))
+        return self._col_sep.join(cells)
+
+    def _flushLines(self):
+        lines = self._lines
+        if lines:
+            if self._output_block:
+                # a block output replaces the previous one: only the last
+                # line is visible anyway
+                self._stream.outputBlock(lines[-1])
+            else:
+                self._stream.output("\n".join(lines))
+            del lines[:]
         self._stream.flushOutput()
+        self.flush_policy.reset()
+
+    def _writeRecord(self, record):
+        self._lines.append(self._formatRow(record.data))
+        if self.flush_policy.record():
+            self._flushLines()
 
     def _addCustomData(self, value, name, **kwargs):
         '''
@@ -276,5 +287,6 @@ class OutputRecorder(DataRecorder):
             v = 'Array(%s)' % str(numpy.shape(value))
         else:
             v = str(value)
+        self._flushLines()
         self._stream.output('Custom data: %s : %s' % (name, v))
         self._stream.flushOutput()
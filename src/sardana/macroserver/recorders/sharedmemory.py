@@ -25,7 +25,7 @@
 
 """This is the macro server scan data output recorder module"""
 
-__all__ = ["SPSRecorder", "ShmRecorder"]
+__all__ = ["SPSRecorder", "ShmRecorder", "MMapRecorder"]
 
 __docformat__ = 'restructuredtext'
 
@@ -33,6 +33,7 @@ import time
 import numpy
 import operator
 
+from sardana.util.ringbuffer import RingBufferWriter, get_default_path
 from sardana.macroserver.scan.recorder import BaseSharedMemoryRecorder
 from sardana.macroserver.scan.recorder.datarecorder import DataRecorder
 
@@ -303,3 +304,76 @@ class ShmRecorder(DataRecorder):
         if not self.isInitialized(): return
         self.putenv('ended', time.ctime(recordlist.getEnvironValue('endtime')))
 
+
+
+class MMapRecorder(BaseSharedMemoryRecorder):
+    """Writes the records in a ring buffer in a memory mapped file (see
+    :mod:`sardana.util.ringbuffer`) so local processes can read the scan
+    data live, without copies and without Tango events. Each scan creates a
+    new ring buffer in the same path. Only the numeric columns with a
+    fixed shape are written"""
+
+    #: default number of record slots
+    Capacity = 4096
+    #: maximum size (bytes) of the ring buffer data
+    MaxSize = 64 * 1024 * 1024
+
+    def __init__(self, path=None, name=None, capacity=None, **pars):
+        """ @param[in] path ring buffer file path (default: built from name)
+            @param[in] name ring buffer name (ex: door name)
+            @param[in] capacity number of record slots
+            @param[in] pars keyword extra parameters
+        """
+        BaseSharedMemoryRecorder.__init__(self, **pars)
+        if path is None:
+            path = get_default_path(name or 'scan')
+        self.path = path
+        self.capacity = capacity
+        self.writer = None
+
+    def _getColumns(self, datadesc):
+        columns = []
+        for col in datadesc:
+            shape = tuple(col.shape)
+            try:
+                dtype = numpy.dtype(col.dtype)
+            except TypeError:
+                continue
+            if dtype.kind not in 'biuf':
+                continue
+            if not all(isinstance(dim, (int, long)) and dim > 0
+                       for dim in shape):
+                continue
+            columns.append((col.name, dtype, shape))
+        return columns
+
+    def _startRecordList(self, recordlist):
+        env = recordlist.getEnviron()
+        columns = self._getColumns(env['datadesc'])
+        capacity = self.capacity
+        if capacity is None:
+            record_size = max(1, numpy.dtype(
+                [(str(n), d, s) for n, d, s in columns]).itemsize)
+            capacity = max(16, min(self.Capacity,
+                                   self.MaxSize // record_size))
+        starttime = env.get('starttime')
+        info = {'title': env.get('title', ''),
+                'starttime': starttime and starttime.ctime() or '',
+                'labels': [col.label for col in env['datadesc']]}
+        self._closeWriter()
+        self.writer = RingBufferWriter(self.path, columns, capacity,
+                                       serialno=env.get('serialno', 0),
+                                       env=info)
+
+    def _writeRecord(self, record):
+        if self.writer is None:
+            return
+        self.writer.write(record.data)
+
+    def _endRecordList(self, recordlist):
+        self._closeWriter()
+
+    def _closeWriter(self):
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
@@ -42,7 +42,7 @@ from sardana.taurus.core.tango.sardana import PlotType
 from sardana.macroserver.macro import Type
 from sardana.macroserver.scan.recorder import (BaseFileRecorder,
                                                BaseNAPI_FileRecorder,
-                                               SaveModes)
+                                               SaveModes, RowFormatter)
 from taurus.core.util.containers import chunks
 
 
@@ -52,7 +52,7 @@ class FIO_FileRecorder(BaseFileRecorder):
     formats = {'fio': '.fio'}
 
     def __init__(self, filename=None, macro=None, **pars):
-        BaseFileRecorder.__init__(self)
+        BaseFileRecorder.__init__(self, **pars)
         self.base_filename = filename
         if macro:
             self.macro = macro
@@ -169,24 +169,18 @@ class FIO_FileRecorder(BaseFileRecorder):
         self.fd.write( outLine)
 
         self.fd.flush()
+        # same column order as the description: timestamp at the end
+        row_names = [ c for c in self.ctNames
+                      if c != "timestamp" and c != "point_nb" ]
+        row_names.append('timestamp')
+        self._row_formatter = RowFormatter(row_names, prefix=' ',
+                                           none_is_missing=False)
+        self.flush_policy.reset()
 
     def _writeRecord(self, record):
         if self.filename is None:
             return
-        nan, ctNames, fd = float('nan'), self.ctNames, self.fd
-        outstr = ''
-        for c in ctNames:
-            if c == "timestamp" or c == "point_nb":
-                continue
-            outstr += ' ' + str(record.data.get(c, nan))
-        #
-        # 11.9.2012 timestamp to the end
-        #
-        outstr += ' ' + str(record.data.get('timestamp', nan))
-        outstr += '\n'
-        
-        fd.write( outstr )
-        fd.flush()
+        self._bufferRow(self._row_formatter.format(record.data))
 
         if len( self.mcaNames) > 0:
             self._writeMcaFile( record)
@@ -195,6 +189,7 @@ class FIO_FileRecorder(BaseFileRecorder):
         if self.filename is None:
             return
 
+        self._flushRows()
         envRec = recordlist.getEnviron()
         end_time = envRec['endtime'].ctime()
         self.fd.write("! Acquisition ended at %s\n" % end_time)
@@ -271,7 +266,7 @@ class SPEC_FileRecorder(BaseFileRecorder):
                         'uint16','uint32','uint64')
 
     def __init__(self, filename=None, macro=None, **pars):
-        BaseFileRecorder.__init__(self)
+        BaseFileRecorder.__init__(self, **pars)
         if filename:
             self.setFileName(filename)
     
@@ -315,6 +310,7 @@ class SPEC_FileRecorder(BaseFileRecorder):
                 labels.append(sanitizedlabel)
                 names.append(e.name)
         self.names = names
+        self._row_formatter = RowFormatter(names)
         
         # prepare pre-scan snapshot
         snapshot_labels, snapshot_values = self._preparePreScanSnapshot(env)
@@ -346,6 +342,7 @@ class SPEC_FileRecorder(BaseFileRecorder):
         self.fd = open(self.filename,'a')
         self.fd.write(header % data )
         self.fd.flush()
+        self.flush_policy.reset()
         
     def _prepareMultiLines(self, character, sep, items_list):
         '''Translate list of lists of items into multiple line string
@@ -401,23 +398,13 @@ class SPEC_FileRecorder(BaseFileRecorder):
     def _writeRecord(self, record):
         if self.filename is None:
             return
-        nan, names, fd = float('nan'), self.names, self.fd
-        
-        d = []
-        for c in names:
-            data = record.data.get(c)
-            if data is None: data = nan
-            d.append(str(data))
-        outstr  = ' '.join(d)
-        outstr += '\n'
-        
-        fd.write( outstr )
-        fd.flush()
+        self._bufferRow(self._row_formatter.format(record.data))
 
     def _endRecordList(self, recordlist):
         if self.filename is None:
             return
 
+        self._flushRows()
         env = recordlist.getEnviron()
         end_time = env['endtime'].ctime()
         self.fd.write("#C Acquisition ended at %s\n" % end_time)
@@ -445,6 +432,9 @@ class SPEC_FileRecorder(BaseFileRecorder):
             return
         
         fileWasClosed = self.fd is None or self.fd.closed
+        if not fileWasClosed:
+            # keep the custom data after the rows already recorded
+            self._flushRows()
         if fileWasClosed:
             try:
                 self.fd = open(self.filename,'a')
@@ -28,4 +28,6 @@
 __docformat__ = 'restructuredtext'
 
 from scandata import *
-from gscan import *
\ No newline at end of file
+from gscan import *
+from scanorder import *
+from blockreadout import *
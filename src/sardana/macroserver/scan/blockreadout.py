@@ -0,0 +1,83 @@
+#!/usr/bin/env python
+
+##############################################################################
+##
+## This file is part of Sardana
+##
+## http://www.sardana-controls.org/
+##
+## Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+## Sardana is free software: you can redistribute it and/or modify
+## it under the terms of the GNU Lesser General Public License as published by
+## the Free Software Foundation, either version 3 of the License, or
+## (at your option) any later version.
+##
+## Sardana is distributed in the hope that it will be useful,
+## but WITHOUT ANY WARRANTY; without even the implied warranty of
+## MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+## GNU Lesser General Public License for more details.
+##
+## You should have received a copy of the GNU Lesser General Public License
+## along with Sardana.  If not, see <http://www.gnu.org/licenses/>.
+##
+##############################################################################
+
+
+"""This module contains the helper to build scan records from the data read
+back in blocks from buffered acquisitions"""
+
+__all__ = ["RecordAssembler"]
+
+__docformat__ = 'restructuredtext'
+
+
+class RecordAssembler(object):
+    """Assembles the records of a scan from data acquired in a buffer by
+    several sources (channels, latched positions). The data of each source
+    is read back in blocks, each source at its own pace. Record i is ready
+    when all the sources have provided their i-th value. Records are
+    returned in order, only once.
+
+    :param nb_points: number of records of the scan
+    :param sources: names of the data sources (the keys of the records)"""
+
+    def __init__(self, nb_points, sources):
+        self.nb_points = nb_points
+        self._data = dict([(source, []) for source in sources])
+        self._nb_popped = 0
+
+    def add_source(self, source):
+        self._data.setdefault(source, [])
+
+    def update(self, source, data):
+        """Updates the data of the given source with the whole buffer
+        acquired so far (the already known values are ignored)"""
+        values = self._data[source]
+        values.extend(data[len(values):self.nb_points])
+
+    def get_nb_ready(self):
+        """Returns the number of records for which all the sources have
+        provided data"""
+        if not self._data:
+            return 0
+        return min(map(len, self._data.values()))
+
+    def pop_records(self):
+        """Returns the records which became ready since the last call
+
+        :return: list of dict with the point_nb and the value of each source
+        :rtype: list<dict>"""
+        start, end = self._nb_popped, self.get_nb_ready()
+        records = []
+        for i in xrange(start, end):
+            record = {'point_nb': i}
+            for source, values in self._data.items():
+                record[source] = values[i]
+            records.append(record)
+        self._nb_popped = end
+        return records
+
+    def is_complete(self):
+        """Tells if all the records have been returned"""
+        return self._nb_popped >= self.nb_points
@@ -27,12 +27,14 @@
 scan"""
 
 __all__ = ["ScanSetupError", "ScanException", "ExtraData", "TangoExtraData",
-           "GScan", "SScan", "CScan", "CSScan", "CTScan", "HScan"]
+           "TangoAttributeReader", "GScan", "SScan", "CScan", "CSScan", "CTScan", "HScan"]
 
 __docformat__ = 'restructuredtext'
 
 import os
+import sys
 import datetime
+import collections
 import operator
 import time
 import threading
@@ -46,12 +48,13 @@ from taurus.core.tango import FROM_TANGO_TO_STR_TYPE
 
 from sardana.util.tree import BranchNode, LeafNode, Tree
 from sardana.util.motion import Motor as VMotor
-from sardana.util.motion import MotionPath
+from sardana.util.motion import MotionPath, get_motion_durations
 from sardana.macroserver.msexception import MacroServerException, UnknownEnv, \
     InterruptException
 from sardana.macroserver.msparameter import Type
 from sardana.macroserver.scan.scandata import ColumnDesc, MoveableDesc, \
     ScanFactory, ScanDataEnvironment
+from sardana.macroserver.scan.blockreadout import RecordAssembler
 from sardana.macroserver.scan.recorder import (AmbiguousRecorderError,
                                                SharedMemoryRecorder,
                                                FileRecorder)
@@ -108,9 +111,20 @@ class ExtraData(object):
 class TangoExtraData(ExtraData):
 
     def __init__(self, **kwargs):
+        """Besides the :class:`ExtraData` keywords it accepts:
+            - timeout (float, optional): maximum time (s) to wait for the
+              value when read together with other columns (see
+              :class:`TangoAttributeReader`)"""
         self._attribute = None
+        self._timeout = kwargs.pop('timeout', None)
         ExtraData.__init__(self, **kwargs)
 
+    def getModel(self):
+        return self._model
+
+    def getTimeout(self):
+        return self._timeout
+
     @property
     def attribute(self):
         if self._attribute is None:
@@ -137,6 +151,140 @@ class TangoExtraData(ExtraData):
         except Exception:
             return None
 
+    def decode(self, attr_value):
+        """Returns the value of the given :class:`PyTango.DeviceAttribute`
+        (read together with other columns, see :class:`TangoAttributeReader`)
+        decoded by the taurus attribute, like :meth:`read` does"""
+        try:
+            return self.attribute.decode(attr_value).value
+        except InterruptException:
+            raise
+        except Exception:
+            return None
+
+
+class TangoAttributeReader(object):
+    """Reads a set of Tango attributes grouped by device. One
+    *read_attributes_asynch* request is sent to each device before waiting
+    for any reply so the devices serve them concurrently. Device proxies are
+    cached and shared between readers (and therefore between scans).
+
+    Sources which are not in the *[tango://][host:port/]a/b/c/attr* form are
+    read one by one with an :class:`PyTango.AttributeProxy`"""
+
+    #: default maximum time (s) to wait for the reply of a device
+    DefaultTimeout = 3.0
+
+    _proxies = {}
+    _proxies_lock = threading.Lock()
+
+    def __init__(self, sources, timeouts=None):
+        """:param sources: sequence of attribute names
+        :param timeouts: dictionary with the maximum time (s) to wait for the
+                         value of some sources. Sources of the same device
+                         share the largest of their timeouts"""
+        timeouts = timeouts or {}
+        # dict<str, (list<str>, list<str>, float)> key is the device name and
+        # value is a list of sources, a list of attribute names and timeout
+        self._devices = collections.OrderedDict()
+        self._other_sources = []
+        for src in sources:
+            dev_attr = self.splitSource(src)
+            if dev_attr is None:
+                self._other_sources.append(src)
+                continue
+            dev_name, attr_name = dev_attr
+            timeout = timeouts.get(src) or self.DefaultTimeout
+            dev_key = dev_name.lower()
+            dev_data = self._devices.get(dev_key)
+            if dev_data is None:
+                self._devices[dev_key] = dev_data = [dev_name, [], [], timeout]
+            dev_data[1].append(src)
+            dev_data[2].append(attr_name)
+            dev_data[3] = max(dev_data[3], timeout)
+
+    @staticmethod
+    def splitSource(src):
+        """Splits a Tango attribute name into device name and attribute name.
+
+        :return: (device name, attribute name) or None if src is not a full
+                 Tango attribute name
+        :rtype: tuple<str, str>"""
+        model = src
+        if model.lower().startswith("tango://"):
+            model = model[len("tango://"):]
+        dev_name, _, attr_name = model.rpartition('/')
+        if '://' in model or dev_name.count('/') < 2 or not attr_name:
+            return None
+        return dev_name, attr_name
+
+    @classmethod
+    def getDeviceProxy(cls, dev_name):
+        key = dev_name.lower()
+        with cls._proxies_lock:
+            proxy = cls._proxies.get(key)
+            if proxy is None:
+                cls._proxies[key] = proxy = PyTango.DeviceProxy(dev_name)
+        return proxy
+
+    def read(self):
+        """Reads all sources.
+
+        :return: dictionary where key is the source and value is the read
+                 value or the exception raised while reading it
+        :rtype: dict<str, obj>"""
+        ret = self.readAttributes()
+        for src, value in ret.items():
+            if not isinstance(value, Exception):
+                ret[src] = value.value
+        return ret
+
+    def readAttributes(self):
+        """Reads all sources without extracting the values.
+
+        :return: dictionary where key is the source and value is the read
+                 :class:`PyTango.DeviceAttribute` or the exception raised while
+                 reading it
+        :rtype: dict<str, obj>"""
+        ret = {}
+        requests = []
+        start = time.time()
+        for dev_name, srcs, attr_names, timeout in self._devices.values():
+            try:
+                proxy = self.getDeviceProxy(dev_name)
+                req_id = proxy.read_attributes_asynch(attr_names)
+            except InterruptException:
+                raise
+            except Exception, e:
+                for src in srcs:
+                    ret[src] = e
+                continue
+            requests.append((proxy, req_id, srcs, timeout))
+        for proxy, req_id, srcs, timeout in requests:
+            # the timeout is counted from the moment all requests were sent
+            wait = max(start + timeout - time.time(), 0.001)
+            try:
+                values = proxy.read_attributes_reply(req_id, int(wait * 1000))
+            except InterruptException:
+                raise
+            except Exception, e:
+                for src in srcs:
+                    ret[src] = e
+                continue
+            for src, value in zip(srcs, values):
+                if value.has_failed:
+                    ret[src] = PyTango.DevFailed(*value.get_err_stack())
+                else:
+                    ret[src] = value
+        for src in self._other_sources:
+            try:
+                ret[src] = PyTango.AttributeProxy(src).read()
+            except InterruptException:
+                raise
+            except Exception, e:
+                ret[src] = e
+        return ret
+
 
 class GScan(Logger):
     """Generic Scan object.
@@ -218,8 +366,12 @@ class GScan(Logger):
 
     MAX_SCAN_HISTORY = 20
 
+    #: number of previous scans (of the same macro) used to learn the dead
+    #: time per point
+    DEAD_TIME_HISTORY = 5
+
     env = ('ActiveMntGrp', 'ExtraColumns' 'ScanDir', 'ScanFile', 'ScanRecorder',
-           'SharedMemory', 'OutputCols')
+           'SharedMemory', 'OutputCols', 'ScanFlushRecords', 'ScanFlushPeriod')
 
     def __init__(self, macro, generator=None, moveables=[], env={}, constraints=[],
                  extrainfodesc=[]):
@@ -245,6 +397,8 @@ class GScan(Logger):
         # Setup motion objects
         # ----------------------------------------------------------------------
         self._motion = macro.getMotion(moveable_names)
+        # kinematics of the moveables (see get_virtual_motors)
+        self._v_motors = None
 
         # ----------------------------------------------------------------------
         # Find the measurement group
@@ -281,6 +435,7 @@ class GScan(Logger):
         # Setup extra columns
         # ----------------------------------------------------------------------
         self._extra_columns = self._getExtraColumns()
+        self._extra_columns_reader = None
 
         # ----------------------------------------------------------------------
         # Setup data management
@@ -355,6 +510,36 @@ class GScan(Logger):
                                'sequence of maps')
         return ret
 
+    def _readExtraColumns(self, data_line):
+        """Reads the extra columns into the given data line. Tango columns are
+        read together (see :class:`TangoAttributeReader`). Columns which
+        could not be read get None"""
+        reader = self._extra_columns_reader
+        if reader is None:
+            models, timeouts = [], {}
+            for ec in self._extra_columns:
+                if not isinstance(ec, TangoExtraData):
+                    continue
+                model = ec.getModel()
+                if TangoAttributeReader.splitSource(model) is not None:
+                    models.append(model)
+                    timeouts[model] = ec.getTimeout()
+            self._extra_columns_reader = reader = \
+                TangoAttributeReader(models, timeouts=timeouts)
+        values = reader.readAttributes()
+        for ec in self._extra_columns:
+            name = ec.getName()
+            if isinstance(ec, TangoExtraData) and ec.getModel() in values:
+                value = values[ec.getModel()]
+                if isinstance(value, Exception):
+                    value = None
+                else:
+                    # same types as if the column was read on its own
+                    value = ec.decode(value)
+            else:
+                value = ec.read()
+            data_line[name] = value
+
     def _getJsonRecorder(self):
         try:
             json_enabled = self.macro.getEnv('JsonRecorder')
@@ -436,6 +621,18 @@ class GScan(Logger):
             raise TypeError("ScanRecorder MUST be string or sequence of strings."\
                             " It is '%s'" % scan_recorders_t)
 
+        # flush policy: flush every ScanFlushRecords records and/or every
+        # ScanFlushPeriod seconds (default is to flush every record)
+        flush_pars = {}
+        for env_name, par_name in (('ScanFlushRecords', 'records'),
+                                   ('ScanFlushPeriod', 'period')):
+            try:
+                flush_pars[par_name] = macro.getEnv(env_name)
+            except InterruptException:
+                raise
+            except Exception:
+                pass
+
         file_recorders = []
         for i, file_name in enumerate(file_names):
             abs_file_name = os.path.join(scan_dir, file_name)
@@ -446,6 +643,8 @@ class GScan(Logger):
                         scan_recorders[i])(abs_file_name, macro=macro)
                 if not file_recorder:
                     file_recorder = FileRecorder(abs_file_name, macro=macro)
+                if flush_pars:
+                    file_recorder.setFlushPolicy(**flush_pars)
                 file_recorders.append(file_recorder)
             except InterruptException:
                 raise
@@ -471,15 +670,19 @@ class GScan(Logger):
             raise
         except Exception:
             self.info('SharedMemory is not defined. Use "senv '
-                      'SharedMemory sps" to enable it')
+                      'SharedMemory sps" (or mmap) to enable it')
             return
 
         if not shm:
             return
 
         kwargs = {}
-        # For now we only support SPS shared memory format
-        if shm.lower() == 'sps':
+        if shm.lower() == 'mmap':
+            # a single ring buffer contains all the columns
+            if eid != 0:
+                return
+            kwargs['name'] = macro.getDoorName()
+        elif shm.lower() == 'sps':
             cols  = 1                            # Point nb column
             cols += len(self.moveables)          # motor columns
             ch_nb = len(mg.getChannels())
@@ -677,7 +880,7 @@ class GScan(Logger):
         '''
         manager = self.macro.getManager()
         all_elements_info = manager.get_elements_with_interface('Element')
-        ret = []
+        columns = []
         for src, label in elements:
             try:
                 if src in all_elements_info:
@@ -690,18 +893,35 @@ class GScan(Logger):
                     column = ColumnDesc(name=src,
                                         label=label,
                                         source=src)
+                columns.append(column)
+            except:
+                self.macro.warning('Error taking pre-scan snapshot of %s (%s)', label, src)
+                self.debug('Details:', exc_info=1)
 
-                v = PyTango.AttributeProxy(column.source).read().value  #@Fixme: Tango-centric. It should work for any Taurus Attribute
+        #@Fixme: Tango-centric. It should work for any Taurus Attribute
+        reader = TangoAttributeReader([column.source for column in columns])
+        values = reader.read()
+        ret = []
+        for column in columns:
+            try:
+                v = values[column.source]
+                if isinstance(v, Exception):
+                    raise v
                 column.pre_scan_value = v
                 column.shape = np.shape(v)
                 column.dtype = getattr(v, 'dtype', np.dtype(type(v))).name
                 ret.append(column)
             except:
-                self.macro.warning('Error taking pre-scan snapshot of %s (%s)', label, src)
+                self.macro.warning('Error taking pre-scan snapshot of %s (%s)',
+                                   column.label, column.source)
                 self.debug('Details:', exc_info=1)
         return ret
 
     def get_virtual_motors(self):
+        """Returns the kinematics (virtual motor) of each moveable. They are
+        read only once per scan"""
+        if self._v_motors is not None:
+            return self._v_motors
         ret = []
         for moveable in self.moveables:
             try:
@@ -711,8 +931,50 @@ class GScan(Logger):
                 v_motor = VMotor(min_vel=0, max_vel=float('+inf'),
                                  accel_time=0, decel_time=0)
             ret.append(v_motor)
+        self._v_motors = ret
         return ret
 
+    def get_point_dead_time(self):
+        """Returns the dead time per point (time not spent in motion or in
+        acquisition: hooks, acquisition overhead, recording...) learned from
+        the last scans of the same macro in the scan history
+
+        :return: the dead time per point (s) or 0 if unknown
+        :rtype: float"""
+        try:
+            scan_history = self.macro.getEnv('ScanHistory')
+        except UnknownEnv:
+            return 0.0
+        macro_name = self.macro.getName()
+        dead_times = []
+        for history in reversed(scan_history):
+            if len(dead_times) >= self.DEAD_TIME_HISTORY:
+                break
+            dead_time = history.get('pointdeadtime')
+            if dead_time is not None and history.get('macro') == macro_name:
+                dead_times.append(dead_time)
+        if not dead_times:
+            return 0.0
+        return float(np.median(dead_times))
+
+    def _estimate_steps(self, start_pos, positions, integ_times):
+        """Returns the estimated time (s) of the given steps: time to move
+        from one position to the next plus the acquisition time plus the
+        dead time per point"""
+        if not len(positions):
+            return 0.0
+        all_pos = np.vstack((start_pos, positions))
+        deltas = np.diff(all_pos, axis=0)
+        motion_times = np.zeros(len(positions))
+        for i, v_motor in enumerate(self.get_virtual_motors()):
+            motion_times = np.maximum(motion_times,
+                                      get_motion_durations(v_motor,
+                                                           deltas[:, i]))
+        # negative integration times are monitor counts (time unknown)
+        acq_time = np.clip(integ_times, 0, None).sum()
+        dead_time = len(positions) * self.get_point_dead_time()
+        return float(motion_times.sum() + acq_time + dead_time)
+
     MAX_ITER = 100000
 
     def _estimate(self, max_iter=None):
@@ -724,34 +986,33 @@ class GScan(Logger):
 
         max_iter = max_iter or self.MAX_ITER
         iterator = self.generator()
-        total_time = 0.0
         interval_nb = 0
+        positions, integ_times = [], []
+        finished = False
         try:
-            if not with_time:
-                start_pos = self.motion.readPosition(force=True)
-                v_motors = self.get_virtual_motors()
-                motion_time, acq_time = 0.0, 0.0
-                while interval_nb < max_iter:
-                    step = iterator.next()
-                    end_pos = step['positions']
-                    max_path_duration = 0.0
-                    for v_motor, start, stop in zip(v_motors, start_pos, end_pos):
-                        path = MotionPath(v_motor, start, stop)
-                        max_path_duration = max(max_path_duration, path.duration)
-                    integ_time = step.get("integ_time", 0.0)
-                    acq_time += integ_time
-                    motion_time += max_path_duration
-                    total_time += integ_time + max_path_duration
-                    interval_nb += 1
-                    start_pos = end_pos
-                if with_interval:
-                    interval_nb = self.macro.getIntervalEstimation()
-            else:
-                while interval_nb < max_iter:
-                    step = iterator.next()
-                    interval_nb += 1
-                total_time = self.macro.getTimeEstimation()
+            while interval_nb < max_iter:
+                step = iterator.next()
+                if not with_time:
+                    # the generator may reuse the positions array
+                    positions.append(np.array(step['positions'], dtype='d'))
+                    integ_times.append(step.get("integ_time", 0.0))
+                interval_nb += 1
         except StopIteration:
+            finished = True
+
+        if with_time:
+            total_time = self.macro.getTimeEstimation()
+        else:
+            start_pos = self.motion.readPosition(force=True)
+            nb_moveables = len(start_pos)
+            positions = np.array(positions, dtype='d')
+            positions = positions.reshape(-1, nb_moveables)
+            integ_times = np.array(integ_times, dtype='d')
+            total_time = self._estimate_steps(start_pos, positions,
+                                              integ_times)
+            if with_interval:
+                interval_nb = self.macro.getIntervalEstimation()
+        if finished:
             return total_time, interval_nb
         # max iteration reached.
         return -total_time, -interval_nb
@@ -822,12 +1083,18 @@ class GScan(Logger):
             scan_file = scan_file,
 
         names = [ col.name for col in env['datadesc'] ]
+        # time per point not spent in motion or in acquisition
+        nb_points = self.data.recordno
+        point_dead_time = None
+        if nb_points > 0 and 'delaytime' in env:
+            point_dead_time = max(0.0, env['delaytime'] / nb_points)
         history = dict(startts=env['startts'], endts=env['endts'],
                        estimatedtime=env['estimatedtime'],
                        deadtime=env['deadtime'], title=env['title'],
                        serialno=env['serialno'], user=env['user'],
                        ScanFile=scan_file, ScanDir=env['ScanDir'],
-                       channels=names)
+                       channels=names, macro=self.macro.getName(),
+                       pointdeadtime=point_dead_time)
         scan_history.append(history)
         while len(scan_history) > self.MAX_SCAN_HISTORY:
             scan_history.pop(0)
@@ -975,8 +1242,7 @@ class SScan(GScan):
         # Acquire data
         self.debug("[START] acquisition")
         state, data_line = mg.count(integ_time)
-        for ec in self._extra_columns:
-            data_line[ec.getName()] = ec.read()
+        self._readExtraColumns(data_line)
         self.debug("[ END ] acquisition")
         self._sum_acq_time += integ_time
 
@@ -1623,8 +1889,7 @@ class CSScan(CScan):
                 # After acquisition, test if we are asked to stop, probably because
                 # the motor are stopped. In this case discard the last acquisition
                 if not self._all_waypoints_finished:
-                    for ec in self._extra_columns:
-                        data_line[ec.getName()] = ec.read()
+                    self._readExtraColumns(data_line)
                     self.debug("[ END ] acquisition")
 
                     #post-acq hooks
@@ -1674,7 +1939,15 @@ class CSScan(CScan):
 
 class CTScan(CScan):
     '''Continuous scan controlled by hardware trigger signals.
-    Sequence of trigger signals is programmed in time. '''
+    Sequence of trigger signals is programmed in time by a trigger device
+    (TriggerDevice environment variable). If there is no trigger device,
+    the experimental channels generate their own triggers, in time or by
+    position (TriggerSource environment variable: time or position).
+    The channels are armed once for all the points and their data is read
+    back in blocks during the scan. Records are assembled by point index.'''
+
+    #: period (s) of the data readout during the acquisition
+    ReadoutPeriod = 0.5
 
     class ExtraTrigger:
         '''Helper class and temporary solution for configuring trigger device.
@@ -1696,7 +1969,11 @@ class CTScan(CScan):
         def __init__(self, macro):
             self.macro = macro
 
-            triggerDeviceName = self.macro.getEnv("TriggerDevice")
+            try:
+                triggerDeviceName = self.macro.getEnv("TriggerDevice")
+            except UnknownEnv:
+                # no trigger device: the channels generate their own triggers
+                triggerDeviceName = None
             self.master = None
             self.slaves = []
             masterName = None
@@ -1823,14 +2100,30 @@ class CTScan(CScan):
                 self.macro.debug("Stopping controller: %s, axis: %d", ctrlName, axis)
                 pool.SendToController([ctrlName, 'stop %d' % axis])
 
-        def getDataList(self):
-            dataList = [ {"point_nb" : i, "timestamp" : 0} for i in xrange(self.nrOfTriggers) ]
+        def getDataSources(self):
+            return [channel.getFullName() for channel in self.activeChannels]
+
+        def readBlocks(self, assembler, latchName=None):
+            '''Reads the data acquired so far by each channel (and the
+            positions latched by the first channel, if latchName is given)
+            into the assembler'''
             for channel in self.activeChannels:
-                dataDesc = channel.getFullName()
-                channelData = channel.getAttribute("Data").read().value
-                for i, data in enumerate(channelData):
-                    dataList[i][dataDesc] = data
-            return dataList
+                self._readBlock(assembler, channel.getFullName(), channel,
+                                "Data")
+            if latchName is not None and self.activeChannels:
+                self._readBlock(assembler, latchName, self.activeChannels[0],
+                                "Positions")
+
+        def _readBlock(self, assembler, source, channel, attrName):
+            try:
+                data = channel.getAttribute(attrName).read(cache=False).value
+            except Exception:
+                # some channels only provide data at the end
+                self.macro.debug("Could not read %s of %s" %
+                                 (attrName, channel.getName()))
+                return
+            if data is not None:
+                assembler.update(source, data)
 
         def setSamplingFrequency(self, freq):
             for channel in self.activeChannels:
@@ -1851,6 +2144,18 @@ class CTScan(CScan):
             for channel in self.activeChannels:
                 channel.getAttribute('NrOfTriggers').write(nrOfTriggers)
 
+        def configureTriggers(self, source, start, step, positionSource=""):
+            '''Configures the channels to generate their own triggers (no
+            trigger device): in time (source "time": first trigger after
+            start seconds and then every step seconds) or by the position of
+            the source motor (first trigger at start and then every step).
+            The position of positionSource is latched on each trigger'''
+            for channel in self.activeChannels:
+                channel.getAttribute('TriggerSource').write(source)
+                channel.getAttribute('TriggerStart').write(start)
+                channel.getAttribute('TriggerStep').write(step)
+                channel.getAttribute('PositionSource').write(positionSource)
+
         def configure(self, nrOfTriggers, acqTime, timePerTrigger, sampFreq=-1, triggerMode="gate"):
             self.macro.debug("acqTime: %s" % acqTime)
             if timePerTrigger == None:
@@ -1930,6 +2235,11 @@ class CTScan(CScan):
         macro, motion, waypoints = self.macro, self._physical_motion, self.steps
         self.macro.debug("_go_through_waypoints() entering...")
 
+        # the records (and the ideal positions) are built per point
+        if self.macro.nr_of_points < 1:
+            raise ValueError("Number of points must be at least 1 (got %s)"
+                             % self.macro.nr_of_points)
+
         last_positions = None
         for _, waypoint in waypoints:
             self.macro.debug("Waypoint iteration...")
@@ -1981,7 +2291,13 @@ class CTScan(CScan):
             oldHighTime, oldLowTime, oldDelay, oldNrOfTriggers = \
                                         self.extraTrigger.getConfiguration()
             self.__triggerConfigured = True
-            timePerTrigger = self.extraTrigger.configure(delayTime=delta_start,
+            latch_name = None
+            if self.extraTrigger.master is None:
+                timePerTrigger = acq_duration / self.macro.nr_of_points
+                latch_name = self._configure_internal_triggers(
+                    start_positions, positions, delta_start, timePerTrigger)
+            else:
+                timePerTrigger = self.extraTrigger.configure(delayTime=delta_start,
                                            scanTime=acq_duration,
                                            nrOfTriggers=self.macro.nr_of_points)
             self.macro.checkPoint()
@@ -2047,25 +2363,17 @@ class CTScan(CScan):
             self.macro.debug("Starting triggers")
             self.__triggerStarted = True
             self.extraTrigger.start()
-            motion.move(final_pos)
-
-            self.motion_event.clear()
-
-            if macro.isStopped():
-                self.on_waypoints_end()
-                return
-
-            #execute post-move hooks
-            for hook in waypoint.get('post-move-hooks',[]):
-                hook()
+            motion_done = threading.Event()
+            motion_error = []
 
-            self.macro.debug("Waiting for measurement group to finish")
-            while self._measurement_group.isMoving():
-                self.macro.checkPoint()
-                time.sleep(0.1)
-
-            self.macro.debug("Getting data")
-            data_list = self._measurement_group.getDataList()
+            def move():
+                try:
+                    motion.move(final_pos)
+                except:
+                    motion_error.append(sys.exc_info())
+                finally:
+                    motion_done.set()
+            macro.getManager().add_job(move)
 
             def populate_ideal_positions():
                 moveables = self.moveables
@@ -2085,16 +2393,94 @@ class CTScan(CScan):
             #TODO: decide what to do with moveables
             position_list = populate_ideal_positions()
 
-            self.macro.debug("Storing data")
-            for data_dict, position_dict in zip(data_list,position_list):
-                data_dict.update(position_dict)
-                self.data.addRecord(data_dict)
+            # latched positions replace the ideal ones
+            if latch_name not in position_list[0]:
+                latch_name = None
+            sources = self._measurement_group.getDataSources()
+            if latch_name is not None:
+                sources.append(latch_name)
+            assembler = RecordAssembler(self.macro.nr_of_points, sources)
+            try:
+                self._read_blocks(assembler, motion_done, position_list,
+                                  latch_name)
+            finally:
+                motion_done.wait()
+                self.motion_event.clear()
+            if motion_error:
+                exc_info = motion_error[0]
+                raise exc_info[0], exc_info[1], exc_info[2]
+
+            if macro.isStopped():
+                self.on_waypoints_end()
+                return
+
+            #execute post-move hooks
+            for hook in waypoint.get('post-move-hooks',[]):
+                hook()
 
             if start_positions is None:
                 last_positions = positions
 
         self.on_waypoints_end(positions)
 
+    def _configure_internal_triggers(self, start_positions, positions, delay,
+                                     time_per_trigger):
+        """Configures the experimental channels to generate their own
+        triggers: in time (TriggerSource environment variable is time, the
+        default) or by the position of the first physical motor (position).
+        The position of this motor is latched on each trigger.
+        Position triggering requires the first scanned moveable to be a
+        physical motor (the scan positions are given in its units).
+
+        :return: name of the latched motor"""
+        try:
+            source = self.macro.getEnv('TriggerSource')
+        except UnknownEnv:
+            source = 'time'
+        motor_name = self._physical_moveables[0].getName()
+        if source == 'position':
+            moveable = self.moveables[0].moveable
+            if moveable.getType() != "Motor":
+                raise ValueError("Position triggering requires a physical "
+                                 "motor (%s is a %s)" %
+                                 (moveable.getName(), moveable.getType()))
+            start = start_positions[0]
+            step = float(positions[0] - start) / \
+                max(1, self.macro.nr_of_points - 1)
+            trigger_source = motor_name
+        elif source == 'time':
+            start, step = delay, time_per_trigger
+            trigger_source = 'time'
+        else:
+            raise ValueError("TriggerSource must be either time or position")
+        self._measurement_group.configureTriggers(trigger_source, start, step,
+                                                  motor_name)
+        return motor_name
+
+    def _read_blocks(self, assembler, motion_done, position_list,
+                     latch_name=None):
+        """Reads back the acquired data in blocks and stores the records as
+        soon as all their data is available, until all the points are
+        acquired or the motion and the acquisition are finished"""
+        mg = self._measurement_group
+        while True:
+            self.macro.checkPoint()
+            finished = motion_done.is_set() and not mg.isMoving()
+            mg.readBlocks(assembler, latch_name)
+            for record in assembler.pop_records():
+                record['timestamp'] = 0
+                for name, position in \
+                        position_list[record['point_nb']].items():
+                    record.setdefault(name, position)
+                self.data.addRecord(record)
+            if assembler.is_complete() or finished:
+                break
+            time.sleep(self.ReadoutPeriod)
+        if not assembler.is_complete():
+            self.macro.warning("Only %d of %d points were acquired" %
+                               (assembler.get_nb_ready(),
+                                assembler.nb_points))
+
     def on_waypoints_end(self, restore_positions=None):
         """To be called by the waypoint thread to handle the end of waypoints
         (either because no more waypoints or because a macro abort was
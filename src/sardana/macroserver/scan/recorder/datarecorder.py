@@ -25,7 +25,8 @@
 
 """This is the macro server scan data recorder module"""
 
-__all__ = ["SaveModes", "RecorderStatus", "DataHandler", "DataRecorder"]
+__all__ = ["SaveModes", "RecorderStatus", "DataHandler", "DataRecorder",
+           "FlushPolicy", "RowFormatter"]
 
 __docformat__ = 'restructuredtext'
 
@@ -83,6 +84,61 @@ class DataHandler:
         '''
         for recorder in self.recorders:
             recorder.addCustomData(value, name, **kwargs)
+
+class FlushPolicy(object):
+    """Decides when the buffered output of a recorder has to be flushed:
+    when *records* records are pending and/or when *period* seconds elapsed
+    since the last flush (evaluated when a record is written).
+    The default policy flushes after every record"""
+
+    def __init__(self, records=1, period=None):
+        self.records = records
+        self.period = period
+        self.reset()
+
+    def reset(self):
+        """Marks the output as flushed"""
+        self._pending = 0
+        self._last_flush = time.time()
+
+    def record(self):
+        """Registers a new record.
+
+        :return: True if the output should be flushed now
+        :rtype: bool"""
+        self._pending += 1
+        records, period = self.records, self.period
+        if records and self._pending >= records:
+            return True
+        if period is not None and time.time() - self._last_flush >= period:
+            return True
+        return False
+
+
+class RowFormatter(object):
+    """Formats record data as text rows. The column order, the template and
+    the missing value handling are resolved once (typically when the record
+    list starts) so formatting a row is a single pass over the columns.
+
+    Each cell is rendered with str(). Columns not present in the data (or
+    with None value if *none_is_missing* is True) get the *missing* value"""
+
+    def __init__(self, names, sep=' ', prefix='', suffix='\n',
+                 missing=float('nan'), none_is_missing=True):
+        self.names = names = tuple(names)
+        self.missing = missing
+        self.none_is_missing = none_is_missing
+        prefix, sep, suffix = [x.replace('%', '%%')
+                               for x in (prefix, sep, suffix)]
+        self.template = prefix + sep.join(len(names) * ['%s']) + suffix
+
+    def format(self, data):
+        get, missing = data.get, self.missing
+        values = [get(name, missing) for name in self.names]
+        if self.none_is_missing:
+            values = [missing if v is None else v for v in values]
+        return self.template % tuple(values)
+
 #
 # Recorders
 #
@@ -95,6 +151,7 @@ class DataRecorder(Logger):
         self.recordlist = None
         self.status = RecorderStatus.Idle
         self.savemode = SaveModes.Record
+        self.flush_policy = FlushPolicy()
 
     def getStatus(self):
         return self.status
@@ -142,6 +199,12 @@ class DataRecorder(Logger):
     def _writeRecord(self, record):
         pass
 
+    def setFlushPolicy(self, records=1, period=None):
+        """Sets when the buffered output is flushed: when *records* records
+        are pending and/or when *period* seconds elapsed since the last flush
+        (see :class:`FlushPolicy`)"""
+        self.flush_policy = FlushPolicy(records=records, period=period)
+
     def setSaveMode(self, mode):
         self.savemode = mode
 
@@ -45,6 +45,8 @@ def SharedMemoryRecorder(type, macro, **pars):
     rec_manager = macro.getMacroServer().recorder_manager
     if type == 'sps':
         klass = rec_manager.getRecorderClass('SPSRecorder')
+    elif type == 'mmap':
+        klass = rec_manager.getRecorderClass('MMapRecorder')
     else:
         raise Exception('SharedMemory %s is not supported.' % type)
     return klass(**pars)
@@ -56,6 +56,23 @@ class BaseFileRecorder(DataRecorder):
         DataRecorder.__init__(self, **pars)
         self.filename = None
         self.fd       = None 
+        self._rows    = []
+
+    def _bufferRow(self, row):
+        '''Buffers a formatted row. Buffered rows are written to the file in
+        a single call when the flush policy says so'''
+        self._rows.append(row)
+        if self.flush_policy.record():
+            self._flushRows()
+
+    def _flushRows(self):
+        '''Writes the buffered rows (if any) and flushes the file'''
+        rows = self._rows
+        if rows:
+            self.fd.write(''.join(rows))
+            del rows[:]
+        self.fd.flush()
+        self.flush_policy.reset()
         
     def getFileName(self):
         return self.filename
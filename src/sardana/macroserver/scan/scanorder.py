@@ -0,0 +1,87 @@
+#!/usr/bin/env python
+
+##############################################################################
+##
+## This file is part of Sardana
+##
+## http://www.sardana-controls.org/
+##
+## Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+## Sardana is free software: you can redistribute it and/or modify
+## it under the terms of the GNU Lesser General Public License as published by
+## the Free Software Foundation, either version 3 of the License, or
+## (at your option) any later version.
+##
+## Sardana is distributed in the hope that it will be useful,
+## but WITHOUT ANY WARRANTY; without even the implied warranty of
+## MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+## GNU Lesser General Public License for more details.
+##
+## You should have received a copy of the GNU Lesser General Public License
+## along with Sardana.  If not, see <http://www.gnu.org/licenses/>.
+##
+##############################################################################
+
+
+"""This module contains helpers to choose the order in which the points of a
+scan are visited"""
+
+__all__ = ["get_move_durations", "get_visit_order"]
+
+__docformat__ = 'restructuredtext'
+
+import numpy
+
+from sardana.util.motion import get_motion_durations
+
+
+def get_move_durations(motors, origin, positions):
+    """Returns the time it takes to move from the origin to each of the given
+    positions. The moveables move at the same time so the duration of each
+    movement is the one of the slowest motor.
+
+    :param motors: the (virtual) motors (one per moveable)
+    :type motors: seq<sardana.util.motion.BaseMotor>
+    :param origin: the initial position of each moveable
+    :type origin: seq<float>
+    :param positions: 2D array where each row is a position
+    :type positions: numpy.ndarray
+    :return: the duration (s) of each movement
+    :rtype: numpy.ndarray"""
+    positions = numpy.asarray(positions, dtype='d')
+    durations = numpy.zeros(len(positions))
+    for i, motor in enumerate(motors):
+        displacements = positions[:, i] - origin[i]
+        durations = numpy.maximum(durations,
+                                  get_motion_durations(motor, displacements))
+    return durations
+
+
+def get_visit_order(motors, origin, positions):
+    """Returns an order to visit all the given positions which minimizes the
+    total motion time (nearest neighbour heuristic: the next position is the
+    one reached in less time from the current one).
+
+    :param motors: the (virtual) motors (one per moveable)
+    :type motors: seq<sardana.util.motion.BaseMotor>
+    :param origin: the position of each moveable before the scan
+    :type origin: seq<float>
+    :param positions: 2D array where each row is a position
+    :type positions: numpy.ndarray
+    :return: the indexes of the positions in the order they should be visited
+    :rtype: numpy.ndarray"""
+    positions = numpy.asarray(positions, dtype='d')
+    nb_points = len(positions)
+    order = numpy.empty(nb_points, dtype='int64')
+    # indexes of the points not visited yet
+    pending = numpy.arange(nb_points)
+    current = origin
+    for i in xrange(nb_points):
+        durations = get_move_durations(motors, current, positions[pending])
+        # on equal durations argmin keeps the logical order
+        nearest = durations.argmin()
+        order[i] = index = pending[nearest]
+        pending = numpy.delete(pending, nearest)
+        current = positions[index]
+    return order
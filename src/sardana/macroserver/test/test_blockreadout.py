@@ -0,0 +1,62 @@
+#!/usr/bin/env python
+
+##############################################################################
+##
+## This file is part of Sardana
+##
+## http://www.sardana-controls.org/
+##
+## Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+## Sardana is free software: you can redistribute it and/or modify
+## it under the terms of the GNU Lesser General Public License as published by
+## the Free Software Foundation, either version 3 of the License, or
+## (at your option) any later version.
+##
+## Sardana is distributed in the hope that it will be useful,
+## but WITHOUT ANY WARRANTY; without even the implied warranty of
+## MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+## GNU Lesser General Public License for more details.
+##
+## You should have received a copy of the GNU Lesser General Public License
+## along with Sardana.  If not, see <http://www.gnu.org/licenses/>.
+##
+##############################################################################
+
+from taurus.external import unittest
+
+from sardana.macroserver.scan.blockreadout import RecordAssembler
+
+
+class RecordAssemblerTestCase(unittest.TestCase):
+
+    def test_records_by_index(self):
+        """Verify records are returned once, in order, when all the sources
+        have provided their data"""
+        assembler = RecordAssembler(4, ["ct01", "ct02"])
+        assembler.update("ct01", [1, 2, 3])
+        self.assertEqual(assembler.pop_records(), [])
+        assembler.update("ct02", [10])
+        self.assertEqual(assembler.pop_records(),
+                         [{"point_nb": 0, "ct01": 1, "ct02": 10}])
+        # the whole buffer is read back each time
+        assembler.update("ct02", [10, 20, 30, 40])
+        records = assembler.pop_records()
+        self.assertEqual([r["point_nb"] for r in records], [1, 2])
+        self.assertEqual(records[1]["ct02"], 30)
+        self.assertFalse(assembler.is_complete())
+        assembler.update("ct01", [1, 2, 3, 4, 5])
+        records = assembler.pop_records()
+        self.assertEqual(records, [{"point_nb": 3, "ct01": 4, "ct02": 40}])
+        self.assertTrue(assembler.is_complete())
+        self.assertEqual(assembler.pop_records(), [])
+
+    def test_add_source(self):
+        """Verify a source added later also delays the records"""
+        assembler = RecordAssembler(2, ["ct01"])
+        assembler.add_source("mot01")
+        assembler.update("ct01", [1, 2])
+        self.assertEqual(assembler.get_nb_ready(), 0)
+        assembler.update("mot01", [0.5])
+        self.assertEqual(assembler.pop_records(),
+                         [{"point_nb": 0, "ct01": 1, "mot01": 0.5}])
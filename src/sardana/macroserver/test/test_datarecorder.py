@@ -0,0 +1,69 @@
+#!/usr/bin/env python
+
+##############################################################################
+##
+## This file is part of Sardana
+##
+## http://www.sardana-controls.org/
+##
+## Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+## Sardana is free software: you can redistribute it and/or modify
+## it under the terms of the GNU Lesser General Public License as published by
+## the Free Software Foundation, either version 3 of the License, or
+## (at your option) any later version.
+##
+## Sardana is distributed in the hope that it will be useful,
+## but WITHOUT ANY WARRANTY; without even the implied warranty of
+## MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+## GNU Lesser General Public License for more details.
+##
+## You should have received a copy of the GNU Lesser General Public License
+## along with Sardana.  If not, see <http://www.gnu.org/licenses/>.
+##
+##############################################################################
+
+from taurus.external import unittest
+
+from sardana.macroserver.scan.recorder.datarecorder import FlushPolicy, \
+    RowFormatter, DataRecorder
+
+
+class FlushPolicyTestCase(unittest.TestCase):
+
+    def test_records(self):
+        policy = FlushPolicy(records=3)
+        self.assertEqual([policy.record() for i in range(3)],
+                         [False, False, True])
+        policy.reset()
+        self.assertFalse(policy.record())
+
+    def test_period(self):
+        policy = FlushPolicy(records=None, period=0)
+        self.assertTrue(policy.record())
+        policy = FlushPolicy(records=None, period=3600)
+        self.assertFalse(policy.record())
+
+    def test_default(self):
+        self.assertTrue(FlushPolicy().record())
+
+    def test_recorder(self):
+        recorder = DataRecorder()
+        self.assertTrue(recorder.flush_policy.record())
+        recorder.setFlushPolicy(records=2, period=3600)
+        self.assertEqual([recorder.flush_policy.record() for i in range(2)],
+                         [False, True])
+
+
+class RowFormatterTestCase(unittest.TestCase):
+
+    def test_format(self):
+        formatter = RowFormatter(["mot01", "ct01", "ct02"])
+        data = dict(mot01=1.5, ct01=None, timestamp=0.1)
+        self.assertEqual(formatter.format(data), "1.5 nan nan\n")
+
+    def test_format_prefix(self):
+        formatter = RowFormatter(["mot01", "ct01"], prefix=' ',
+                                 none_is_missing=False)
+        data = dict(mot01=1, ct01=None)
+        self.assertEqual(formatter.format(data), " 1 None\n")
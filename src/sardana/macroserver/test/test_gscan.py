@@ -0,0 +1,298 @@
+#!/usr/bin/env python
+
+##############################################################################
+##
+## This file is part of Sardana
+##
+## http://www.sardana-controls.org/
+##
+## Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+## Sardana is free software: you can redistribute it and/or modify
+## it under the terms of the GNU Lesser General Public License as published by
+## the Free Software Foundation, either version 3 of the License, or
+## (at your option) any later version.
+##
+## Sardana is distributed in the hope that it will be useful,
+## but WITHOUT ANY WARRANTY; without even the implied warranty of
+## MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+## GNU Lesser General Public License for more details.
+##
+## You should have received a copy of the GNU Lesser General Public License
+## along with Sardana.  If not, see <http://www.gnu.org/licenses/>.
+##
+##############################################################################
+
+"""Unit tests for the gscan module"""
+
+import numpy
+
+from taurus.external import unittest
+
+from sardana.util.motion import Motor, MotionPath
+from sardana.macroserver.msexception import UnknownEnv
+from sardana.macroserver.scan.gscan import GScan, CTScan, TangoExtraData, \
+    TangoAttributeReader
+
+
+class FakeDeviceAttribute(object):
+
+    has_failed = False
+
+    def __init__(self, name, value):
+        self.name = name
+        self.value = value
+
+
+class FakeDeviceProxy(object):
+
+    def __init__(self, values):
+        self.values = values
+        self.requests = []
+
+    def read_attributes_asynch(self, names):
+        self.requests.append(names)
+        return len(self.requests) - 1
+
+    def read_attributes_reply(self, req_id, timeout):
+        return [FakeDeviceAttribute(name, self.values[name])
+                for name in self.requests[req_id]]
+
+
+class FakeDecodedValue(object):
+
+    def __init__(self, value):
+        self.value = value
+
+
+class FakeTaurusAttribute(object):
+    """Decodes like taurus: a state is given as a string"""
+
+    def decode(self, attr_value):
+        return FakeDecodedValue("STATE:%s" % attr_value.value)
+
+
+class FakeScan(object):
+
+    _readExtraColumns = GScan._readExtraColumns.im_func
+
+    def __init__(self, extra_columns):
+        self._extra_columns = extra_columns
+        self._extra_columns_reader = None
+
+
+class TangoAttributeReaderTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.proxy = FakeDeviceProxy({"state": 0, "position": 1.5})
+        self._proxies = TangoAttributeReader._proxies
+        TangoAttributeReader._proxies = {"a/b/c": self.proxy}
+
+    def tearDown(self):
+        TangoAttributeReader._proxies = self._proxies
+
+    def test_read(self):
+        """Attributes of the same device are read with one request"""
+        reader = TangoAttributeReader(["a/b/c/state", "a/b/c/position"])
+        values = reader.readAttributes()
+        self.assertEqual(self.proxy.requests, [["state", "position"]])
+        self.assertEqual(values["a/b/c/position"].value, 1.5)
+        self.assertEqual(reader.read(), {"a/b/c/state": 0,
+                                         "a/b/c/position": 1.5})
+
+    def test_extra_columns_decode(self):
+        """Extra columns read together are decoded by their taurus
+        attribute, as when read one by one"""
+        state = TangoExtraData(model="a/b/c/state", label="state",
+                               dtype="str", shape=())
+        state._attribute = FakeTaurusAttribute()
+        scan = FakeScan([state])
+        data_line = {}
+        scan._readExtraColumns(data_line)
+        self.assertEqual(data_line, {"state": "STATE:0"})
+
+
+class FakeMacro(object):
+
+    def __init__(self, name, env=None):
+        self.name = name
+        self.env = env or {}
+
+    def getName(self):
+        return self.name
+
+    def debug(self, *args, **kwargs):
+        pass
+
+    def getEnv(self, name):
+        try:
+            return self.env[name]
+        except KeyError:
+            raise UnknownEnv(name)
+
+
+class FakeEstimationScan(object):
+
+    DEAD_TIME_HISTORY = GScan.DEAD_TIME_HISTORY
+    get_point_dead_time = GScan.get_point_dead_time.im_func
+    _estimate_steps = GScan._estimate_steps.im_func
+
+    def __init__(self, motors, macro):
+        self.motors = motors
+        self.macro = macro
+
+    def get_virtual_motors(self):
+        return self.motors
+
+
+class EstimationTestCase(unittest.TestCase):
+    """Unittest of the scan time estimation"""
+
+    def setUp(self):
+        self.motors = [Motor(min_vel=0, max_vel=10, accel_time=1,
+                             decel_time=1),
+                       Motor(min_vel=1, max_vel=100, accel_time=0.5,
+                             decel_time=2)]
+        self.macro = FakeMacro("ascan")
+        self.scan = FakeEstimationScan(self.motors, self.macro)
+
+    def _expected(self, start_pos, positions):
+        total, last = 0.0, start_pos
+        for pos in positions:
+            total += max([MotionPath(motor, p1, p2).duration
+                          for motor, p1, p2 in zip(self.motors, last, pos)])
+            last = pos
+        return total
+
+    def test_estimate_steps(self):
+        """Verify the vectorized estimate matches MotionPath"""
+        start_pos = numpy.array([0.0, 0.0])
+        positions = numpy.array([[0.0, 0.0], [10.0, 1.0], [0.0, 500.0],
+                                 [-0.5, 500.0], [5.0, -3.0]])
+        integ_times = numpy.array([0.1, 0.2, 0.3, -1000, 0.4])
+        estimate = self.scan._estimate_steps(start_pos, positions,
+                                             integ_times)
+        # monitor counts (negative) do not add time
+        expected = self._expected(start_pos, positions) + 1.0
+        self.assertAlmostEqual(estimate, expected)
+        self.assertEqual(self.scan._estimate_steps(start_pos,
+                                                   positions[:0], []), 0.0)
+
+    def test_estimate_steps_dead_time(self):
+        """Verify the dead time of each point is added"""
+        self.macro.env['ScanHistory'] = [dict(macro="ascan",
+                                              pointdeadtime=0.5)]
+        start_pos = numpy.array([0.0, 0.0])
+        positions = numpy.array([[1.0, 1.0], [2.0, 2.0]])
+        estimate = self.scan._estimate_steps(start_pos, positions,
+                                             numpy.zeros(2))
+        self.assertAlmostEqual(estimate,
+                               self._expected(start_pos, positions) + 1.0)
+
+    def test_point_dead_time(self):
+        """Verify the dead time is the median of the last scans of the same
+        macro"""
+        self.assertEqual(self.scan.get_point_dead_time(), 0.0)
+        history = [dict(macro="ascan", pointdeadtime=100.0)]
+        history += [dict(macro="ascan", pointdeadtime=t)
+                    for t in (0.1, 0.4, 0.2, 0.3, 10.0)]
+        history.insert(3, dict(macro="dscan", pointdeadtime=50.0))
+        history.append(dict(macro="ascan", pointdeadtime=None))
+        history.append(dict(macro="ascan"))
+        self.macro.env['ScanHistory'] = history
+        # the oldest ascan is out of the last DEAD_TIME_HISTORY ones
+        self.assertEqual(self.scan.DEAD_TIME_HISTORY, 5)
+        self.assertAlmostEqual(self.scan.get_point_dead_time(), 0.3)
+        self.macro.name = "mesh"
+        self.assertEqual(self.scan.get_point_dead_time(), 0.0)
+
+
+class FakeMoveable(object):
+
+    def __init__(self, name, type_):
+        self.name = name
+        self.type = type_
+
+    def getName(self):
+        return self.name
+
+    def getType(self):
+        return self.type
+
+
+class FakeMoveableDesc(object):
+
+    def __init__(self, moveable):
+        self.moveable = moveable
+
+
+class FakeMntGrp(object):
+
+    def __init__(self):
+        self.triggers = None
+
+    def configureTriggers(self, source, start, step, positionSource=""):
+        self.triggers = source, start, step, positionSource
+
+
+class FakeCTScan(object):
+
+    _configure_internal_triggers = \
+        CTScan._configure_internal_triggers.im_func
+    _go_through_waypoints = CTScan._go_through_waypoints.im_func
+    _physical_motion = None
+    steps = ()
+
+    def __init__(self, macro, moveable, physical_moveable):
+        self.macro = macro
+        self.macro.nr_of_points = 5
+        self.moveables = [FakeMoveableDesc(moveable)]
+        self._physical_moveables = [physical_moveable]
+        self._measurement_group = FakeMntGrp()
+
+
+class CTScanTriggerTestCase(unittest.TestCase):
+    """Unittest of the CTScan trigger configuration"""
+
+    def test_no_trigger_device(self):
+        """Verify the trigger device is optional"""
+        trigger = CTScan.ExtraTrigger(FakeMacro("ascanct"))
+        self.assertEqual(trigger.master, None)
+        self.assertEqual(trigger.slaves, [])
+        trigger.start()
+        trigger.stop()
+
+    def test_time(self):
+        """Verify the channels are triggered in time by default"""
+        motor = FakeMoveable("mot01", "Motor")
+        scan = FakeCTScan(FakeMacro("ascanct"), motor, motor)
+        self.assertEqual(scan._configure_internal_triggers([0], [8], 1.5,
+                                                           0.2), "mot01")
+        self.assertEqual(scan._measurement_group.triggers,
+                         ("time", 1.5, 0.2, "mot01"))
+
+    def test_position(self):
+        """Verify the channels are triggered by the position of a physical
+        motor"""
+        motor = FakeMoveable("mot01", "Motor")
+        macro = FakeMacro("ascanct", dict(TriggerSource="position"))
+        scan = FakeCTScan(macro, motor, motor)
+        scan._configure_internal_triggers([0], [8], 1.5, 0.2)
+        self.assertEqual(scan._measurement_group.triggers,
+                         ("mot01", 0, 2, "mot01"))
+
+    def test_position_pseudo(self):
+        """Verify position triggering is rejected for pseudo motors"""
+        pseudo = FakeMoveable("gap01", "PseudoMotor")
+        macro = FakeMacro("ascanct", dict(TriggerSource="position"))
+        scan = FakeCTScan(macro, pseudo, FakeMoveable("mot01", "Motor"))
+        self.assertRaises(ValueError, scan._configure_internal_triggers,
+                          [0], [8], 1.5, 0.2)
+        self.assertEqual(scan._measurement_group.triggers, None)
+
+    def test_no_points(self):
+        """Verify a scan without points is rejected"""
+        motor = FakeMoveable("mot01", "Motor")
+        scan = FakeCTScan(FakeMacro("ascanct"), motor, motor)
+        scan.macro.nr_of_points = 0
+        self.assertRaises(ValueError, scan._go_through_waypoints)
@@ -0,0 +1,106 @@
+#!/usr/bin/env python
+
+##############################################################################
+##
+## This file is part of Sardana
+##
+## http://www.sardana-controls.org/
+##
+## Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+## Sardana is free software: you can redistribute it and/or modify
+## it under the terms of the GNU Lesser General Public License as published by
+## the Free Software Foundation, either version 3 of the License, or
+## (at your option) any later version.
+##
+## Sardana is distributed in the hope that it will be useful,
+## but WITHOUT ANY WARRANTY; without even the implied warranty of
+## MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+## GNU Lesser General Public License for more details.
+##
+## You should have received a copy of the GNU Lesser General Public License
+## along with Sardana.  If not, see <http://www.gnu.org/licenses/>.
+##
+##############################################################################
+
+from taurus.external import unittest
+
+from sardana.macroserver.msdoor import MacroProxyCache
+from sardana.macroserver.msexception import UnknownMacro
+
+
+class FakeMacroMeta(object):
+
+    def __init__(self, name):
+        self.name = name
+
+
+class FakeDoor(object):
+
+    def __init__(self, names):
+        self.macros = dict([(name, FakeMacroMeta(name)) for name in names])
+        self.requests = 0
+
+    def get_macro(self, name):
+        self.requests += 1
+        try:
+            return self.macros[name]
+        except KeyError:
+            raise UnknownMacro("Unknown macro %s" % name)
+
+    def reload_macro(self, name):
+        self.macros[name] = FakeMacroMeta(name)
+
+
+class MacroProxyCacheTestCase(unittest.TestCase):
+    """Unittest of the lazy macro proxy cache of the door"""
+
+    def setUp(self):
+        self.door = FakeDoor(["ascan", "mv", "wa"])
+        self.cache = MacroProxyCache(self.door)
+
+    def test_lazy(self):
+        """Verify the proxies are only created when requested"""
+        self.assertEqual(self.door.requests, 0)
+        self.assertEqual(len(self.cache), 0)
+        proxy = self.cache["mv"]
+        self.assertTrue(proxy.macro_info is self.door.macros["mv"])
+        self.assertTrue(proxy.door is self.door)
+        self.assertEqual(self.cache.keys(), ["mv"])
+        self.assertTrue(self.cache.wa.macro_info is self.door.macros["wa"])
+        self.assertEqual(sorted(self.cache.keys()), ["mv", "wa"])
+
+    def test_same_proxy(self):
+        """Verify the proxy is reused while the macro is not reloaded"""
+        proxy = self.cache["ascan"]
+        self.assertTrue(self.cache["ascan"] is proxy)
+        self.assertTrue(self.cache.ascan is proxy)
+        self.assertTrue(self.cache.get("ascan") is proxy)
+
+    def test_reload(self):
+        """Verify the proxy is recreated after the macro is reloaded"""
+        proxy = self.cache["ascan"]
+        self.door.reload_macro("ascan")
+        new_proxy = self.cache["ascan"]
+        self.assertFalse(new_proxy is proxy)
+        self.assertTrue(new_proxy.macro_info is self.door.macros["ascan"])
+        self.assertTrue(self.cache["ascan"] is new_proxy)
+
+    def test_unknown(self):
+        """Verify unknown (or removed) macros are reported as missing"""
+        self.assertRaises(KeyError, self.cache.__getitem__, "unknown")
+        self.assertRaises(AttributeError, getattr, self.cache, "unknown")
+        self.assertEqual(self.cache.get("unknown", 1), 1)
+        self.assertFalse("unknown" in self.cache)
+        self.assertTrue("mv" in self.cache)
+        self.cache["mv"]
+        del self.door.macros["mv"]
+        self.assertFalse("mv" in self.cache)
+        self.assertRaises(KeyError, self.cache.__getitem__, "mv")
+
+    def test_rebuild(self):
+        """Verify rebuild discards the proxies"""
+        proxy = self.cache["mv"]
+        self.cache.rebuild()
+        self.assertEqual(len(self.cache), 0)
+        self.assertFalse(self.cache["mv"] is proxy)
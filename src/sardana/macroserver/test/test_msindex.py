@@ -0,0 +1,132 @@
+#!/usr/bin/env python
+
+##############################################################################
+##
+## This file is part of Sardana
+##
+## http://www.sardana-controls.org/
+##
+## Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+## Sardana is free software: you can redistribute it and/or modify
+## it under the terms of the GNU Lesser General Public License as published by
+## the Free Software Foundation, either version 3 of the License, or
+## (at your option) any later version.
+##
+## Sardana is distributed in the hope that it will be useful,
+## but WITHOUT ANY WARRANTY; without even the implied warranty of
+## MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+## GNU Lesser General Public License for more details.
+##
+## You should have received a copy of the GNU Lesser General Public License
+## along with Sardana.  If not, see <http://www.gnu.org/licenses/>.
+##
+##############################################################################
+
+from taurus.external import unittest
+
+from sardana import ElementType
+from sardana.macroserver.msindex import ElementIndex
+
+
+class FakeElement(object):
+
+    def __init__(self, name, elem_type, interfaces):
+        self.name = name
+        self.type = elem_type
+        self.interfaces = interfaces
+
+    def getType(self):
+        return self.type
+
+
+class FakeMacro(object):
+
+    def __init__(self, name):
+        self.name = name
+
+    def get_type(self):
+        return ElementType.MacroClass
+
+    def get_interface_names(self):
+        return ["Object", "MacroServerObject", "MacroCode", "Class",
+                "MacroClass"]
+
+
+class FakePool(object):
+
+    def __init__(self, elements):
+        self.elements = elements
+
+    def getElements(self):
+        return self.elements
+
+
+class FakeMacroServer(object):
+
+    def __init__(self):
+        self.pools = {}
+        self.macros = {}
+
+    def get_pool_names(self):
+        return self.pools.keys()
+
+    def get_pool(self, name):
+        return self.pools.get(name)
+
+    def get_macro_libs(self):
+        return {}
+
+    def get_macros(self):
+        return self.macros
+
+
+class ElementIndexTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.ms = FakeMacroServer()
+        mot_interfaces = ["Object", "PoolElement", "Moveable", "Motor"]
+        self.mot01 = FakeElement("Mot01", "Motor", mot_interfaces)
+        self.mot02 = FakeElement("mot02", "Motor", mot_interfaces)
+        self.ct01 = FakeElement("ct01", "CTExpChannel",
+                                ["Object", "PoolElement", "ExpChannel"])
+        self.ms.pools["pool1"] = FakePool([self.mot01, self.ct01])
+        self.ms.pools["pool2"] = FakePool([self.mot02])
+        self.ascan = FakeMacro("ascan")
+        self.ms.macros["ascan"] = self.ascan
+        self.index = ElementIndex(self.ms)
+
+    def test_type_and_interface(self):
+        index = self.index
+        motors = index.get_pool_elements_of_type("Motor")
+        self.assertEqual(set(motors.values()), set([self.mot01, self.mot02]))
+        self.assertIs(motors["mot01"], self.mot01)
+        moveables = index.get_pool_elements_with_interface("Moveable",
+                                                           pool="pool2")
+        self.assertEqual(moveables.values(), [self.mot02])
+        macros = index.get_local_elements_with_interface("MacroCode")
+        self.assertEqual(macros.values(), [self.ascan])
+
+    def test_name(self):
+        index = self.index
+        self.assertEqual(index.get_elements_by_name("MOT01"), [self.mot01])
+        self.assertEqual(index.get_elements_by_name("ascan"), [self.ascan])
+        self.assertEqual(index.get_elements_by_name("ct02"), [])
+        self.assertEqual(index.get_names_starting_with("mot"),
+                         ["mot01", "mot02"])
+        self.assertEqual(index.get_names_starting_with("M", pool="pool1"),
+                         ["mot01"])
+
+    def test_invalidate(self):
+        index = self.index
+        self.assertEqual(len(index.get_pool_elements_of_type("Motor")), 2)
+        mot03 = FakeElement("mot03", "Motor", ["Motor"])
+        self.ms.pools["pool2"].elements.append(mot03)
+        # the index is only updated when invalidated
+        self.assertEqual(len(index.get_pool_elements_of_type("Motor")), 2)
+        index.invalidate_pools()
+        self.assertIs(index.get_pool_elements_of_type("Motor")["mot03"],
+                      mot03)
+        self.ms.macros["dscan"] = FakeMacro("dscan")
+        index.invalidate_local()
+        self.assertEqual(index.get_names_starting_with("d"), ["dscan"])
@@ -0,0 +1,102 @@
+#!/usr/bin/env python
+
+##############################################################################
+##
+## This file is part of Sardana
+##
+## http://www.sardana-controls.org/
+##
+## Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+## Sardana is free software: you can redistribute it and/or modify
+## it under the terms of the GNU Lesser General Public License as published by
+## the Free Software Foundation, either version 3 of the License, or
+## (at your option) any later version.
+##
+## Sardana is distributed in the hope that it will be useful,
+## but WITHOUT ANY WARRANTY; without even the implied warranty of
+## MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+## GNU Lesser General Public License for more details.
+##
+## You should have received a copy of the GNU Lesser General Public License
+## along with Sardana.  If not, see <http://www.gnu.org/licenses/>.
+##
+##############################################################################
+
+import os
+import shutil
+import tempfile
+
+import numpy
+
+from taurus.external import unittest
+
+from sardana.util.ringbuffer import RingBufferWriter, RingBufferReader
+
+
+class RingBufferTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.dir, 'ring')
+        self.columns = [('point_nb', 'int64', ()), ('ct01', 'float64', ()),
+                        ('oned', 'float32', (3,))]
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def _write(self, writer, start, end):
+        for i in range(start, end):
+            writer.write({'point_nb': i, 'ct01': i * 0.5,
+                          'oned': [i, i, i]})
+
+    def test_schema(self):
+        """Verify the reader gets the schema and the zero copy view"""
+        writer = RingBufferWriter(self.path, self.columns, 8, serialno=7,
+                                  env={'title': 'ascan mot01 0 1 2 0.1'})
+        reader = RingBufferReader(self.path)
+        self.assertEqual(reader.serialno, 7)
+        self.assertEqual(reader.capacity, 8)
+        self.assertEqual(reader.env['title'], 'ascan mot01 0 1 2 0.1')
+        self.assertEqual(reader.dtype.names, ('point_nb', 'ct01', 'oned'))
+        self._write(writer, 0, 2)
+        self.assertEqual(reader.getWriteIndex(), 2)
+        self.assertEqual(reader.records[1]['ct01'], 0.5)
+        self.assertFalse(reader.isEnded())
+        writer.close()
+        self.assertTrue(reader.isEnded())
+
+    def test_read(self):
+        """Verify incremental reads, wrap around and missing values"""
+        writer = RingBufferWriter(self.path, self.columns, 4)
+        reader = RingBufferReader(self.path)
+        self._write(writer, 0, 3)
+        start, data, next_index = reader.read()
+        self.assertEqual((start, next_index), (0, 3))
+        self.assertEqual(list(data['point_nb']), [0, 1, 2])
+        writer.write({'point_nb': 3})
+        self._write(writer, 4, 5)
+        start, data, next_index = reader.read(next_index)
+        self.assertEqual((start, next_index), (3, 5))
+        self.assertTrue(numpy.isnan(data['ct01'][0]))
+        self.assertEqual(list(data['oned'][1]), [4, 4, 4])
+        # records 5 and 6 overwritten by 8 and 9
+        self._write(writer, 5, 10)
+        start, data, next_index = reader.read(next_index)
+        self.assertEqual((start, next_index), (7, 10))
+        self.assertEqual(list(data['point_nb']), [7, 8, 9])
+        self.assertEqual(len(reader.read(next_index)[1]), 0)
+
+    def test_replace(self):
+        """Verify a new ring buffer in the same path does not disturb
+        attached readers"""
+        writer = RingBufferWriter(self.path, self.columns, 4)
+        self._write(writer, 0, 2)
+        writer.close()
+        reader = RingBufferReader(self.path)
+        self.assertFalse(reader.isReplaced())
+        writer = RingBufferWriter(self.path, self.columns[:2], 16)
+        self.assertTrue(reader.isReplaced())
+        self.assertEqual(list(reader.read()[1]['point_nb']), [0, 1])
+        self.assertEqual(RingBufferReader(self.path).capacity, 16)
+        writer.close()
@@ -0,0 +1,264 @@
+#!/usr/bin/env python
+
+##############################################################################
+##
+## This file is part of Sardana
+##
+## http://www.sardana-controls.org/
+##
+## Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+## Sardana is free software: you can redistribute it and/or modify
+## it under the terms of the GNU Lesser General Public License as published by
+## the Free Software Foundation, either version 3 of the License, or
+## (at your option) any later version.
+##
+## Sardana is distributed in the hope that it will be useful,
+## but WITHOUT ANY WARRANTY; without even the implied warranty of
+## MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+## GNU Lesser General Public License for more details.
+##
+## You should have received a copy of the GNU Lesser General Public License
+## along with Sardana.  If not, see <http://www.gnu.org/licenses/>.
+##
+##############################################################################
+
+"""Unit tests of the helpers of the scan macros (no door is needed)"""
+
+import numpy
+
+from taurus.external import unittest
+
+from sardana.macroserver.msparameter import Type
+
+#: parameter types used by the scan macros (registered by the macro server
+#: type manager)
+ScanParamTypes = ('Boolean', 'Float', 'Integer', 'Moveable', 'String')
+
+
+class ScanMacrosTestCase(unittest.TestCase):
+    """Base of the scan macros tests. The scan macros module can only be
+    imported with the parameter types it uses registered: the missing ones
+    are registered for each test and unregistered afterwards"""
+
+    def setUp(self):
+        self.added_types = [name for name in ScanParamTypes
+                            if not hasattr(Type, name)]
+        for name in self.added_types:
+            Type.addType(name)
+        from sardana.macroserver.macros import scan
+        self.scan_module = scan
+
+    def tearDown(self):
+        for name in self.added_types:
+            Type.removeType(name)
+
+
+class FakeFscan(object):
+    """fscan with only the path evaluation state (to be mixed with fscan)"""
+
+    def __init__(self, indepvars, funcs, chunk_size=None):
+        self.indepvars = indepvars
+        self.nr_points = min(map(len, indepvars.values()))
+        self.funcstrings = funcs
+        self.N = len(funcs)
+        self.integ_time = numpy.ones(self.nr_points)
+        self.point_indexes = None
+        if chunk_size is not None:
+            self.PathChunkSize = chunk_size
+        self.evaluated = []
+        self._preparePaths()
+
+    def _evalPathPoints(self, func, start, end):
+        self.evaluated.append((func, start, end))
+        return super(FakeFscan, self)._evalPathPoints(func, start, end)
+
+    def getHooks(self, name):
+        return []
+
+
+class FscanPathTestCase(ScanMacrosTestCase):
+    """Unittest of the fscan path evaluation"""
+
+    def setUp(self):
+        ScanMacrosTestCase.setUp(self)
+        self.fscan = type('FakeFscan', (FakeFscan, self.scan_module.fscan),
+                          {})
+
+    def test_vectorized(self):
+        """Verify element-wise expressions are evaluated at once"""
+        scan = self.fscan(dict(x=[1, 3, 5, 7, 9], y=range(6)),
+                          ['x**2', 'sqrt(y*x+3)'])
+        numpy.testing.assert_allclose(scan._paths[0], [1, 9, 25, 49, 81])
+        numpy.testing.assert_allclose(scan._paths[1],
+                                      numpy.sqrt([3, 6, 13, 24, 39]))
+        paths = scan._getPaths(0, 5)
+        self.assertEqual(paths.shape, (2, 5))
+        self.assertEqual(scan.evaluated, [])
+
+    def test_point_by_point(self):
+        """Verify expressions which are not element-wise are evaluated
+        point by point"""
+        scan = self.fscan(dict(x=[1, 2, 3, 4]), ['x if x > 2 else -x', '5'])
+        self.assertEqual(scan._paths, [None, None])
+        paths = scan._getPaths(0, 4)
+        numpy.testing.assert_allclose(paths, [[-1, -2, 3, 4], [5, 5, 5, 5]])
+
+    def test_random(self):
+        """Verify expressions using random functions are evaluated point by
+        point so each point gets its own random value"""
+        for func in ('x+rand()', 'x+randn()*0.1'):
+            scan = self.fscan(dict(x=numpy.zeros(50)), [func])
+            self.assertEqual(scan._paths, [None])
+            path = scan._getPaths(0, 50)[0]
+            self.assertTrue(len(numpy.unique(path)) > 1)
+
+    def test_chunks(self):
+        """Verify long paths evaluated point by point are evaluated in
+        chunks while scanning"""
+        scan = self.fscan(dict(x=range(10)), ['x if x else 100', '2*x'],
+                          chunk_size=4)
+        positions, point_ids = [], []
+        for step in scan._generator():
+            positions.append(list(step['positions']))
+            point_ids.append(step['point_id'])
+        self.assertEqual(point_ids, range(10))
+        self.assertEqual(positions,
+                         [[100, 0]] + [[i, 2 * i] for i in range(1, 10)])
+        # the first point is evaluated when preparing the scan
+        self.assertEqual(scan.evaluated,
+                         [('x if x else 100', 0, 1),
+                          ('x if x else 100', 0, 4),
+                          ('x if x else 100', 4, 8),
+                          ('x if x else 100', 8, 10)])
+
+    def test_errors(self):
+        """Verify invalid operations (ex: division by zero) raise errors as
+        when evaluating point by point"""
+        for x in ([0, 1, 2], [0., 1., 2.], numpy.arange(3)):
+            self.assertRaises((ValueError, ZeroDivisionError), self.fscan,
+                              dict(x=x), ['1/x'])
+            self.assertRaises((ValueError, ZeroDivisionError), self.fscan,
+                              dict(x=x), ['1/x if x < 5 else x'])
+        self.assertRaises(ValueError, self.fscan, dict(x=[-1, 1]),
+                          ['sqrt(x)'])
+
+    def test_wrong_expression(self):
+        """Verify a wrong expression fails when preparing the scan even if
+        the path is evaluated in chunks while scanning"""
+        self.assertRaises(NameError, self.fscan, dict(x=range(10)),
+                          ['x if x else y'], chunk_size=4)
+
+
+class FakeMoveable(object):
+
+    instrument = None
+
+    def getName(self):
+        return "energy"
+
+
+class FakeSScan(object):
+    """records the arguments instead of preparing a scan"""
+
+    def __init__(self, macro, generator, moveables, env, constrains,
+                 extrainfodesc):
+        self.moveables = moveables
+        self.extrainfodesc = extrainfodesc
+
+
+class FakeRegionScan(object):
+    """region scan with only the preparation state (to be mixed with rscan
+    or xafsscan)"""
+
+    def __init__(self):
+        pass
+
+    def getHooks(self, name):
+        return []
+
+
+class RegionScanTestCase(ScanMacrosTestCase):
+    """Unittest of the region scans preparation"""
+
+    def setUp(self):
+        ScanMacrosTestCase.setUp(self)
+        scan_module = self.scan_module
+        self.rscan = type('FakeRscan', (FakeRegionScan, scan_module.rscan),
+                          {})
+        self.xafsscan = type('FakeXafsscan',
+                             (FakeRegionScan, scan_module.xafsscan), {})
+        self._SScan = scan_module.SScan
+        scan_module.SScan = FakeSScan
+        self.motor = FakeMoveable()
+
+    def tearDown(self):
+        self.scan_module.SScan = self._SScan
+        ScanMacrosTestCase.tearDown(self)
+
+    def _steps(self, scan):
+        return [(step['positions'][0], step['integ_time'],
+                 step['extrainfo']['region'], step['point_id'])
+                for step in scan._generator()]
+
+    def test_region_positions(self):
+        """Verify the positions of a region include the final position only
+        if it falls on a step"""
+        get_region_positions = self.scan_module.get_region_positions
+        numpy.testing.assert_allclose(get_region_positions(0, 1, 0.1),
+                                      numpy.linspace(0, 1, 11))
+        numpy.testing.assert_allclose(get_region_positions(1, 0, 0.25),
+                                      [1, 0.75, 0.5, 0.25, 0])
+        numpy.testing.assert_allclose(get_region_positions(0, 1, -0.3),
+                                      [0, 0.3, 0.6, 0.9])
+        numpy.testing.assert_allclose(get_region_positions(2, 2, 1), [2])
+        self.assertRaises(ValueError, get_region_positions, 0, 1, 0)
+
+    def test_flatten(self):
+        """Verify the regions are flattened in a single scan which records
+        the region of each point"""
+        scan = self.rscan()
+        scan.prepare(self.motor, [[0, 2, 1, 0.1], [5, 6, 0.5, 0.2]])
+        self.assertEqual(scan.nr_points, 6)
+        self.assertEqual(self._steps(scan),
+                         [(0, 0.1, 0, 0), (1, 0.1, 0, 1), (2, 0.1, 0, 2),
+                          (5, 0.2, 1, 3), (5.5, 0.2, 1, 4), (6, 0.2, 1, 5)])
+        moveable = scan._gScan.moveables[0]
+        self.assertEqual((moveable.min_value, moveable.max_value), (0, 6))
+        self.assertEqual(scan._gScan.extrainfodesc[0].name, 'region')
+
+    def test_shared_boundary(self):
+        """Verify a region starting where the previous one ended does not
+        repeat that point"""
+        scan = self.rscan()
+        scan.prepare(self.motor, [[0, 1, 0.5, 1], [1, 2, 0.5, 2],
+                                  [2, 2, 1, 3], [2, 1, 1, 4]])
+        self.assertEqual(self._steps(scan),
+                         [(0, 1, 0, 0), (0.5, 1, 0, 1), (1, 1, 0, 2),
+                          (1.5, 2, 1, 3), (2, 2, 1, 4), (1, 4, 3, 5)])
+        self.assertRaises(ValueError, scan._prepare, self.motor, [([], 1)])
+
+    def test_k_space(self):
+        """Verify k regions are converted to energy above the edge and E
+        regions are relative to the edge"""
+        K2E = self.scan_module.K2E
+        self.assertEqual(K2E, 3.80998212)
+        edge = 7112.
+        scan = self.xafsscan()
+        scan.prepare(self.motor, edge, [['E', -10, 0, 5, 1],
+                                        ['k', 1, 3, 1, 2]])
+        k = numpy.array([1., 2., 3.])
+        numpy.testing.assert_allclose(
+            scan.positions, numpy.concatenate([[edge - 10, edge - 5, edge],
+                                               edge + K2E * k ** 2]))
+        numpy.testing.assert_allclose(scan.integ_times, [1, 1, 1, 2, 2, 2])
+        numpy.testing.assert_array_equal(scan.region_nbs, [0, 0, 0, 1, 1, 1])
+        # k=0 is the edge itself so it is not repeated
+        scan.prepare(self.motor, edge, [['E', -5, 0, 5, 1],
+                                        ['K', 0, 1, 1, 2]])
+        numpy.testing.assert_allclose(scan.positions,
+                                      [edge - 5, edge, edge + K2E])
+        self.assertRaises(ValueError, scan.prepare, self.motor, edge,
+                          [['k', -1, 1, 1, 1]])
+        self.assertRaises(ValueError, scan.prepare, self.motor, edge,
+                          [['q', 0, 1, 1, 1]])
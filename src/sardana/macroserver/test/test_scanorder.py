@@ -0,0 +1,71 @@
+#!/usr/bin/env python
+
+##############################################################################
+##
+## This file is part of Sardana
+##
+## http://www.sardana-controls.org/
+##
+## Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+## Sardana is free software: you can redistribute it and/or modify
+## it under the terms of the GNU Lesser General Public License as published by
+## the Free Software Foundation, either version 3 of the License, or
+## (at your option) any later version.
+##
+## Sardana is distributed in the hope that it will be useful,
+## but WITHOUT ANY WARRANTY; without even the implied warranty of
+## MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+## GNU Lesser General Public License for more details.
+##
+## You should have received a copy of the GNU Lesser General Public License
+## along with Sardana.  If not, see <http://www.gnu.org/licenses/>.
+##
+##############################################################################
+
+import numpy
+
+from taurus.external import unittest
+
+from sardana.util.motion import Motor, MotionPath, get_motion_durations
+from sardana.macroserver.scan.scanorder import get_move_durations, \
+    get_visit_order
+
+
+class ScanOrderTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.motors = [Motor(min_vel=0, max_vel=10, accel_time=1,
+                             decel_time=1),
+                       Motor(min_vel=1, max_vel=100, accel_time=0.5,
+                             decel_time=2)]
+
+    def test_motion_durations(self):
+        displacements = numpy.array([0, 0.1, 2, 10, 500])
+        for motor in self.motors:
+            expected = [MotionPath(motor, 0, d).duration
+                        for d in displacements]
+            durations = get_motion_durations(motor, displacements)
+            numpy.testing.assert_allclose(durations, expected)
+            # the duration does not depend on the direction
+            numpy.testing.assert_allclose(
+                get_motion_durations(motor, -displacements), expected)
+
+    def test_move_durations(self):
+        positions = numpy.array([[0, 0], [10, 0], [0, 1000], [5, 500]])
+        durations = get_move_durations(self.motors, [0, 0], positions)
+        self.assertEqual(durations[0], 0)
+        # the slowest motor gives the duration
+        for duration, (pos1, pos2) in zip(durations[1:], positions[1:]):
+            expected = max(MotionPath(self.motors[0], 0, pos1).duration,
+                           MotionPath(self.motors[1], 0, pos2).duration)
+            self.assertAlmostEqual(duration, expected)
+
+    def test_visit_order(self):
+        # a line visited back and forth
+        positions = numpy.array([[x, 0] for x in (0, 40, 10, 30, 20)])
+        order = get_visit_order(self.motors, [0, 0], positions)
+        self.assertEqual(list(order), [0, 2, 4, 3, 1])
+        order = get_visit_order(self.motors, [50, 0], positions)
+        self.assertEqual(list(order), [1, 3, 4, 2, 0])
+        self.assertEqual(sorted(order), range(len(positions)))
@@ -1073,6 +1073,13 @@ class PseudoMotorController(PseudoController):
                              'description' : 'Position', },
     }
 
+    #: A :obj:`bool` telling if the pool may cache the pseudo positions
+    #: calculated from the physical positions. The cache is cleared when a
+    #: controller or axis parameter or attribute is written and when the
+    #: controller is (re)initialized. Set it to False if the calculation
+    #: depends on anything else (ex: the value of another device)
+    cache_pseudo_positions = True
+
     #: A :obj:`str` representing the controller gender
     gender = 'Pseudo motor controller'
     
@@ -32,6 +32,7 @@ __all__ = ["Pool"]
 
 __docformat__ = 'restructuredtext'
 
+import sys
 import os.path
 import logging.handlers
 
@@ -54,6 +55,7 @@ from sardana.pool.poolcontroller import PoolController
 from sardana.pool.poolmonitor import PoolMonitor
 from sardana.pool.poolmetacontroller import TYPE_MAP_OBJ
 from sardana.pool.poolcontrollermanager import ControllerManager
+from sardana.pool.poolstartup import StartupProfile, run_parallel
 
 
 class Graph(dict):
@@ -120,6 +122,38 @@ class Pool(PoolContainer, PoolObject, SardanaElementManager, SardanaIDManager):
 
     Default_DriftCorrection = True
 
+    #: Default value representing if the motion loop uses the predicted
+    #: motion time to avoid reading the state during the motion. Disabled by
+    #: default since it delays the detection of limits and faults
+    Default_MotionLoop_Prediction = False
+
+    #: Default value representing the fraction of the predicted motion time
+    #: a motor may overrun before being reported as stalled (0 disables it).
+    #: Disabled by default since the prediction reads the motor parameters
+    #: at each motion start
+    Default_MotionLoop_StallTolerance = 0.0
+
+    #: Default value representing if the controllers involved in a motion
+    #: are started concurrently
+    Default_MotionParallelStart = False
+
+    #: Default value representing the maximum number of controllers
+    #: initialized concurrently during the pool startup (1 means serially).
+    #: Serial by default since user controllers may not be thread safe
+    #: during their initialization
+    Default_ControllerInitWorkers = 1
+
+    #: Default value representing if IORegister writes are done through the
+    #: (asynchronous) acquisition action which polls the register state
+    #: until the write finishes. Disabled by default: writes call the
+    #: controller directly and return when WriteOne returns
+    Default_IORegister_WritePolling = False
+
+    #: map between the single element event names and the keys of the
+    #: ElementsChanged event value
+    ElementEventKeys = {"ElementCreated": "new", "ElementChanged": "change",
+                        "ElementDeleted": "del"}
+
     def __init__(self, full_name, name=None):
         self._path_id = None
         self._motion_loop_states_per_position = self.Default_MotionLoop_StatesPerPosition
@@ -127,7 +161,18 @@ class Pool(PoolContainer, PoolObject, SardanaElementManager, SardanaIDManager):
         self._acq_loop_states_per_value = self.Default_AcqLoop_StatesPerValue
         self._acq_loop_sleep_time = self.Default_AcqLoop_SleepTime
         self._drift_correction = self.Default_DriftCorrection
+        self._motion_loop_prediction = self.Default_MotionLoop_Prediction
+        self._motion_loop_stall_tolerance = \
+            self.Default_MotionLoop_StallTolerance
+        self._motion_parallel_start = self.Default_MotionParallelStart
+        self._ctrl_init_workers = self.Default_ControllerInitWorkers
+        self._ioregister_write_polling = self.Default_IORegister_WritePolling
+        self._startup_profile = StartupProfile()
         self._remote_log_handler = None
+        self._element_info_cache = {}
+        self._element_str_cache = {}
+        self._element_events_batch = None
+        self._element_events_batch_level = 0
 
         # dict<str, dict<str, str>>
         # keys are acquisition channel names and value is a dict describing the
@@ -215,6 +260,89 @@ class Pool(PoolContainer, PoolObject, SardanaElementManager, SardanaIDManager):
         kwargs['parent'] = None
         return kwargs
 
+    # --------------------------------------------------------------------------
+    # element events
+    # --------------------------------------------------------------------------
+
+    def fire_event(self, event_type, event_value, listeners=None,
+                   protected=True):
+        evt_name = event_type.name
+        key = self.ElementEventKeys.get(evt_name)
+        if key is not None:
+            if key == "change":
+                # a rename changes the serialization of the groups using it
+                self.invalidate_element_info()
+            elif key == "del":
+                self.invalidate_element_info(event_value)
+            batch = self._element_events_batch
+            if batch is not None:
+                self._add_element_event(batch, key, event_value)
+                return
+        elif evt_name == "ElementsChanged":
+            self.invalidate_element_info()
+        return PoolObject.fire_event(self, event_type, event_value,
+                                     listeners=listeners, protected=protected)
+
+    def _add_element_event(self, batch, key, elem):
+        new, change, deleted = batch["new"], batch["change"], batch["del"]
+        if key == "new":
+            new.append(elem)
+        elif key == "change":
+            if elem not in new and elem not in change:
+                change.append(elem)
+        elif elem in new:
+            # created and deleted within the same batch
+            new.remove(elem)
+        else:
+            if elem in change:
+                change.remove(elem)
+            deleted.append(elem)
+
+    def start_element_events_batch(self):
+        """Starts collecting the ElementCreated, ElementChanged and
+        ElementDeleted events. They will be fired as a single ElementsChanged
+        event when :meth:`end_element_events_batch` is called. Batches can be
+        nested (only the outermost one fires the event)"""
+        if self._element_events_batch_level == 0:
+            self._element_events_batch = {"new": [], "change": [], "del": []}
+        self._element_events_batch_level += 1
+
+    def end_element_events_batch(self):
+        """Ends a batch started with :meth:`start_element_events_batch`"""
+        level = self._element_events_batch_level - 1
+        if level < 0:
+            raise Exception("No element events batch has been started")
+        self._element_events_batch_level = level
+        if level > 0:
+            return
+        batch, self._element_events_batch = self._element_events_batch, None
+        if batch["new"] or batch["change"] or batch["del"]:
+            self.fire_event(EventType("ElementsChanged"), batch)
+
+    def invalidate_element_info(self, elem=None):
+        """Discards the cached serialization of the given element or of all
+        elements if no element is given"""
+        if elem is None:
+            self._element_info_cache = {}
+            self._element_str_cache = {}
+        else:
+            self._element_info_cache.pop(elem, None)
+            self._element_str_cache.pop(elem, None)
+
+    def _get_element_info(self, obj):
+        cache = self._element_info_cache
+        info = cache.get(obj)
+        if info is None:
+            cache[obj] = info = obj.serialize(pool=self.full_name)
+        return info
+
+    def _get_element_str_info(self, obj):
+        cache = self._element_str_cache
+        info = cache.get(obj)
+        if info is None:
+            cache[obj] = info = obj.str(pool=self.full_name)
+        return info
+
     def set_motion_loop_sleep_time(self, motion_loop_sleep_time):
         self._motion_loop_sleep_time = motion_loop_sleep_time
 
@@ -236,6 +364,66 @@ class Pool(PoolContainer, PoolObject, SardanaElementManager, SardanaIDManager):
         doc="Number of State reads done before doing a position read in the "
             "motion loop")
 
+    def set_motion_loop_prediction(self, motion_loop_prediction):
+        self._motion_loop_prediction = motion_loop_prediction
+
+    def get_motion_loop_prediction(self):
+        return self._motion_loop_prediction
+
+    motion_loop_prediction = property(get_motion_loop_prediction,
+        set_motion_loop_prediction,
+        doc="Use the predicted motion time to skip state reads in the "
+            "motion loop")
+
+    def set_motion_loop_stall_tolerance(self, motion_loop_stall_tolerance):
+        self._motion_loop_stall_tolerance = motion_loop_stall_tolerance
+
+    def get_motion_loop_stall_tolerance(self):
+        return self._motion_loop_stall_tolerance
+
+    motion_loop_stall_tolerance = property(get_motion_loop_stall_tolerance,
+        set_motion_loop_stall_tolerance,
+        doc="Fraction of the predicted motion time a motor may overrun "
+            "before being reported as stalled (0 disables it)")
+
+    def set_motion_parallel_start(self, motion_parallel_start):
+        self._motion_parallel_start = motion_parallel_start
+
+    def get_motion_parallel_start(self):
+        return self._motion_parallel_start
+
+    motion_parallel_start = property(get_motion_parallel_start,
+        set_motion_parallel_start,
+        doc="Start the controllers involved in a motion concurrently")
+
+    def set_ctrl_init_workers(self, ctrl_init_workers):
+        self._ctrl_init_workers = ctrl_init_workers
+
+    def get_ctrl_init_workers(self):
+        return self._ctrl_init_workers
+
+    ctrl_init_workers = property(get_ctrl_init_workers,
+        set_ctrl_init_workers,
+        doc="maximum number of controllers initialized concurrently by "
+            ":meth:`create_controllers`")
+
+    def set_ioregister_write_polling(self, ioregister_write_polling):
+        self._ioregister_write_polling = ioregister_write_polling
+
+    def get_ioregister_write_polling(self):
+        return self._ioregister_write_polling
+
+    ioregister_write_polling = property(get_ioregister_write_polling,
+        set_ioregister_write_polling,
+        doc="Write IORegisters asynchronously, polling their state until "
+            "the write finishes")
+
+    def get_startup_profile(self):
+        return self._startup_profile
+
+    startup_profile = property(get_startup_profile,
+        doc="time spent in each phase of the pool startup")
+
     def set_acq_loop_sleep_time(self, acq_loop_sleep_time):
         self._acq_loop_sleep_time = acq_loop_sleep_time
 
@@ -331,23 +519,24 @@ class Pool(PoolContainer, PoolObject, SardanaElementManager, SardanaIDManager):
             objs = self.get_controller_libs()
         else:
             objs = self.get_elements_by_type(obj_type)
-        name = self.full_name
-        return [ obj.str(pool=name) for obj in objs ]
+        return map(self._get_element_str_info, objs)
 
     def get_elements_info(self, obj_type=None):
         if obj_type is None:
             objs = self.get_element_id_map().values()
             objs.extend(self.get_controller_classes())
             objs.extend(self.get_controller_libs())
-            objs.append(self)
+            ret = map(self._get_element_info, objs)
+            # the pool itself is never cached
+            ret.append(self.serialize(pool=self.full_name))
+            return ret
         elif obj_type == ElementType.ControllerClass:
             objs = self.get_controller_classes()
         elif obj_type == ElementType.ControllerLibrary:
             objs = self.get_controller_libs()
         else:
             objs = self.get_elements_by_type(obj_type)
-        name = self.full_name
-        return [ obj.serialize(pool=name) for obj in objs ]
+        return map(self._get_element_info, objs)
 
     def get_acquisition_elements_info(self):
         ret = []
@@ -365,6 +554,57 @@ class Pool(PoolContainer, PoolObject, SardanaElementManager, SardanaIDManager):
         return map(self.str_object, self.get_acquisition_elements_info())
 
     def create_controller(self, **kwargs):
+        klass, kwargs = self._prepare_controller(**kwargs)
+        ctrl = klass(**kwargs)
+        return self._add_controller(ctrl)
+
+    def create_controllers(self, ctrls_kwargs):
+        """Creates several controllers. The user controller objects (which
+        may take long to connect to the hardware) are initialized
+        concurrently (see :attr:`ctrl_init_workers`). The controllers are
+        added to the pool in the given order.
+
+        :param ctrls_kwargs: sequence of :meth:`create_controller` keyword
+                             arguments
+        :type ctrls_kwargs: seq<dict>
+        :return: list of (controller, exc_info). The controller is None and
+                 exc_info is given if the controller could not be created
+        :rtype: list<tuple>"""
+        ret, prepared = [], []
+        for kwargs in ctrls_kwargs:
+            try:
+                prepared.append(self._prepare_controller(**kwargs))
+                ret.append(None)
+            except:
+                ret.append((None, sys.exc_info()))
+
+        def create(klass_kwargs):
+            klass, kwargs = klass_kwargs
+            return klass(**kwargs)
+
+        profile = self._startup_profile
+        with profile.phase("Controller initialization", count=len(prepared)):
+            created = run_parallel(create, prepared, self._ctrl_init_workers)
+
+        created = iter(created)
+        for i, item in enumerate(ret):
+            if item is not None:
+                continue
+            ctrl, exc_info = created.next()
+            if ctrl is not None:
+                try:
+                    ctrl = self._add_controller(ctrl)
+                except:
+                    ctrl, exc_info = None, sys.exc_info()
+            ret[i] = ctrl, exc_info
+        return ret
+
+    def _add_controller(self, ctrl):
+        ret = self.add_element(ctrl)
+        self.fire_event(EventType("ElementCreated"), ctrl)
+        return ret
+
+    def _prepare_controller(self, **kwargs):
         ctrl_type = kwargs['type']
         lib = kwargs['library']
         class_name = kwargs['klass']
@@ -413,11 +653,7 @@ class Pool(PoolContainer, PoolObject, SardanaElementManager, SardanaIDManager):
             else:
                 props[info.name] = v
         kwargs['properties'] = props
-
-        ctrl = klass(**kwargs)
-        ret = self.add_element(ctrl)
-        self.fire_event(EventType("ElementCreated"), ctrl)
-        return ret
+        return klass, kwargs
 
     def create_element(self, **kwargs):
         etype = kwargs['type']
@@ -662,11 +898,14 @@ class Pool(PoolContainer, PoolObject, SardanaElementManager, SardanaIDManager):
         evt = { "new" : new_elements, "change" : changed_elements,
                 "del" : deleted_elements }
 
-        self.fire_event(EventType("ElementsChanged"), evt)
-
-        if old_lib is not None:
-            for pool_ctrl in init_pool_ctrls:
-                pool_ctrl.re_init()
+        try:
+            if old_lib is not None:
+                for pool_ctrl in init_pool_ctrls:
+                    pool_ctrl.re_init()
+        finally:
+            # fired once the controllers are reinitialized so that the
+            # element info cached and sent to the clients is the new one
+            self.fire_event(EventType("ElementsChanged"), evt)
 
     def reload_controller_class(self, class_name):
         ctrl_info = self.ctrl_manager.getControllerMetaClass(class_name)
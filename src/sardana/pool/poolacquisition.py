@@ -435,6 +435,15 @@ class Pool0DAcquisition(PoolAction):
                 channel = Channel(element, info=element_info)
                 channels[element] = channel
 
+        # channels without a specific sampling period are read at every
+        # acquisition loop iteration
+        self._sampling_periods = periods = {}
+        for channel in channels:
+            period = channel.get_sampling_period()
+            if not period:
+                period = self._acq_sleep_time
+            periods[channel] = period
+
         with ActionContext(self):
             # set the state of all elements to  and inform their listeners
             for channel in channels:
@@ -462,14 +471,36 @@ class Pool0DAcquisition(PoolAction):
             states[element] = None
             values[element] = None
 
-        nap = self._acq_sleep_time
+        periods = self._sampling_periods
+        channels = periods.keys()
+        # next time each channel has to be read
+        next_read = dict.fromkeys(channels, time.time())
         while True:
-            self.read_value(ret=values)
-            for acquirable, value in values.items():
-                acquirable.put_value(value)
-            if self._stopped or self._aborted:
+            finished = self._stopped or self._aborted
+            now = time.time()
+            if finished:
+                # last read of all channels
+                due = channels
+            else:
+                due = [channel for channel in channels
+                       if next_read[channel] <= now]
+            if due:
+                with ActionContext(self):
+                    self.raw_read_elements_value(due, ret=values)
+                for acquirable in due:
+                    acquirable.put_value(values[acquirable])
+                    # don't try to catch up with the reads missed by a slow
+                    # controller
+                    next_read[acquirable] = max(
+                        next_read[acquirable] + periods[acquirable], now)
+            if finished:
                 break
-            time.sleep(nap)
+            # never sleep longer than the acquisition loop period so that a
+            # stop or an abort is noticed in time with long sampling periods
+            nap = min(min(next_read.values()) - time.time(),
+                      self._acq_sleep_time)
+            if nap > 0:
+                time.sleep(nap)
 
         with ActionContext(self):
             self.raw_read_state_info(ret=states)
@@ -493,52 +524,105 @@ class Pool0DAcquisition(PoolAction):
 
 
 class PoolIORAcquisition(PoolAction):
+    """Writes (and acquires) IORegister values.
+
+    IORegister controllers which complete the write synchronously (none of
+    the written registers is busy right after WriteOne) take a fast path: the
+    whole action is executed in the calling thread and no state polling
+    takes place. Otherwise the state is polled until the write finishes,
+    starting with a short period which grows up to the pool motion loop
+    period (or the given *write_sleep_time*)"""
+
+    #: first state polling period as a fraction of the write sleep time
+    FirstPollFactor = 0.125
 
     def __init__(self, pool, name="IORAcquisition"):
-        self._channels = None
+        self._write_sleep_time = None
+        self._pending = None
+        self._start_states = None
         PoolAction.__init__(self, pool, name)
 
     def start_action(self, *args, **kwargs):
-        pass
+        """kwargs['items'] is a dict<ioregister, value>. Returns True if the
+        write completed synchronously"""
+        items = kwargs.pop("items")
+        self._aborted = False
+        self._stopped = False
+        self._write_sleep_time = kwargs.pop("write_sleep_time",
+                                            self.pool.motion_loop_sleep_time)
+
+        states = {}
+        with ActionContext(self):
+            for ior, value in items.items():
+                ior.controller.write_one(ior.axis, value)
+            self.raw_read_state_info(ret=states)
+
+        self._start_states = states
+        self._pending = pending = self.in_acquisition(states)
+        if pending:
+            for ior, state_info in states.items():
+                ior.set_state_info(ior._from_ctrl_state_info(state_info),
+                                   propagate=2)
+        return not pending
 
     def in_acquisition(self, states):
-        return True
-        pass
+        """Determines if any of the IORegisters is still busy writing
+
+        :param states: a map containing state information as returned by
+                       read_state_info
+        :type states: dict<PoolElement, State>
+        :return: returns True if in acquisition or False otherwise
+        :rtype: bool"""
+        for element, state_info in states.items():
+            state = element._from_ctrl_state_info(state_info)[0]
+            if self._is_in_action(state):
+                return True
+        return False
 
     @DebugIt()
     def action_loop(self):
         i = 0
 
         states, values = {}, {}
-        for element in self._channels:
+        for element in self.get_elements():
             states[element] = None
             values[element] = None
 
-        # read values to send a first event when starting to acquire
-        self.read_value(ret=values)
-        for acquirable, value in values.items():
-            acquirable.put_value(value, propagate=2)
+        if self._pending:
+            # read values to send a first event when starting to acquire
+            self.read_value(ret=values)
+            for acquirable, value in values.items():
+                acquirable.put_value(value, propagate=2)
 
-        while True:
-            self.read_state_info(ret=states)
+            max_nap = self._write_sleep_time
+            nap = max_nap * self.FirstPollFactor
+            while True:
+                time.sleep(nap)
+                nap = min(2 * nap, max_nap)
 
-            if not self.in_acquisition(states):
-                break
+                self.read_state_info(ret=states)
 
-            # read value every n times
-            if not i % 5:
-                self.read_value(ret=values)
-                for acquirable, value in values.items():
-                    acquirable.put_value(value)
+                if not self.in_acquisition(states):
+                    break
 
-            i += 1
-            time.sleep(0.01)
+                # read value every n times
+                if not i % 5:
+                    self.read_value(ret=values)
+                    for acquirable, value in values.items():
+                        acquirable.put_value(value)
 
-        self.read_state_info(ret=states)
+                i += 1
+
+            self.read_state_info(ret=states)
+        else:
+            # the state read right after writing is already the final one
+            states.update(self._start_states)
 
         # first update the element state so that value calculation
         # that is done after takes the updated state into account
         for acquirable, state_info in states.items():
+            state_info = acquirable._from_ctrl_state_info(state_info)
+            states[acquirable] = state_info
             acquirable.set_state_info(state_info, propagate=0)
 
         # Do NOT send events before we exit the OperationContext, otherwise
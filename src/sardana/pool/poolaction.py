@@ -331,16 +331,22 @@ class PoolAction(Logger):
             context = OperationContext(self)
             context.enter()
             try:
-                self.start_action(*args, **kwargs)
+                finished = self.start_action(*args, **kwargs)
             except:
                 context.exit()
                 self._running = False
                 raise
-            get_thread_pool().add(self._asynch_action_loop, None, context)
+            if finished is True:
+                # nothing to wait for: avoid the thread pool round trip
+                self._asynch_action_loop(context)
+            else:
+                get_thread_pool().add(self._asynch_action_loop, None, context)
 
     def start_action(self, *args, **kwargs):
         """Start procedure for this action. Default implementation raises
-        NotImplementedError
+        NotImplementedError. Subclasses may return True if the action already
+        finished while starting, in which case the (asynchronous) action loop
+        is executed in the calling thread
 
         :raises: NotImplementedError"""
         raise NotImplementedError("start_action must be implemented in "
@@ -572,16 +578,58 @@ class PoolAction(Logger):
             th_pool.add(self._raw_read_ctrl_value, None, ret, pool_ctrl)
         return ret
 
-    def _raw_read_ctrl_value(self, ret, pool_ctrl):
+    def _raw_read_ctrl_value(self, ret, pool_ctrl, axes=None):
         """Internal method. Read controller value information and store it in
         ret parameter"""
         try:
-            axes = [elem.axis for elem in self._pool_ctrl_dict[pool_ctrl]]
+            if axes is None:
+                axes = [elem.axis for elem in self._pool_ctrl_dict[pool_ctrl]]
             value_infos = pool_ctrl.raw_read_axis_values(axes)
             ret.update(value_infos)
         finally:
             self._value_info.finish_one()
 
+    def raw_read_elements_value(self, elements, ret=None, serial=False):
+        """**Unsafe**. Reads value information of the given elements (a subset
+        of the elements involved in this action). Only the controllers of the
+        given elements are accessed.
+
+        :param elements: elements to read
+        :type elements: seq<:class:~`sardana.pool.poolelement.PoolElement`>
+        :param ret: output map parameter that should be filled with value
+                    information. If None is given (default), a new map is
+                    created an returned
+        :type ret: dict
+        :param serial: If False (default) perform controller HW value requests
+                       in parallel. If True, access is serialized.
+        :type serial: bool
+        :return: a map containing value information per element
+        :rtype: dict<:class:~`sardana.pool.poolelement.PoolElement,
+                :class:`sardana.sardanavalue.SardanaValue` >"""
+        if ret is None:
+            ret = {}
+
+        ctrl_axes = {}
+        for element in elements:
+            axes = ctrl_axes.get(element.controller)
+            if axes is None:
+                ctrl_axes[element.controller] = axes = []
+            axes.append(element.axis)
+
+        value_info = self._value_info
+        with value_info:
+            value_info.init(len(ctrl_axes))
+            if serial:
+                for pool_ctrl, axes in ctrl_axes.items():
+                    self._raw_read_ctrl_value(ret, pool_ctrl, axes)
+            else:
+                th_pool = get_thread_pool()
+                for pool_ctrl, axes in ctrl_axes.items():
+                    th_pool.add(self._raw_read_ctrl_value, None, ret,
+                                pool_ctrl, axes)
+            value_info.wait()
+        return ret
+
     def get_read_value_loop_ctrls(self):
         return self._pool_ctrl_dict
 
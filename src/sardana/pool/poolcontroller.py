@@ -818,10 +818,46 @@ class PoolController(PoolBaseController):
 
 class PoolPseudoMotorController(PoolController):
 
+    #: maximum number of physical position sets for which the calculated
+    #: pseudo positions are kept in cache
+    PseudoCacheSize = 8
+
     def __init__(self, **kwargs):
         self._motor_ids = kwargs.pop('role_ids')
+        self._pseudo_cache = {}
+        self._pseudo_cache_serial = 0
         super(PoolPseudoMotorController, self).__init__(**kwargs)
 
+    def _init(self):
+        self.invalidate_pseudo_cache()
+        PoolController._init(self)
+
+    def invalidate_pseudo_cache(self):
+        """Discards all pseudo positions calculated so far"""
+        self._pseudo_cache = {}
+        self._pseudo_cache_serial += 1
+
+    def get_pseudo_cache_serial(self):
+        """Returns a number which changes each time the pseudo positions
+        calculated so far are discarded (see :meth:`invalidate_pseudo_cache`)
+
+        :return: the pseudo position cache serial number
+        :rtype: int"""
+        return self._pseudo_cache_serial
+
+    def is_pseudo_cache_enabled(self):
+        """Tells if the calculated pseudo positions may be cached. Controllers
+        opt out by setting
+        :attr:`~sardana.pool.controller.PseudoMotorController.cache_pseudo_positions`
+        to False
+
+        :return: True if the pseudo positions may be cached
+        :rtype: bool"""
+        ctrl_info = self._ctrl_info
+        if ctrl_info is None:
+            return False
+        return getattr(ctrl_info.klass, 'cache_pseudo_positions', True)
+
     def serialize(self, *args, **kwargs):
         kwargs = PoolController.serialize(self, *args, **kwargs)
         kwargs['type'] = 'Controller'
@@ -846,6 +882,72 @@ class PoolPseudoMotorController(PoolController):
             value = SardanaValue(exc_info=sys.exc_info())
         return value
 
+    def set_ctrl_attr(self, name, value):
+        self.invalidate_pseudo_cache()
+        return PoolController.set_ctrl_attr(self, name, value)
+
+    def set_axis_attr(self, axis, name, value):
+        self.invalidate_pseudo_cache()
+        return PoolController.set_axis_attr(self, axis, name, value)
+
+    def set_ctrl_par(self, name, value):
+        self.invalidate_pseudo_cache()
+        return PoolController.set_ctrl_par(self, name, value)
+
+    def set_axis_par(self, axis, name, value):
+        self.invalidate_pseudo_cache()
+        return PoolController.set_axis_par(self, axis, name, value)
+
+    def get_pseudo_positions(self, physical_pos):
+        """Returns the positions of all pseudo motors of this controller for
+        the given physical positions. The result of CalcAllPseudo is cached
+        (keyed by the physical positions) so that sibling pseudo motors
+        calculated from the same physical positions share a single call.
+        Errors are not cached. Nothing is cached if the controller opted out
+        (see :meth:`is_pseudo_cache_enabled`).
+
+        :param physical_pos: the physical positions
+        :type physical_pos: sequence<float>
+        :return: the pseudo positions
+        :rtype: :class:`~sardana.sardanavalue.SardanaValue`"""
+        if not self.is_pseudo_cache_enabled():
+            return self.calc_all_pseudo(physical_pos, None)
+        key = tuple(physical_pos)
+        cache = self._pseudo_cache
+        try:
+            value = cache.get(key)
+        except TypeError:
+            # unhashable physical positions cannot be cached
+            return self.calc_all_pseudo(physical_pos, None)
+        if value is None:
+            value = self.calc_all_pseudo(physical_pos, None)
+            if value.error:
+                return value
+            if len(cache) >= self.PseudoCacheSize:
+                cache.clear()
+            cache[key] = value
+        return value
+
+    def get_pseudo_position(self, axis, physical_pos):
+        """Returns the position of the given pseudo motor axis for the given
+        physical positions (see :meth:`get_pseudo_positions`). If the batched
+        calculation fails, the single axis calculation is used instead.
+
+        :param axis: the pseudo motor axis
+        :type axis: int
+        :param physical_pos: the physical positions
+        :type physical_pos: sequence<float>
+        :return: the pseudo position
+        :rtype: :class:`~sardana.sardanavalue.SardanaValue`"""
+        value = self.get_pseudo_positions(physical_pos)
+        if not value.error:
+            try:
+                return SardanaValue(value=value.value[axis - 1],
+                                    timestamp=value.timestamp)
+            except (IndexError, TypeError):
+                self.invalidate_pseudo_cache()
+        return self.calc_pseudo(axis, physical_pos, None)
+
     @check_ctrl
     def calc_all_pseudo(self, physical_pos, curr_pseudo_pos):
         ctrl = self.ctrl
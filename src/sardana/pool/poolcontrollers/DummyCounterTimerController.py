@@ -22,8 +22,12 @@
 ##############################################################################
 
 import time
-from sardana import State
-from sardana.pool.controller import CounterTimerController
+import threading
+
+from sardana import State, DataAccess
+from sardana.pool import PoolUtil
+from sardana.pool.controller import CounterTimerController, Type, Access, \
+    Description, DefaultValue, MaxDimSize
 
 
 class Channel:
@@ -33,6 +37,82 @@ class Channel:
         self.value = 0.0
         self.is_counting = False
         self.active = True
+        self.data = []            # values acquired in gate mode
+
+
+class GatedAcquisition(object):
+    """Simulates a hardware gated acquisition: the channels acquire during
+    acq_time on each of the nb_triggers triggers and buffer the values.
+
+    Triggers are generated either in time (read_trigger is None): the first
+    one start seconds after :meth:`start` and then every step seconds, or
+    by position (read_trigger returns the current position of the trigger
+    source): when the position crosses start + i*step. If read_latch is
+    given, its value is latched on each trigger (like an encoder)"""
+
+    #: position polling period (s). The position is read from the trigger
+    #: source (ex: a motor Tango device) on each poll
+    PollPeriod = 0.01
+
+    def __init__(self, channels, timer, nb_triggers, acq_time, start, step,
+                 read_trigger=None, read_latch=None):
+        self.channels = channels
+        self.timer = timer
+        self.nb_triggers = nb_triggers
+        self.acq_time = acq_time
+        self.trigger_start = start
+        self.trigger_step = step
+        self.read_trigger = read_trigger
+        self.read_latch = read_latch
+        self.positions = []
+        for channel in channels:
+            channel.data = []
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(target=self._run,
+                                        name="GatedAcquisition")
+        self._thread.daemon = True
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop_event.set()
+
+    def join(self, timeout=None):
+        self._thread.join(timeout)
+
+    def is_running(self):
+        return self._thread.is_alive()
+
+    def _wait_trigger(self, i, start_time):
+        """Waits for the i-th trigger. Returns False if stopped before"""
+        stop_event = self._stop_event
+        target = self.trigger_start + i * self.trigger_step
+        if self.read_trigger is None:
+            stop_event.wait(max(0, start_time + target - time.time()))
+            return not stop_event.is_set()
+        sign = 1 if self.trigger_step >= 0 else -1
+        while not stop_event.is_set():
+            if (self.read_trigger() - target) * sign >= 0:
+                return True
+            stop_event.wait(self.PollPeriod)
+        return False
+
+    def _run(self):
+        start_time = time.time()
+        for i in xrange(self.nb_triggers):
+            if not self._wait_trigger(i, start_time):
+                return
+            if self.read_latch is not None:
+                self.positions.append(self.read_latch())
+            # gate: acquire during acq_time
+            if self._stop_event.wait(self.acq_time):
+                return
+            for channel in self.channels:
+                if channel.idx == self.timer:
+                    channel.data.append(self.acq_time)
+                else:
+                    channel.data.append(self.acq_time * channel.idx)
 
 
 class DummyCounterTimerController(CounterTimerController):
@@ -49,9 +129,65 @@ class DummyCounterTimerController(CounterTimerController):
     MonitorMode = 2
     CounterMode = 3
 
+    BufferSize = (16 * 1024,)
+
+    # the gate mode configuration is common to all the axes (like the
+    # trigger input of a real counter card): writing it on any axis
+    # configures the whole controller
+    axis_attributes = {
+        'TriggerMode' : { Type : str,
+                          Description : 'soft (software started) or gate '
+                                        '(acquisition gated by the trigger '
+                                        'source, started with SendToCtrl)',
+                          DefaultValue : 'soft' },
+        'NrOfTriggers' : { Type : int,
+                           Description : 'nb. of triggers (gate mode)',
+                           DefaultValue : 1 },
+        'AcquisitionTime' : { Type : float,
+                              Description : 'acquisition time (s) after '
+                                            'each trigger (gate mode)',
+                              DefaultValue : 0.1 },
+        'SamplingFrequency' : { Type : float,
+                                Description : 'not used',
+                                DefaultValue : -1.0 },
+        'TriggerSource' : { Type : str,
+                            Description : 'time or the name of the motor '
+                                          'which position generates the '
+                                          'triggers',
+                            DefaultValue : 'time' },
+        'TriggerStart' : { Type : float,
+                           Description : 'delay (s) or position of the '
+                                         'first trigger',
+                           DefaultValue : 0.0 },
+        'TriggerStep' : { Type : float,
+                          Description : 'period (s) or position '
+                                        'step between triggers',
+                          DefaultValue : 0.1 },
+        'PositionSource' : { Type : str,
+                             Description : 'name of the motor which '
+                                           'position is latched on each '
+                                           'trigger (empty means none)',
+                             DefaultValue : '' },
+        'Data' : { Type : (float,),
+                   Access : DataAccess.ReadOnly,
+                   MaxDimSize : BufferSize,
+                   Description : 'values acquired in gate mode' },
+        'Positions' : { Type : (float,),
+                        Access : DataAccess.ReadOnly,
+                        MaxDimSize : BufferSize,
+                        Description : 'positions latched in gate mode' },
+    }
+
     def __init__(self, inst, props, *args, **kwargs):
         CounterTimerController.__init__(self, inst, props, *args, **kwargs)
         self.channels = self.MaxDevice*[None,]
+        self.gate_conf = {'triggermode': 'soft', 'nroftriggers': 1,
+                          'acquisitiontime': 0.1, 'samplingfrequency': -1.0,
+                          'triggersource': 'time', 'triggerstart': 0.0,
+                          'triggerstep': 0.1, 'positionsource': ''}
+        self.armed_channels = {}
+        self.armed_started = False
+        self.gated_acq = None
         self.reset()
         
     def reset(self):
@@ -82,7 +218,13 @@ class DummyCounterTimerController(CounterTimerController):
         idx = ind - 1
         sta = State.On
         status = "Stopped"
-        if ind in self.counting_channels:
+        gated_acq = self.gated_acq
+        if gated_acq is not None and gated_acq.is_running() and \
+                self.channels[idx] in gated_acq.channels:
+            sta = State.Moving
+            status = "Acquiring %d/%d (gate mode)" % \
+                (len(self.channels[idx].data), gated_acq.nb_triggers)
+        elif ind in self.counting_channels:
             channel = self.channels[idx]
             now = time.time()
             elapsed_time = now - self.start_time
@@ -184,4 +326,78 @@ class DummyCounterTimerController(CounterTimerController):
         if ind in self.counting_channels:
             elapsed_time = now - self.start_time
             self._finish(elapsed_time, ind=ind)
+        if self.gated_acq is not None:
+            self.gated_acq.stop()
+
+    def GetAxisExtraPar(self, ind, name):
+        name = name.lower()
+        if name == 'data':
+            return self.channels[ind-1].data
+        elif name == 'positions':
+            if self.gated_acq is None:
+                return []
+            return self.gated_acq.positions
+        return self.gate_conf[name]
+
+    def SetAxisExtraPar(self, ind, name, value):
+        name = name.lower()
+        if name == 'triggermode' and value not in ('soft', 'gate'):
+            raise ValueError("TriggerMode must be either soft or gate")
+        if name == 'nroftriggers' and value > self.BufferSize[0]:
+            raise ValueError("NrOfTriggers must not exceed %d" %
+                             self.BufferSize[0])
+        self.gate_conf[name] = value
+
+    def _get_position_reader(self, motor_name):
+        motor = PoolUtil().get_motor(self.GetName(), motor_name)
+        return lambda: motor.read_attribute('position').value
+
+    def _start_gated_acq(self):
+        conf = self.gate_conf
+        if conf['triggermode'] != 'gate':
+            raise Exception("TriggerMode must be gate to start a gated "
+                            "acquisition")
+        read_trigger, read_latch = None, None
+        trigger_source = conf['triggersource']
+        if trigger_source.lower() != 'time':
+            read_trigger = self._get_position_reader(trigger_source)
+        if conf['positionsource']:
+            read_latch = self._get_position_reader(conf['positionsource'])
+        elif read_trigger is not None:
+            read_latch = read_trigger
+        channels = self.armed_channels.values()
+        self.gated_acq = GatedAcquisition(channels, self._timer,
+                                          conf['nroftriggers'],
+                                          conf['acquisitiontime'],
+                                          conf['triggerstart'],
+                                          conf['triggerstep'],
+                                          read_trigger=read_trigger,
+                                          read_latch=read_latch)
+        self.gated_acq.start()
+
+    def SendToCtrl(self, stream):
+        """Gate mode commands: 'pre-start <axis>' arms the axis, the first
+        'start <axis>' starts the gated acquisition of all armed axes and
+        'stop <axis>' stops it"""
+        cmd, ind = stream.split()
+        ind = int(ind)
+        gated_acq = self.gated_acq
+        running = gated_acq is not None and gated_acq.is_running()
+        if cmd == 'pre-start':
+            if self.armed_started:
+                # first pre-start of a new acquisition
+                self.armed_channels = {}
+                self.armed_started = False
+            self.armed_channels[ind] = self.channels[ind-1]
+        elif cmd == 'start':
+            if not running:
+                self._start_gated_acq()
+                self.armed_started = True
+        elif cmd == 'stop':
+            self.armed_channels.pop(ind, None)
+            if running:
+                gated_acq.stop()
+        elif cmd != 'pre-stop':
+            raise ValueError("Unknown command %s" % cmd)
+        return ""
             
@@ -0,0 +1,293 @@
+##############################################################################
+##
+## This file is part of Sardana
+##
+## http://www.sardana-controls.org/
+##
+## Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+## Sardana is free software: you can redistribute it and/or modify
+## it under the terms of the GNU Lesser General Public License as published by
+## the Free Software Foundation, either version 3 of the License, or
+## (at your option) any later version.
+##
+## Sardana is distributed in the hope that it will be useful,
+## but WITHOUT ANY WARRANTY; without even the implied warranty of
+## MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+## GNU Lesser General Public License for more details.
+##
+## You should have received a copy of the GNU Lesser General Public License
+## along with Sardana.  If not, see <http://www.gnu.org/licenses/>.
+##
+##############################################################################
+
+"""This module contains dummy controllers which simulate the latency of slow
+(serial, network) hardware. Each controller API call is delayed according to
+the controller properties:
+
+    - *Latency*: mean delay (s) of each per axis call (ex: StateOne, ReadOne)
+    - *BulkLatency*: mean delay (s) of each bulk call (ex: StateAll, ReadAll)
+    - *BulkAxisLatency*: additional delay (s) of a bulk call for each axis
+      prepared in it (ex: number of PreReadOne calls before ReadAll)
+    - *Jitter*: spread (s) of the delay. Its meaning depends on the
+      distribution
+    - *Distribution*: one of 'constant', 'uniform' (mean +/- jitter),
+      'normal' (standard deviation = jitter) or 'exponential'
+    - *FailureRate*: probability [0, 1] that a call raises an exception
+    - *CallLatency*: per call overrides of the mean delay in the form
+      'StateOne:0.01, ReadAll:0.05'"""
+
+__all__ = ["LatencyInjector", "LatencyDummyMotorController",
+           "LatencyDummyCounterTimerController", "LatencyDummyZeroDController",
+           "LatencyDummyIORController"]
+
+__docformat__ = 'restructuredtext'
+
+import time
+import random
+import threading
+
+from sardana.pool.controller import Type, Description, DefaultValue
+from sardana.pool.poolcontrollers.DummyMotorController import \
+    DummyMotorController
+from sardana.pool.poolcontrollers.DummyCounterTimerController import \
+    DummyCounterTimerController
+from sardana.pool.poolcontrollers.DummyZeroDController import \
+    DummyZeroDController
+from sardana.pool.poolcontrollers.DummyIORController import DummyIORController
+
+
+LatencyProperties = {
+    'Latency': {Type: float,
+                Description: 'mean delay (s) of a per axis call',
+                DefaultValue: 0.0},
+    'BulkLatency': {Type: float,
+                    Description: 'mean delay (s) of a bulk (*All) call',
+                    DefaultValue: 0.0},
+    'BulkAxisLatency': {Type: float,
+                        Description: 'additional delay (s) of a bulk call '
+                                     'per axis involved in it',
+                        DefaultValue: 0.0},
+    'Jitter': {Type: float,
+               Description: 'spread (s) of the delay',
+               DefaultValue: 0.0},
+    'Distribution': {Type: str,
+                     Description: "delay distribution: 'constant', "
+                                  "'uniform', 'normal' or 'exponential'",
+                     DefaultValue: 'constant'},
+    'FailureRate': {Type: float,
+                    Description: 'probability [0, 1] of a call to fail',
+                    DefaultValue: 0.0},
+    'CallLatency': {Type: str,
+                    Description: "per call mean delay overrides "
+                                 "(ex: 'StateOne:0.01, ReadAll:0.05')",
+                    DefaultValue: ''},
+}
+
+
+class LatencyInjector(object):
+    """Computes (and applies) the simulated delay of controller calls"""
+
+    #: controller API calls which may be delayed
+    Calls = ("PreStateAll", "PreStateOne", "StateAll", "StateOne",
+             "PreReadAll", "PreReadOne", "ReadAll", "ReadOne",
+             "PreStartAll", "PreStartOne", "StartOne", "StartAll",
+             "PreLoadAll", "PreLoadOne", "LoadOne", "LoadAll",
+             "AbortOne", "StopOne", "AbortAll", "StopAll",
+             "WriteOne", "SetAxisPar", "GetAxisPar")
+
+    Distributions = "constant", "uniform", "normal", "exponential"
+
+    def __init__(self, latency=0.0, bulk_latency=0.0, bulk_axis_latency=0.0,
+                 jitter=0.0, distribution='constant', failure_rate=0.0,
+                 call_latency=None, random_generator=None):
+        distribution = distribution.lower()
+        if distribution not in self.Distributions:
+            raise ValueError("Invalid latency distribution '%s'"
+                             % distribution)
+        self.latency = float(latency)
+        self.bulk_latency = float(bulk_latency)
+        self.bulk_axis_latency = float(bulk_axis_latency)
+        self.jitter = float(jitter)
+        self.distribution = distribution
+        self.failure_rate = float(failure_rate)
+        if isinstance(call_latency, (str, unicode)):
+            call_latency = self.decode_call_latency(call_latency)
+        self.call_latency = call_latency or {}
+        self._random = random_generator or random.Random()
+        self._lock = threading.Lock()
+        self._bulk_axes = {}
+        self.nb_calls = 0
+        self.nb_failures = 0
+        self.total_delay = 0.0
+
+    @staticmethod
+    def decode_call_latency(call_latency):
+        """Decodes a 'Call:delay, Call:delay' string into a dictionary"""
+        ret = {}
+        for item in call_latency.split(","):
+            item = item.strip()
+            if not item:
+                continue
+            name, delay = item.split(":")
+            ret[name.strip()] = float(delay)
+        return ret
+
+    @staticmethod
+    def is_bulk(call_name):
+        return call_name.endswith("All")
+
+    def _bulk_key(self, call_name):
+        # PreReadOne/ReadAll -> Read, StartOne/StartAll -> Start
+        name = call_name
+        if name.startswith("Pre"):
+            name = name[3:]
+        for suffix in ("One", "All"):
+            if name.endswith(suffix):
+                return name[:-len(suffix)]
+        return name
+
+    def mean_delay(self, call_name):
+        mean = self.call_latency.get(call_name)
+        if mean is not None:
+            return mean
+        if not self.is_bulk(call_name):
+            return self.latency
+        mean = self.bulk_latency
+        if not call_name.startswith("Pre"):
+            with self._lock:
+                nb_axes = self._bulk_axes.pop(self._bulk_key(call_name), 0)
+            mean += nb_axes * self.bulk_axis_latency
+        return mean
+
+    def _count_axis(self, call_name):
+        if not call_name.startswith("Pre"):
+            return
+        key = self._bulk_key(call_name)
+        with self._lock:
+            if call_name.endswith("All"):
+                self._bulk_axes[key] = 0
+            else:
+                self._bulk_axes[key] = self._bulk_axes.get(key, 0) + 1
+
+    def delay(self, call_name):
+        """Returns the delay (s) to be applied to the given call"""
+        self._count_axis(call_name)
+        mean = self.mean_delay(call_name)
+        jitter, distribution = self.jitter, self.distribution
+        rnd = self._random
+        if distribution == "uniform":
+            delay = rnd.uniform(mean - jitter, mean + jitter)
+        elif distribution == "normal":
+            delay = rnd.gauss(mean, jitter)
+        elif distribution == "exponential":
+            if mean > 0:
+                delay = rnd.expovariate(1.0 / mean)
+            else:
+                delay = 0.0
+        else:
+            delay = mean
+        return max(delay, 0.0)
+
+    def fails(self):
+        """Decides if the next call should fail"""
+        rate = self.failure_rate
+        return rate > 0 and self._random.random() < rate
+
+    def apply(self, call_name):
+        """Sleeps the simulated delay for the given call and raises an
+        exception if the call is chosen to fail"""
+        delay = self.delay(call_name)
+        if delay > 0:
+            time.sleep(delay)
+        fails = self.fails()
+        with self._lock:
+            self.nb_calls += 1
+            self.total_delay += delay
+            if fails:
+                self.nb_failures += 1
+        if fails:
+            raise Exception("Simulated communication failure in %s"
+                            % call_name)
+
+    def wrap(self, call_name, method):
+        """Returns a version of the given method delayed by this injector"""
+        def wrapper(*args, **kwargs):
+            self.apply(call_name)
+            return method(*args, **kwargs)
+        wrapper.__name__ = call_name
+        wrapper.__doc__ = method.__doc__
+        return wrapper
+
+
+class LatencyMixin(object):
+    """Mixin for dummy controllers which delays the controller API calls
+    according to the latency controller properties"""
+
+    def _init_latency(self):
+        def prop(name):
+            return getattr(self, name, LatencyProperties[name][DefaultValue])
+        self.latency_injector = injector = LatencyInjector(
+            latency=prop('Latency'), bulk_latency=prop('BulkLatency'),
+            bulk_axis_latency=prop('BulkAxisLatency'), jitter=prop('Jitter'),
+            distribution=prop('Distribution'),
+            failure_rate=prop('FailureRate'),
+            call_latency=prop('CallLatency'))
+        # instance attributes shadow the class methods so the pool controller
+        # calls the delayed version
+        for call_name in LatencyInjector.Calls:
+            method = getattr(self, call_name, None)
+            if method is None:
+                continue
+            setattr(self, call_name, injector.wrap(call_name, method))
+
+
+class LatencyDummyMotorController(LatencyMixin, DummyMotorController):
+    """A dummy motor controller with simulated hardware latency"""
+
+    model = "Latency"
+
+    ctrl_properties = dict(DummyMotorController.ctrl_properties,
+                           **LatencyProperties)
+
+    def __init__(self, inst, props, *args, **kwargs):
+        DummyMotorController.__init__(self, inst, props, *args, **kwargs)
+        self._init_latency()
+
+
+class LatencyDummyCounterTimerController(LatencyMixin,
+                                         DummyCounterTimerController):
+    """A dummy counter/timer controller with simulated hardware latency"""
+
+    model = "Latency"
+
+    ctrl_properties = dict(LatencyProperties)
+
+    def __init__(self, inst, props, *args, **kwargs):
+        DummyCounterTimerController.__init__(self, inst, props, *args,
+                                             **kwargs)
+        self._init_latency()
+
+
+class LatencyDummyZeroDController(LatencyMixin, DummyZeroDController):
+    """A dummy 0D controller with simulated hardware latency"""
+
+    model = "Latency"
+
+    ctrl_properties = dict(LatencyProperties)
+
+    def __init__(self, inst, props, *args, **kwargs):
+        DummyZeroDController.__init__(self, inst, props, *args, **kwargs)
+        self._init_latency()
+
+
+class LatencyDummyIORController(LatencyMixin, DummyIORController):
+    """A dummy IORegister controller with simulated hardware latency"""
+
+    model = "Latency"
+
+    ctrl_properties = dict(LatencyProperties)
+
+    def __init__(self, inst, props, *args, **kwargs):
+        DummyIORController.__init__(self, inst, props, *args, **kwargs)
+        self._init_latency()
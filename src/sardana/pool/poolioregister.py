@@ -57,7 +57,7 @@ class PoolIORegister(PoolElement):
         self._value = Value(self, listeners=self.on_change)
         self._config = None
         acq_name = "%s.Acquisition" % self._name
-        self.set_action_cache(PoolIORAcquisition(self.pool, name=acq_name))
+        self.set_action_cache(PoolIORAcquisition(self, name=acq_name))
 
     def get_value_attribute(self):
         """Returns the value attribute object for this IO register
@@ -134,10 +134,31 @@ class PoolIORegister(PoolElement):
     value = property(get_value, set_value, doc="ioregister value")
 
     def write_register(self, value, timestamp=None):
+        """Writes the IO register value to hardware.
+
+        By default the controller is called directly and the write is
+        finished when this method returns. If the pool
+        *ioregister_write_polling* is enabled, the write is done by the
+        acquisition action instead: it returns as soon as WriteOne returns
+        and, if the register is still busy, its state is polled in the
+        background. Writing again while that action is running raises an
+        exception (the register is already involved in an operation).
+
+        :param value:
+            the new value
+        :type value:
+            :class:`~numbers.Number`
+        :param timestamp:
+            the write timestamp (default is None meaning current time)
+        :type timestamp:
+            :class:`float`"""
         self._aborted = False
         self._stopped = False
         if not self._simulation_mode:
             if timestamp is None:
                 timestamp = time.time()
             self.set_write_value(value, timestamp=timestamp, propagate=0)
-            self.controller.write_one(self.axis, value)
+            if self.pool.ioregister_write_polling:
+                self.get_action_cache().run(items={self: value})
+            else:
+                self.controller.write_one(self.axis, value)
@@ -290,6 +290,9 @@ class PoolMeasurementGroup(PoolGroupElement):
             # sorted ids may not be consecutive (if a channel is disabled)
             indexes = sorted(user_elem_ids.keys())
             self.set_user_element_ids([ user_elem_ids[idx] for idx in indexes ])
+            # the user elements are part of the serialization cached by the
+            # pool (ex: MeasurementGroupList)
+            pool.invalidate_element_info(self)
 
         # checks
         g_timer, g_monitor = config['timer'], config['monitor']
@@ -30,13 +30,17 @@ __all__ = ["MotionState", "MotionMap", "PoolMotion", "PoolMotionItem"]
 
 __docformat__ = 'restructuredtext'
 
+import sys
 import time
+import threading
 
 from taurus.core.util.log import DebugIt
 from taurus.core.util.enumeration import Enumeration
 
 from sardana import State
-from sardana.pool.poolaction import ActionContext, PoolActionItem, PoolAction
+from sardana.util.motion import Motor, MotionPath
+from sardana.pool.poolaction import ActionContext, PoolActionItem, \
+    PoolAction
 
 #: enumeration representing possible motion states
 MotionState = Enumeration("MotionSate", (\
@@ -90,10 +94,36 @@ class PoolMotionItem(PoolActionItem):
         self.old_state_info = State.Invalid, "Uninitialized", \
             (False, False, False)
         self.state_info = State.On, "Uninitialized", (False, False, False)
+        # predicted duration of the motion and of the backlash motion
+        self.motion_time = None
+        self.backlash_time = 0.0
+        self.stalled = False
 
     def has_instability_time(self):
         return self.instability_time is not None
 
+    def has_prediction(self):
+        return self.motion_time is not None
+
+    def get_predicted_motion_end_time(self):
+        """Returns the instant the main motion (without backlash) is
+        predicted to end or None if it cannot be predicted"""
+        if self.start_time is None or self.motion_time is None:
+            return None
+        return self.start_time + self.motion_time
+
+    def get_predicted_end_time(self):
+        """Returns the instant the whole motion (including backlash and
+        instability time) is predicted to end or None if it cannot be
+        predicted"""
+        end_time = self.get_predicted_motion_end_time()
+        if end_time is None:
+            return None
+        end_time += self.backlash_time
+        if self.instability_time is not None:
+            end_time += self.instability_time
+        return end_time
+
     def in_motion(self):
         return self.motion_state in MovingStates
 
@@ -168,11 +198,22 @@ _NON_ERROR_STATES = State.On, State.Moving, State.Running
 class PoolMotion(PoolAction):
     """This class manages motion actions"""
 
+    #: fraction of the predicted motion time during which the state is only
+    #: read together with the position
+    PredictionFraction = 0.9
+
+    #: minimum time (s) a motor may overrun its predicted motion time before
+    #: being reported as stalled
+    StallMinimumTime = 1.0
+
     def __init__(self, main_element, name="GlobalMotion"):
         PoolAction.__init__(self, main_element, name)
         self._motion_info = None
         self._motion_sleep_time = None
         self._nb_states_per_position = None
+        self._motion_prediction = None
+        self._stall_tolerance = None
+        self._start_skew = None
 
     def _recover_start_error(self, ctrl, meth_name, read_state=False):
         self.error("%s throws exception on %s. Stopping...", ctrl, meth_name)
@@ -244,6 +285,101 @@ class PoolMotion(PoolAction):
                                           read_state=True)
                 raise
 
+    def _prepare_ctrl_start(self, ret, pool_ctrl, motion_info):
+        """Internal method. Executes the PreStartAll, PreStartOne and StartOne
+        sequence of one controller. Used by the parallel start"""
+        meth_name = "PreStartAll"
+        try:
+            ctrl = pool_ctrl.ctrl
+            moveables = self.get_pool_controllers()[pool_ctrl]
+            ctrl.PreStartAll()
+            meth_name = "PreStartOne"
+            for moveable in moveables:
+                axis = moveable.axis
+                dial = motion_info[moveable].dial_position
+                if not ctrl.PreStartOne(axis, dial):
+                    raise Exception("%s.PreStartOne(%s(%d), %f) returns False"
+                                    % (pool_ctrl.name, moveable.name, axis,
+                                       dial))
+            meth_name = "StartOne"
+            for moveable in moveables:
+                ctrl.StartOne(moveable.axis,
+                              motion_info[moveable].dial_position)
+        except:
+            ret[pool_ctrl] = meth_name, sys.exc_info()
+
+    def _start_ctrl(self, ret, pool_ctrl):
+        """Internal method. Executes the StartAll of one controller and
+        stores the instant it returned. Used by the parallel start"""
+        try:
+            pool_ctrl.ctrl.StartAll()
+            ret[pool_ctrl] = time.time(), None
+        except:
+            ret[pool_ctrl] = time.time(), sys.exc_info()
+
+    def _run_concurrent(self, func, pool_ctrls, *args):
+        """Internal method. Executes func for each controller in its own
+        thread and waits for all of them to finish. Dedicated threads are
+        used (not the shared thread pool, which also runs the action loops)
+        so that the start is never delayed by busy workers nor deadlocks
+        when called from a worker"""
+        ret = {}
+        threads = []
+        for pool_ctrl in pool_ctrls:
+            th = threading.Thread(target=func, args=(ret, pool_ctrl) + args,
+                                  name="%s-start-%s" % (self.name,
+                                                         pool_ctrl.name))
+            th.daemon = True
+            threads.append(th)
+            th.start()
+        for th in threads:
+            th.join()
+        return ret
+
+    def parallel_start(self, pool_ctrls, moveables, motion_info):
+        """Starts the motion of all controllers concurrently. Each
+        controller executes its PreStartAll, PreStartOne and StartOne
+        sequence in its own thread. Once all controllers are prepared the
+        StartAll calls are also dispatched concurrently.
+        The start skew (time between the first and the last StartAll to
+        return) is available from :meth:`get_start_skew`"""
+        # barrier: all controllers prepared
+        errors = self._run_concurrent(self._prepare_ctrl_start, pool_ctrls,
+                                      motion_info)
+        for pool_ctrl in pool_ctrls:
+            if pool_ctrl in errors:
+                meth_name, exc_info = errors[pool_ctrl]
+                self._recover_start_error(pool_ctrl, meth_name)
+                raise exc_info[0], exc_info[1], exc_info[2]
+
+        # Change the state to Moving
+        for moveable in moveables:
+            moveable_info = motion_info[moveable]
+            moveable.set_state(State.Moving, propagate=2)
+            state_info = moveable.inspect_state(), \
+                moveable.inspect_status(), \
+                moveable.inspect_limit_switches()
+            moveable_info.on_state_switch(state_info)
+
+        # barrier: all controllers started
+        started = self._run_concurrent(self._start_ctrl, pool_ctrls)
+        timestamps = [timestamp for timestamp, _ in started.values()]
+        self._start_skew = max(timestamps) - min(timestamps)
+        self.debug("Started %d controllers with a skew of %fs",
+                   len(pool_ctrls), self._start_skew)
+        for pool_ctrl in pool_ctrls:
+            exc_info = started[pool_ctrl][1]
+            if exc_info is not None:
+                self._recover_start_error(pool_ctrl, "StartAll",
+                                          read_state=True)
+                raise exc_info[0], exc_info[1], exc_info[2]
+
+    def get_start_skew(self):
+        """Returns the time (s) between the first and the last controller
+        to start in the last parallel start or None if the last motion was
+        not started in parallel"""
+        return self._start_skew
+
     def start_action(self, *args, **kwargs):
         """kwargs['items'] is a dict<moveable, (pos, dial, do_backlash, backlash)
         """
@@ -259,22 +395,109 @@ class PoolMotion(PoolAction):
         self._nb_states_per_position = \
             kwargs.pop("nb_states_per_position",
                        pool.motion_loop_states_per_position)
+        self._motion_prediction = kwargs.pop("motion_prediction",
+                                             pool.motion_loop_prediction)
+        self._stall_tolerance = kwargs.pop("stall_tolerance",
+                                           pool.motion_loop_stall_tolerance)
+        parallel_start = kwargs.pop("parallel_start",
+                                    pool.motion_parallel_start)
+        predict = self._motion_prediction or self._stall_tolerance
 
         self._motion_info = motion_info = {}
         for moveable, motion_data in items.items():
             it = moveable.instability_time
-            motion_info[moveable] = PoolMotionItem(moveable, *motion_data,
-                                                   instability_time=it)
+            motion_item = PoolMotionItem(moveable, *motion_data,
+                                         instability_time=it)
+            if predict:
+                self.predict_motion(motion_item)
+            motion_info[moveable] = motion_item
 
         pool_ctrls = self.get_pool_controller_list()
         moveables = self.get_elements()
 
+        self._start_skew = None
+        if parallel_start and len(pool_ctrls) > 1:
+            with ActionContext(self):
+                self.parallel_start(pool_ctrls, moveables, motion_info)
+            return
+
         with ActionContext(self):
             self.pre_start_all(pool_ctrls)
             self.pre_start_one(moveables, items)
             self.start_one(moveables, motion_info)
             self.start_all(pool_ctrls, moveables, motion_info)
 
+    def predict_motion(self, motion_item):
+        """Calculates the duration of the motion (and backlash motion) of
+        the given item from the moveable dial position, velocity, base rate,
+        acceleration and deceleration times. If any of them is not available
+        the motion is not predicted."""
+        moveable = motion_item.moveable
+        try:
+            dial_attr = moveable.get_dial_position_attribute()
+            if not dial_attr.has_value() or dial_attr.in_error():
+                return
+            motor = Motor(min_vel=moveable.get_base_rate(propagate=0),
+                          max_vel=moveable.get_velocity(propagate=0),
+                          accel_time=moveable.get_acceleration(propagate=0),
+                          decel_time=moveable.get_deceleration(propagate=0))
+            dial = motion_item.dial_position
+            path = MotionPath(motor, dial_attr.value, dial)
+            motion_time = path.duration
+            if motion_item.do_backlash:
+                backlash_path = MotionPath(motor, dial, motion_item.backlash)
+                motion_item.backlash_time = backlash_path.duration
+        except Exception:
+            self.debug("Cannot predict motion of %s", moveable.name,
+                       exc_info=1)
+            return
+        motion_item.motion_time = motion_time
+
+    def _in_predicted_motion(self, timestamp):
+        """Returns True if all moving elements are predicted to be still in
+        the main motion at the given instant"""
+        if not self._motion_prediction or self.was_action_interrupted():
+            return False
+        in_motion = False
+        for motion_item in self._motion_info.values():
+            if motion_item.motion_state == MS.Stopped:
+                continue
+            if motion_item.motion_state != MS.Moving:
+                return False
+            end_time = motion_item.get_predicted_motion_end_time()
+            if end_time is None:
+                return False
+            quiet_time = self.PredictionFraction * motion_item.motion_time
+            if timestamp >= motion_item.start_time + quiet_time:
+                return False
+            in_motion = True
+        return in_motion
+
+    def _check_stall(self, motion_item, timestamp):
+        tolerance = self._stall_tolerance
+        if not tolerance or motion_item.stalled or \
+           self.was_action_interrupted():
+            return
+        end_time = motion_item.get_predicted_end_time()
+        if end_time is None:
+            return
+        predicted = end_time - motion_item.start_time
+        margin = max(tolerance * predicted, self.StallMinimumTime)
+        overrun = timestamp - end_time
+        if overrun > margin:
+            motion_item.stalled = True
+            motion_item.moveable.warning("Motion did not finish %.3fs after "
+                                         "the predicted %.3fs. The motor may "
+                                         "be stalled", overrun, predicted)
+
+    def get_stalled(self):
+        """Returns the list of moveables which overran their predicted
+        motion time in the current (or last) motion"""
+        if self._motion_info is None:
+            return []
+        return [moveable for moveable, motion_item in self._motion_info.items()
+                if motion_item.stalled]
+
     def backlash_item(self, motion_item):
         moveable = motion_item.moveable
         controller = moveable.controller
@@ -331,6 +554,14 @@ class PoolMotion(PoolAction):
         #            moveable.put_dial_position(position_info)
 
         while True:
+            # while all motors are predicted to be moving the state is only
+            # read together with the position
+            if i % nb_states_per_pos and \
+               self._in_predicted_motion(time.time()):
+                i += 1
+                time.sleep(nap)
+                continue
+
             self.read_state_info(ret=states)
             state_error_occured = self._state_error_occured(states)
             timestamp = time.time()
@@ -345,6 +576,8 @@ class PoolMotion(PoolAction):
                                                 timestamp=timestamp)
                 real_state_info = motion_item.get_state_info()
                 moving = motion_item.in_motion()
+                if moving:
+                    self._check_stall(motion_item, timestamp)
 
                 # Something wrong happened: Stop all motors and report
                 if state_error_occured:
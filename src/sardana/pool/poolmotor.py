@@ -30,12 +30,14 @@ __all__ = ["PoolMotor"]
 
 __docformat__ = 'restructuredtext'
 
+import sys
 import time
 import math
 
 from sardana import EpsilonError, State, ElementType
 from sardana.sardanaattribute import SardanaAttribute, ScalarNumberAttribute, \
-    SardanaSoftwareAttribute
+    SardanaSoftwareAttribute, SardanaAttributeSnapshot
+from sardana.sardanavalue import SardanaValue
 from sardana.sardanaevent import EventType
 from sardana.sardanautils import assert_type, is_number
 from sardana.pool.poolelement import PoolElement
@@ -95,6 +97,32 @@ class Position(SardanaAttribute):
     def _get_write_timestamp(self):
         return self.get_dial().get_write_timestamp()
 
+    def _get_snapshot(self):
+        # derive the user position from a single dial snapshot so that value,
+        # write value and timestamps are consistent among them
+        obj = self.obj
+        dial = self.get_dial().get_snapshot()
+        sign, offset = obj.sign.value, obj.offset.value
+        r_value = w_value = None
+        r_dial, w_dial = dial.value_obj, dial.write_value_obj
+        if r_dial is not None:
+            if r_dial.error:
+                r_value = r_dial
+            else:
+                try:
+                    if not is_number(r_dial.value):
+                        raise Exception("Controller returns not a number %s"
+                                        % r_dial.value)
+                    r_value = SardanaValue(value=sign * r_dial.value + offset,
+                                           timestamp=r_dial.timestamp)
+                except:
+                    r_value = SardanaValue(exc_info=sys.exc_info(),
+                                           timestamp=r_dial.timestamp)
+        if w_dial is not None:
+            w_value = SardanaValue(value=sign * w_dial.value + offset,
+                                   timestamp=w_dial.timestamp)
+        return SardanaAttributeSnapshot(r_value, w_value)
+
     def calc_position(self, dial=None):
         """Returns the computed position from last the dial position from the
         given parameter or (if None), the last dial position obtained from
@@ -97,6 +97,9 @@ class Position(SardanaAttribute):
         super(Position, self).set_write_value(w_value, timestamp=timestamp,
                                               propagate=propagate)
 
+    def _get_snapshot(self):
+        return self._build_snapshot()
+
     def on_change(self, evt_src, evt_type, evt_value):
         self.fire_read_event(propagate=evt_type.priority)
 
@@ -90,6 +90,9 @@ class Value(SardanaAttribute):
             timestamps = self._local_timestamp,
         return max(timestamps)
 
+    def _get_snapshot(self):
+        return self._build_snapshot()
+
     def get_physical_write_values(self):
         ret = []
         for value_attr in self.obj.get_physical_value_attribute_iterator():
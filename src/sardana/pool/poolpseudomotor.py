@@ -37,6 +37,7 @@ import collections
 
 from sardana import State, ElementType, TYPE_PHYSICAL_ELEMENTS
 from sardana.sardanaattribute import SardanaAttribute
+from sardana.sardanavalue import SardanaValue
 from sardana.sardanaexception import SardanaException
 
 from sardana.pool.poolbaseelement import PoolBaseElement
@@ -50,6 +51,9 @@ class Position(SardanaAttribute):
 
     def __init__(self, *args, **kwargs):
         self._exc_info = None
+        # last calculation: (cache serial, physical positions, value) or None
+        # if a physical position changed since then
+        self._calc_value = None
         super(Position, self).__init__(*args, **kwargs)
 
         # 130226: We found a bug https://sourceforge.net/p/sardana/tickets/2/ that makes the Pool segfault with some pseudomotor configuration:
@@ -87,7 +91,7 @@ class Position(SardanaAttribute):
         return True
 
     def _get_value(self):
-        return self.calc_pseudo().value
+        return self.get_calc_value().value
 
     def _set_value(self, value, exc_info=None, timestamp=None, propagate=1):
         raise Exception("Cannot set position value for %s" % self.obj.name)
@@ -113,6 +117,9 @@ class Position(SardanaAttribute):
             timestamps = self._local_timestamp,
         return max(timestamps)
 
+    def _get_snapshot(self):
+        return self._build_snapshot()
+
     def get_physical_write_positions(self):
         ret = []
         for pos_attr in self.obj.get_physical_position_attribute_iterator():
@@ -143,6 +150,32 @@ class Position(SardanaAttribute):
             ret.append(pos_attr.value)
         return ret
 
+    def get_calc_value(self):
+        """Returns the pseudo position calculated from the current physical
+        positions. The last calculation is reused unless a physical position
+        changed or the controller pseudo position cache was invalidated.
+
+        :return: the pseudo position
+        :rtype: :class:`~sardana.sardanavalue.SardanaValue`"""
+        ctrl = self.obj.controller
+        if not ctrl.is_pseudo_cache_enabled():
+            return self.calc_pseudo()
+        try:
+            physical_positions = self.get_physical_positions()
+        except:
+            # let calc_pseudo build the error value
+            return self.calc_pseudo()
+        serial = ctrl.get_pseudo_cache_serial()
+        key = tuple(physical_positions)
+        calc_value = self._calc_value
+        if calc_value is not None and calc_value[0] == serial and \
+                calc_value[1] == key:
+            return calc_value[2]
+        value = self.calc_pseudo(physical_positions=physical_positions)
+        if not value.error:
+            self._calc_value = serial, key, value
+        return value
+
     def calc_pseudo(self, physical_positions=None):
         try:
             obj = self.obj
@@ -153,7 +186,9 @@ class Position(SardanaAttribute):
                 if l_p != l_u:
                     raise IndexError("CalcPseudo(%s): must give %d physical " \
                                      "positions (you gave %d)" % (obj.name, l_u, l_p))
-            result = obj.controller.calc_pseudo(obj.axis, physical_positions, None)
+            # siblings share the cached result of a single CalcAllPseudo
+            result = obj.controller.get_pseudo_position(obj.axis,
+                                                        physical_positions)
         except SardanaException as se:
             result = SardanaValue(exc_info=se.exc_info)
         except:
@@ -198,7 +233,14 @@ class Position(SardanaAttribute):
             result = SardanaValue(exc_info=sys.exc_info())
         return result
 
+    def accepts(self, propagate):
+        # pseudo positions are not filtered so there is no need to calculate
+        # the new position just to decide if the event is propagated
+        return propagate > 0
+
     def on_change(self, evt_src, evt_type, evt_value):
+        # only mark the position as outdated: it is calculated when read
+        self._calc_value = None
         self.fire_read_event(propagate=evt_type.priority)
 
     def update(self, cache=True, propagate=1):
@@ -208,6 +250,7 @@ class Position(SardanaAttribute):
                     cache = False
                     break
         if not cache:
+            self.obj.controller.invalidate_pseudo_cache()
             dial_position_values = self.obj.motion.read_dial_position(serial=True)
             if not len(dial_position_values):
                 self._local_timestamp = time.time()
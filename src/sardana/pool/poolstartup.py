@@ -0,0 +1,147 @@
+#!/usr/bin/env python
+
+##############################################################################
+##
+## This file is part of Sardana
+##
+## http://www.sardana-controls.org/
+##
+## Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+## Sardana is free software: you can redistribute it and/or modify
+## it under the terms of the GNU Lesser General Public License as published by
+## the Free Software Foundation, either version 3 of the License, or
+## (at your option) any later version.
+##
+## Sardana is distributed in the hope that it will be useful,
+## but WITHOUT ANY WARRANTY; without even the implied warranty of
+## MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+## GNU Lesser General Public License for more details.
+##
+## You should have received a copy of the GNU Lesser General Public License
+## along with Sardana.  If not, see <http://www.gnu.org/licenses/>.
+##
+##############################################################################
+
+"""This file contains the pool startup helpers: the startup profile and the
+parallel controller initialization"""
+
+__all__ = ["StartupProfile", "run_parallel"]
+
+__docformat__ = 'restructuredtext'
+
+import sys
+import time
+import Queue
+import threading
+import contextlib
+
+
+class StartupProfile(object):
+    """Time spent in each phase of the pool startup. A phase may be entered
+    several times (ex: once per device); its total time and number of
+    entries are accumulated. Phases are reported in the order they were first
+    entered"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._start = time.time()
+        self._end = None
+        self._phases = []
+        # dict<str, list<float, int, float>>: name -> [time, count, first start]
+        self._info = {}
+
+    def add(self, name, duration, count=1, start=None):
+        """Accumulates the given duration in the given phase"""
+        if start is None:
+            start = time.time() - duration
+        with self._lock:
+            info = self._info.get(name)
+            if info is None:
+                self._info[name] = info = [0.0, 0, start]
+                self._phases.append(name)
+            info[0] += duration
+            info[1] += count
+            self._end = max(self._end, start + duration)
+
+    @contextlib.contextmanager
+    def phase(self, name, count=1):
+        """Context manager which accumulates the time spent inside it in the
+        given phase"""
+        start = time.time()
+        try:
+            yield
+        finally:
+            self.add(name, time.time() - start, count=count, start=start)
+
+    def get_total_time(self):
+        """Returns the time (s) from the profile creation until the end of
+        the last recorded phase"""
+        with self._lock:
+            if self._end is None:
+                return 0.0
+            return self._end - self._start
+
+    def to_dict(self):
+        """Returns the profile as a dictionary with keys 'total' (s) and
+        'phases' (list of dict with keys 'name', 'time', 'count' and
+        'start', the later being relative to the profile creation)"""
+        with self._lock:
+            phases = []
+            for name in self._phases:
+                duration, count, start = self._info[name]
+                phases.append(dict(name=name, time=duration, count=count,
+                                   start=start - self._start))
+        return dict(total=self.get_total_time(), phases=phases)
+
+    def __str__(self):
+        lines = ["%-32s %10s %8s" % ("Phase", "Time (s)", "Count")]
+        profile = self.to_dict()
+        for phase in profile['phases']:
+            lines.append("%-32s %10.3f %8d" % (phase['name'], phase['time'],
+                                                 phase['count']))
+        lines.append("%-32s %10.3f" % ("Total", profile['total']))
+        return "\n".join(lines)
+
+
+def run_parallel(func, items, nb_workers):
+    """Calls func(item) for each of the given items using (at most)
+    nb_workers threads.
+
+    :return: list of (result, exc_info) in the same order as the items.
+             exc_info is None unless the call raised an exception
+    :rtype: list<tuple>"""
+    items = list(items)
+    results = [None] * len(items)
+    nb_workers = max(1, min(nb_workers, len(items)))
+    if nb_workers == 1:
+        for i, item in enumerate(items):
+            try:
+                results[i] = func(item), None
+            except:
+                results[i] = None, sys.exc_info()
+        return results
+
+    queue = Queue.Queue()
+    for i, item in enumerate(items):
+        queue.put((i, item))
+
+    def worker():
+        while True:
+            try:
+                i, item = queue.get_nowait()
+            except Queue.Empty:
+                return
+            try:
+                results[i] = func(item), None
+            except:
+                results[i] = None, sys.exc_info()
+
+    workers = [threading.Thread(target=worker, name="PoolStartup-%d" % i)
+               for i in range(nb_workers)]
+    for w in workers:
+        w.daemon = True
+        w.start()
+    for w in workers:
+        w.join()
+    return results
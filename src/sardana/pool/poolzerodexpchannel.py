@@ -36,38 +36,175 @@ import time
 from sardana import ElementType
 from sardana.sardanaevent import EventType
 from sardana.sardanaattribute import SardanaAttribute
+from sardana.sardanavalue import SardanaValue
 
 from sardana.pool.poolbasechannel import PoolBaseChannel
 from sardana.pool.poolacquisition import Pool0DAcquisition
 
 
 class BaseAccumulation(object):
-
-    def __init__(self):
-        self.buffer = numpy.zeros(shape=(2, 16384), dtype=numpy.float64)
+    """Accumulation of the values read from a 0D during an acquisition.
+
+    The values and their timestamps are stored in a preallocated ring buffer
+    which keeps the most recent :attr:`Capacity` samples. The statistics
+    (sum, mean, integral, min, max, std) are updated on each append and cover
+    all the samples, including the ones no longer in the buffer. Invalid
+    values (None or NaN) are kept in the buffer (as NaN) but ignored by the
+    statistics."""
+
+    #: default number of samples kept in the buffer
+    Capacity = 16384
+
+    def __init__(self, capacity=None):
+        if capacity is None:
+            capacity = self.Capacity
+        self.capacity = capacity
+        self.buffer = numpy.zeros(shape=(2, capacity), dtype=numpy.float64)
         self.clear()
 
     def clear(self):
         self.nb_points = 0
+        self.nb_valid_points = 0
         self.value = None
+        self.sum = 0.0
+        self.mean = None
+        self.min = None
+        self.max = None
+        self.integral = 0.0
+        self.start_time = None
+        self.last_value = None
+        self._m2 = 0.0
+
+    def get_std(self):
+        """Returns the (population) standard deviation of the valid values or
+        None if no valid value has been accumulated"""
+        if not self.nb_valid_points:
+            return None
+        return (self._m2 / self.nb_valid_points) ** 0.5
+
+    std = property(get_std)
+
+    def _get_buffer(self, row):
+        nb_points, capacity = self.nb_points, self.capacity
+        if nb_points <= capacity:
+            return self.buffer[row][:nb_points]
+        idx = nb_points % capacity
+        buff = self.buffer[row]
+        return numpy.concatenate((buff[idx:], buff[:idx]))
 
     def get_value_buffer(self):
-        return self.buffer[0][:self.nb_points]
+        return self._get_buffer(0)
 
     def get_time_buffer(self):
-        return self.buffer[1][:self.nb_points]
+        return self._get_buffer(1)
 
     def append_value(self, value, timestamp=None):
         if timestamp is None:
             timestamp = time.time()
-        idx = self.nb_points
+        idx = self.nb_points % self.capacity
         self.nb_points += 1
+        if value is None:
+            value = numpy.nan
         self.buffer[0][idx] = value
         self.buffer[1][idx] = timestamp
-        self.update_value(value, timestamp)
-
-    def update_value(self, value, timestamp):
-        self.value = value
+        if value == value:
+            self._add_valid_value(value, timestamp)
+        self.value = self.calc_value()
+
+    def append_values(self, values, timestamps):
+        """Appends a block of values (ex.: all the samples returned by a
+        single hardware read)
+
+        :param values: sequence of values (None or NaN for invalid ones)
+        :param timestamps: sequence of timestamps (same length as values)"""
+        values = numpy.array(values, dtype=numpy.float64)
+        timestamps = numpy.array(timestamps, dtype=numpy.float64)
+        nb = len(values)
+        if nb == 0:
+            return
+        self._store(values, timestamps)
+        valid = values == values
+        values, timestamps = values[valid], timestamps[valid]
+        nb_valid = len(values)
+        if nb_valid == 1:
+            self._add_valid_value(values[0], timestamps[0])
+        elif nb_valid > 1:
+            self._add_valid_values(values, timestamps)
+        self.value = self.calc_value()
+
+    def _store(self, values, timestamps):
+        capacity = self.capacity
+        nb = len(values)
+        if nb > capacity:
+            # only the last samples fit
+            self.nb_points += nb - capacity
+            values, timestamps = values[-capacity:], timestamps[-capacity:]
+            nb = capacity
+        idx = self.nb_points % capacity
+        first = min(nb, capacity - idx)
+        self.buffer[0][idx:idx + first] = values[:first]
+        self.buffer[1][idx:idx + first] = timestamps[:first]
+        if first < nb:
+            self.buffer[0][:nb - first] = values[first:]
+            self.buffer[1][:nb - first] = timestamps[first:]
+        self.nb_points += nb
+
+    def _add_valid_value(self, value, timestamp):
+        self.nb_valid_points += 1
+        n = self.nb_valid_points
+        self.sum += value
+        if n == 1:
+            self.mean = value
+            self.min = self.max = value
+        else:
+            delta = value - self.mean
+            self.mean += delta / n
+            self._m2 += delta * (value - self.mean)
+            self.min = min(self.min, value)
+            self.max = max(self.max, value)
+        last_value = self.last_value
+        if last_value is None:
+            self.start_time = timestamp
+        else:
+            last_v, last_t = last_value
+            self.integral += (timestamp - last_t) * (last_v + value) / 2.0
+        self.last_value = value, timestamp
+
+    def _add_valid_values(self, values, timestamps):
+        nb_a, nb_b = self.nb_valid_points, len(values)
+        n = nb_a + nb_b
+        mean_b = values.mean()
+        m2_b = ((values - mean_b) ** 2).sum()
+        min_b, max_b = values.min(), values.max()
+        if nb_a == 0:
+            self.mean, self._m2 = mean_b, m2_b
+            self.min, self.max = min_b, max_b
+        else:
+            delta = mean_b - self.mean
+            self.mean += delta * nb_b / n
+            self._m2 += m2_b + delta ** 2 * nb_a * nb_b / n
+            self.min = min(self.min, min_b)
+            self.max = max(self.max, max_b)
+        self.nb_valid_points = n
+        self.sum += values.sum()
+        last_value = self.last_value
+        if last_value is None:
+            self.start_time = timestamps[0]
+        else:
+            values = numpy.concatenate(((last_value[0],), values))
+            timestamps = numpy.concatenate(((last_value[1],), timestamps))
+        self.integral += numpy.trapz(values, timestamps)
+        self.last_value = values[-1], timestamps[-1]
+
+    def calc_value(self):
+        """Returns the accumulated value. Called after each append"""
+        nb_points = self.nb_points
+        if not nb_points:
+            return None
+        value = self.buffer[0][(nb_points - 1) % self.capacity]
+        if value != value:
+            return None
+        return value
 
 
 LastAccumulation = BaseAccumulation
@@ -75,49 +212,36 @@ LastAccumulation = BaseAccumulation
 
 class SumAccumulation(BaseAccumulation):
 
-    def clear(self):
-        BaseAccumulation.clear(self)
-        self.sum = 0.0
-
-    def update_value(self, value, timestamp):
-        if not value is None:
-            self.sum += value
-            self.value = self.sum
-
+    def calc_value(self):
+        if not self.nb_valid_points:
+            return self.value
+        return self.sum
 
-class AverageAccumulation(SumAccumulation):
 
-    def clear(self):
-        SumAccumulation.clear(self)
-        self.nb_valid_points = 0
+class AverageAccumulation(BaseAccumulation):
 
-    def update_value(self, value, timestamp):
-        SumAccumulation.update_value(self, value, timestamp)
-        if not value is None:
-            self.nb_valid_points += 1
-            self.value = self.sum / self.nb_valid_points
+    def calc_value(self):
+        if not self.nb_valid_points:
+            return self.value
+        return self.mean
 
 
 class IntegralAccumulation(BaseAccumulation):
 
-    def clear(self):
-        BaseAccumulation.clear(self)
-        self.sum = 0.0
-        self.last_value = None
-        self.start_time = None
+    def calc_value(self):
+        if not self.nb_valid_points:
+            return self.value
+        total_dt = self.last_value[1] - self.start_time
+        if total_dt <= 0:
+            return self.last_value[0]
+        return self.integral / total_dt
 
-    def update_value(self, value, timestamp):
-        if self.nb_points == 1:
-            self.last_value = value, timestamp
-            self.start_time = timestamp
-            self.value = value
-        else:
-            last_value, last_timestamp = self.last_value
-            dt = timestamp - last_timestamp
-            self.sum += dt * (last_value + value) / 2.0
-            total_dt = timestamp - self.start_time
-            self.value = self.sum / total_dt
-            self.last_value = value, timestamp
+
+def is_block(value):
+    """Tells if the value read from a 0D is a block of samples (some
+    controllers return all the samples taken since the previous read)"""
+    return isinstance(value, (list, tuple, numpy.ndarray)) and \
+        numpy.ndim(value) == 1
 
 
 def get_accumulation_class(ctype):
@@ -164,6 +288,24 @@ class Value(SardanaAttribute):
                             " done so far!")
         return value
 
+    def _has_value(self):
+        return self._accumulation.value is not None
+
+    def _in_error(self):
+        return False
+
+    def _get_exc_info(self):
+        return None
+
+    def _get_timestamp(self):
+        last_value = self._accumulation.last_value
+        if last_value is not None:
+            return last_value[1]
+
+    def _get_snapshot(self):
+        # the value is calculated from the accumulation (it is never set)
+        return self._build_snapshot()
+
     def get_value_buffer(self):
         return self.accumulation.get_value_buffer()
 
@@ -174,7 +316,20 @@ class Value(SardanaAttribute):
         self.accumulation.clear()
 
     def append_value(self, value, propagate=1):
-        self.accumulation.append_value(value.value, value.timestamp)
+        samples = value.value
+        if is_block(samples):
+            accumulation = self.accumulation
+            nb = len(samples)
+            last = accumulation.last_value
+            if last is None:
+                timestamps = nb * [value.timestamp]
+            else:
+                # spread the samples between the previous one and this read
+                timestamps = numpy.linspace(last[1], value.timestamp,
+                                            nb + 1)[1:]
+            accumulation.append_values(samples, timestamps)
+        else:
+            self.accumulation.append_value(samples, value.timestamp)
         if propagate > 0:
             evt_type = EventType(self.name, priority=propagate)
             self.fire_event(evt_type, self)
@@ -189,6 +344,7 @@ class Pool0DExpChannel(PoolBaseChannel):
         kwargs['elem_type'] = ElementType.ZeroDExpChannel
         PoolBaseChannel.__init__(self, **kwargs)
         self._current_value = CurrentValue(self, listeners=self.on_change)
+        self._sampling_period = None
 
     # -------------------------------------------------------------------------
     # Accumulation
@@ -205,6 +361,43 @@ class Pool0DExpChannel(PoolBaseChannel):
 
     accumulation = property(get_accumulation)
 
+    def get_nb_samples(self):
+        """Returns the number of (valid) samples integrated in the accumulated
+        value of the current (or last) acquisition
+
+        :return: the number of samples
+        :rtype: int"""
+        return self.get_accumulation().nb_valid_points
+
+    nb_samples = property(get_nb_samples, doc="number of samples integrated")
+
+    # -------------------------------------------------------------------------
+    # sampling period
+    # -------------------------------------------------------------------------
+
+    def get_sampling_period(self):
+        """Returns the period (s) at which this 0D is read during an
+        acquisition. None means the pool acquisition loop period
+        (see :attr:`~sardana.pool.pool.Pool.acq_loop_sleep_time`)
+
+        :return: the sampling period
+        :rtype: float or None"""
+        return self._sampling_period
+
+    def set_sampling_period(self, period):
+        """Sets the period (s) at which this 0D is read during an acquisition.
+        None or 0 means the pool acquisition loop period. It is taken into
+        account in the next acquisition
+
+        :param period: the new sampling period
+        :type period: float or None"""
+        if period is not None and period < 0:
+            raise ValueError("Sampling period must be positive")
+        self._sampling_period = period or None
+
+    sampling_period = property(get_sampling_period, set_sampling_period,
+                               doc="sampling period")
+
     # -------------------------------------------------------------------------
     # value
     # -------------------------------------------------------------------------
@@ -257,7 +450,17 @@ class Pool0DExpChannel(PoolBaseChannel):
         :type propagate:
             int"""
         curr_val_attr = self.get_current_value_attribute()
-        curr_val_attr.set_value(value, propagate=propagate)
+        samples = value.value
+        if is_block(samples):
+            # the current value is the last sample of the block
+            last = None
+            if len(samples):
+                last = samples[-1]
+            curr_value = SardanaValue(value=last, exc_info=value.exc_info,
+                                      timestamp=value.timestamp)
+            curr_val_attr.set_value(curr_value, propagate=propagate)
+        else:
+            curr_val_attr.set_value(value, propagate=propagate)
         if self.is_in_operation():
             acc_val_attr = self.get_accumulated_value_attribute()
             acc_val_attr.append_value(value, propagate=propagate)
@@ -0,0 +1,392 @@
+#!/usr/bin/env python
+
+##############################################################################
+##
+## This file is part of Sardana
+##
+## http://www.sardana-controls.org/
+##
+## Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+## Sardana is free software: you can redistribute it and/or modify
+## it under the terms of the GNU Lesser General Public License as published by
+## the Free Software Foundation, either version 3 of the License, or
+## (at your option) any later version.
+##
+## Sardana is distributed in the hope that it will be useful,
+## but WITHOUT ANY WARRANTY; without even the implied warranty of
+## MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+## GNU Lesser General Public License for more details.
+##
+## You should have received a copy of the GNU Lesser General Public License
+## along with Sardana.  If not, see <http://www.gnu.org/licenses/>.
+##
+##############################################################################
+
+"""This module contains a benchmark suite for the pool core. It uses the
+:class:`~sardana.pool.test.fake.FakePool` together with the dummy
+controllers so no Tango is involved. Usage::
+
+    python -m sardana.pool.test.benchmark --ctrls 2 --axes 4 -o result.json
+
+The results are dictionaries (one per benchmark) which can be dumped to JSON
+for regression tracking."""
+
+__all__ = ["BenchmarkPool", "BenchmarkResult", "bench_acquisition",
+           "bench_motion", "bench_pseudo_motion", "bench_step_scan",
+           "bench_cached_read", "run_benchmarks", "main"]
+
+__docformat__ = 'restructuredtext'
+
+import sys
+import json
+import math
+import time
+import platform
+import threading
+
+from sardana import release
+from sardana.pool.test import (FakePool, createPoolController,
+                               createPoolCounterTimer, createPoolMotor,
+                               createPoolPseudoMotor, createPoolMotorGroup,
+                               createPoolMeasurementGroup,
+                               dummyPoolCTCtrlConf01, dummyCounterTimerConf01,
+                               dummyPoolMotorCtrlConf01, dummyMotorConf01,
+                               dummyPoolPseudoMotorCtrlConf01,
+                               dummyPseudoMotorConf01, dummyMotorGroupConf01,
+                               dummyMeasurementGroupConf01)
+
+#: time between two checks of a running action (s)
+POLL_PERIOD = 0.0005
+
+
+class BenchmarkResult(object):
+    """Statistics of a set of samples (latencies in seconds unless the
+    result name says otherwise)"""
+
+    def __init__(self, name, params=None):
+        self.name = name
+        self.params = params or {}
+        self.samples = []
+
+    def add(self, sample):
+        self.samples.append(sample)
+
+    def to_dict(self):
+        samples = sorted(self.samples)
+        n = len(samples)
+        ret = dict(name=self.name, params=self.params, samples=n)
+        if n == 0:
+            return ret
+        mean = sum(samples) / n
+        var = sum([(s - mean) ** 2 for s in samples]) / n
+        if n % 2:
+            median = samples[n // 2]
+        else:
+            median = 0.5 * (samples[n // 2 - 1] + samples[n // 2])
+        ret.update(min=samples[0], max=samples[-1], mean=mean, median=median,
+                   std=math.sqrt(var))
+        return ret
+
+
+class BenchmarkPool(FakePool):
+    """A :class:`FakePool` which knows how to populate itself with dummy
+    controllers and elements with unique names and ids"""
+
+    # same loop timings as the real Pool defaults
+    acq_loop_sleep_time = 0.01
+    motion_loop_sleep_time = 0.01
+
+    def __init__(self):
+        FakePool.__init__(self)
+        self._last_id = 0
+
+    def _new_conf(self, template, prefix, **kwargs):
+        self._last_id += 1
+        conf = dict(template)
+        eid = self._last_id
+        name = "%s%02d" % (prefix, eid)
+        conf.update(id=eid, name=name, full_name=name)
+        conf.update(kwargs)
+        return conf
+
+    def add_controller(self, template, prefix, **kwargs):
+        conf = self._new_conf(template, prefix, **kwargs)
+        ctrl = createPoolController(self, conf)
+        self.add_element(ctrl)
+        return ctrl
+
+    def add_axis(self, create, ctrl, template, prefix, axis, **kwargs):
+        conf = self._new_conf(template, prefix, axis=axis, **kwargs)
+        elem = create(self, ctrl, conf)
+        ctrl.add_element(elem)
+        self.add_element(elem)
+        return elem
+
+    def add_counters(self, nb_ctrls, nb_channels):
+        channels = []
+        for _ in range(nb_ctrls):
+            ctrl = self.add_controller(dummyPoolCTCtrlConf01, "ctctrl")
+            for axis in range(1, nb_channels + 1):
+                channels.append(self.add_axis(createPoolCounterTimer, ctrl,
+                                              dummyCounterTimerConf01, "ct",
+                                              axis))
+        return channels
+
+    def add_motors(self, nb_ctrls, nb_axes):
+        motors = []
+        for _ in range(nb_ctrls):
+            ctrl = self.add_controller(dummyPoolMotorCtrlConf01, "motctrl")
+            for axis in range(1, nb_axes + 1):
+                motors.append(self.add_axis(createPoolMotor, ctrl,
+                                            dummyMotorConf01, "mot", axis))
+        return motors
+
+    def add_slit(self, top, bottom):
+        role_ids = [top.id, bottom.id]
+        ctrl = self.add_controller(dummyPoolPseudoMotorCtrlConf01, "slitctrl",
+                                   role_ids=role_ids)
+        pseudos = []
+        for axis in (1, 2):
+            pseudos.append(self.add_axis(createPoolPseudoMotor, ctrl,
+                                         dummyPseudoMotorConf01, "slit", axis,
+                                         user_elements=role_ids))
+        return pseudos
+
+    def add_motor_group(self, elements):
+        conf = self._new_conf(dummyMotorGroupConf01, "mg",
+                              user_elements=[e.id for e in elements])
+        motor_group = createPoolMotorGroup(self, conf)
+        self.add_element(motor_group)
+        return motor_group
+
+    def add_measurement_group(self, channels):
+        conf = self._new_conf(dummyMeasurementGroupConf01, "mntgrp",
+                              user_elements=[c.id for c in channels])
+        measurement_group = createPoolMeasurementGroup(self, conf)
+        self.add_element(measurement_group)
+        return measurement_group
+
+
+def _wait(*actions):
+    while True:
+        for action in actions:
+            if action.is_running():
+                break
+        else:
+            return
+        time.sleep(POLL_PERIOD)
+
+
+def _acquire(measurement_group):
+    acquisition = measurement_group.acquisition
+    measurement_group.start_acquisition()
+    _wait(acquisition._ct_acq, acquisition._0d_acq)
+
+
+def _move(moveable, position):
+    moveable.start_move(position)
+    _wait(moveable.motion)
+
+
+def bench_acquisition(nb_ctrls=1, nb_channels=1, integ_time=0.01, repeat=10,
+                      pool=None):
+    """Measures the overhead of :meth:`PoolMeasurementGroup.start_acquisition`
+    (i.e. the time spent on top of the integration time)."""
+    if pool is None:
+        pool = BenchmarkPool()
+    channels = pool.add_counters(nb_ctrls, nb_channels)
+    measurement_group = pool.add_measurement_group(channels)
+    measurement_group.set_integration_time(integ_time, propagate=0)
+    params = dict(nb_ctrls=nb_ctrls, nb_channels=nb_channels,
+                  integ_time=integ_time, repeat=repeat)
+    start = BenchmarkResult("acquisition_start", params)
+    total = BenchmarkResult("acquisition_overhead", params)
+    for _ in range(repeat):
+        t0 = time.time()
+        measurement_group.start_acquisition()
+        t1 = time.time()
+        acquisition = measurement_group.acquisition
+        _wait(acquisition._ct_acq, acquisition._0d_acq)
+        t2 = time.time()
+        start.add(t1 - t0)
+        total.add(t2 - t0 - integ_time)
+    return [start, total]
+
+
+def bench_motion(nb_ctrls=1, nb_axes=1, repeat=10, parallel_start=False,
+                 pool=None):
+    """Measures the time between the start of a motion and the detection of
+    the end of it by :class:`PoolMotion`. The dummy motors reach their
+    destination immediately so the result is the pure motion overhead.
+    If parallel_start is True, the controllers are started concurrently and
+    the start skew is also measured."""
+    if pool is None:
+        pool = BenchmarkPool()
+    pool.motion_parallel_start = parallel_start
+    motors = pool.add_motors(nb_ctrls, nb_axes)
+    motor_group = pool.add_motor_group(motors)
+    params = dict(nb_ctrls=nb_ctrls, nb_axes=nb_axes, repeat=repeat,
+                  parallel_start=parallel_start)
+    start = BenchmarkResult("motion_start", params)
+    total = BenchmarkResult("motion_start_to_stopped", params)
+    start_skew = BenchmarkResult("motion_start_skew", params)
+    for i in range(repeat):
+        positions = len(motors) * [float(i + 1)]
+        t0 = time.time()
+        motor_group.start_move(positions)
+        t1 = time.time()
+        _wait(motor_group.motion)
+        t2 = time.time()
+        start.add(t1 - t0)
+        total.add(t2 - t0)
+        skew = motor_group.motion.get_start_skew()
+        if skew is not None:
+            start_skew.add(skew)
+    results = [start, total]
+    if len(start_skew.samples):
+        results.append(start_skew)
+    return results
+
+
+def bench_pseudo_motion(nb_slits=1, repeat=10, pool=None):
+    """Measures the time needed to move a slit gap pseudo motor (including
+    the calculation of the physical positions) and to read its position."""
+    if pool is None:
+        pool = BenchmarkPool()
+    gaps = []
+    for _ in range(nb_slits):
+        top, bottom = pool.add_motors(1, 2)
+        gap, _ = pool.add_slit(top, bottom)
+        gaps.append(gap)
+    params = dict(nb_slits=nb_slits, repeat=repeat)
+    move = BenchmarkResult("pseudo_motion", params)
+    read = BenchmarkResult("pseudo_read_position", params)
+    for i in range(repeat):
+        for gap in gaps:
+            t0 = time.time()
+            _move(gap, float(i + 1))
+            t1 = time.time()
+            gap.get_position(cache=False, propagate=0)
+            t2 = time.time()
+            move.add(t1 - t0)
+            read.add(t2 - t1)
+    return [move, read]
+
+
+def bench_step_scan(nb_motors=1, nb_ctrls=1, nb_channels=1, nb_points=10,
+                    integ_time=0.01, pool=None):
+    """Measures the dead time of a step scan point. Each point does what a
+    :class:`~sardana.macroserver.scan.gscan.SScan` step does on the pool side:
+    move the motors, acquire with the measurement group and read the final
+    values."""
+    if pool is None:
+        pool = BenchmarkPool()
+    motors = pool.add_motors(1, nb_motors)
+    motor_group = pool.add_motor_group(motors)
+    channels = pool.add_counters(nb_ctrls, nb_channels)
+    measurement_group = pool.add_measurement_group(channels)
+    measurement_group.set_integration_time(integ_time, propagate=0)
+    params = dict(nb_motors=nb_motors, nb_ctrls=nb_ctrls,
+                  nb_channels=nb_channels, nb_points=nb_points,
+                  integ_time=integ_time)
+    result = BenchmarkResult("step_scan_point_overhead", params)
+    for i in range(nb_points):
+        t0 = time.time()
+        _move(motor_group, len(motors) * [float(i)])
+        _acquire(measurement_group)
+        measurement_group.acquisition.read_value()
+        t1 = time.time()
+        result.add(t1 - t0 - integ_time)
+    return [result]
+
+
+def bench_cached_read(nb_readers=4, distance=10.0, repeat=1, pool=None):
+    """Measures the cached position reads done by concurrent clients while a
+    motor is moving, the same way the Tango Motor.read_Position does (cached
+    state and a position snapshot). The motor uses the DummyMotorController
+    so the motion takes a finite time (~0.8s for the default distance).
+    Returns the latency of each read and the throughput (reads/s) of each
+    reader."""
+    if pool is None:
+        pool = BenchmarkPool()
+    ctrl = pool.add_controller(dummyPoolMotorCtrlConf01, "motctrl",
+                               klass="DummyMotorController")
+    motor = pool.add_axis(createPoolMotor, ctrl, dummyMotorConf01, "mot", 1)
+    motion = motor.motion
+    params = dict(nb_readers=nb_readers, distance=distance, repeat=repeat)
+    latency = BenchmarkResult("cached_read_latency", params)
+    throughput = BenchmarkResult("cached_read_throughput", params)
+
+    def reader(samples, rates):
+        start = time.time()
+        while motion.is_running():
+            t0 = time.time()
+            motor.get_state(cache=True, propagate=0)
+            motor.get_position(cache=True, propagate=0).get_snapshot()
+            samples.append(time.time() - t0)
+        rates.append(len(samples) / (time.time() - start))
+
+    for i in range(repeat):
+        position = 0.0 if i % 2 else distance
+        motor.start_move(position)
+        samples, rates = [[] for _ in range(nb_readers)], []
+        readers = [threading.Thread(target=reader, args=(s, rates))
+                   for s in samples]
+        for r in readers:
+            r.start()
+        for r in readers:
+            r.join()
+        _wait(motion)
+        for s in samples:
+            latency.samples.extend(s)
+        throughput.samples.extend(rates)
+    return [latency, throughput]
+
+
+def run_benchmarks(nb_ctrls=1, nb_axes=1, repeat=10, integ_time=0.01):
+    """Runs all benchmarks and returns a dictionary ready to be dumped as
+    JSON"""
+    results = []
+    results.extend(bench_acquisition(nb_ctrls=nb_ctrls, nb_channels=nb_axes,
+                                     integ_time=integ_time, repeat=repeat))
+    for parallel_start in (False, True):
+        results.extend(bench_motion(nb_ctrls=nb_ctrls, nb_axes=nb_axes,
+                                    repeat=repeat,
+                                    parallel_start=parallel_start))
+    results.extend(bench_pseudo_motion(nb_slits=nb_ctrls, repeat=repeat))
+    results.extend(bench_step_scan(nb_motors=nb_axes, nb_ctrls=nb_ctrls,
+                                   nb_channels=nb_axes, nb_points=repeat,
+                                   integ_time=integ_time))
+    results.extend(bench_cached_read(nb_readers=nb_axes, repeat=repeat))
+    return dict(version=release.version, python=platform.python_version(),
+                platform=platform.platform(), timestamp=time.time(),
+                results=[r.to_dict() for r in results])
+
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description="Sardana pool benchmarks")
+    parser.add_argument("--ctrls", type=int, default=1,
+                        help="number of controllers")
+    parser.add_argument("--axes", type=int, default=1,
+                        help="number of axes/channels per controller")
+    parser.add_argument("--repeat", type=int, default=10,
+                        help="number of repetitions (or scan points)")
+    parser.add_argument("--integ-time", type=float, default=0.01,
+                        help="integration time (s)")
+    parser.add_argument("-o", "--output", default=None,
+                        help="output JSON file (default: stdout)")
+    args = parser.parse_args(argv)
+    report = run_benchmarks(nb_ctrls=args.ctrls, nb_axes=args.axes,
+                            repeat=args.repeat, integ_time=args.integ_time)
+    if args.output is None:
+        json.dump(report, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+    else:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -24,7 +24,10 @@
 ##############################################################################
 
 __all__ = ['dummyCounterTimerConf01', 'dummyMeasurementGroupConf01',
-           'dummyPoolCTCtrlConf01']
+           'dummyPoolCTCtrlConf01', 'dummyMotorConf01', 'dummyMotorGroupConf01',
+           'dummyPseudoMotorConf01', 'dummyPoolMotorCtrlConf01',
+           'dummyPoolPseudoMotorCtrlConf01', 'dummyIORegisterConf01',
+           'dummyPoolIORCtrlConf01']
 
 # Pool Elements
 
@@ -43,6 +46,38 @@ dummyMeasurementGroupConf01 = { 'full_name': '',
                               'pool': None,
                               'user_elements': [2] }
 
+'''Minimum configuration to create a Pool Motor'''
+dummyMotorConf01 = { 'axis': 1,
+                     'ctrl': None,
+                     'full_name': '',
+                     'id': 5,
+                     'name': '',
+                     'pool': None }
+
+'''Minimum configuration to create a Pool PseudoMotor'''
+dummyPseudoMotorConf01 = { 'axis': 1,
+                           'ctrl': None,
+                           'full_name': '',
+                           'id': 8,
+                           'name': '',
+                           'pool': None,
+                           'user_elements': [5, 6] }
+
+'''Minimum configuration to create a Pool MotorGroup'''
+dummyMotorGroupConf01 = { 'full_name': '',
+                          'id': 9,
+                          'name': '',
+                          'pool': None,
+                          'user_elements': [5] }
+
+'''Minimum configuration to create a Pool IORegister'''
+dummyIORegisterConf01 = { 'axis': 1,
+                          'ctrl': None,
+                          'full_name': '',
+                          'id': 11,
+                          'name': '',
+                          'pool': None }
+
 # Pool Ctrls
 
 '''Minimum configuration to create a Pool CounterTimer controller'''
@@ -57,3 +92,42 @@ dummyPoolCTCtrlConf01 = { 'class_info': None,
                         'properties': {},
                         'role_ids': '',
                         'type': 'CTExpChannel' }
+
+'''Minimum configuration to create a Pool Motor controller'''
+dummyPoolMotorCtrlConf01 = { 'class_info': None,
+                           'full_name': '',
+                           'id': 4,
+                           'klass': 'FastDummyMotorController',
+                           'lib_info': None,
+                           'library': 'DummyMotorController.py',
+                           'name': '',
+                           'pool': None,
+                           'properties': {},
+                           'role_ids': '',
+                           'type': 'Motor' }
+
+'''Minimum configuration to create a Pool PseudoMotor controller'''
+dummyPoolPseudoMotorCtrlConf01 = { 'class_info': None,
+                                 'full_name': '',
+                                 'id': 7,
+                                 'klass': 'Slit',
+                                 'lib_info': None,
+                                 'library': 'Slit.py',
+                                 'name': '',
+                                 'pool': None,
+                                 'properties': {},
+                                 'role_ids': [5, 6],
+                                 'type': 'PseudoMotor' }
+
+'''Minimum configuration to create a Pool IORegister controller'''
+dummyPoolIORCtrlConf01 = { 'class_info': None,
+                         'full_name': '',
+                         'id': 10,
+                         'klass': 'DummyIORController',
+                         'lib_info': None,
+                         'library': 'DummyIORController.py',
+                         'name': '',
+                         'pool': None,
+                         'properties': {},
+                         'role_ids': '',
+                         'type': 'IORegister' }
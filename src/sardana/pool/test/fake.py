@@ -32,10 +32,16 @@ class FakePool(object):
     '''
     acq_loop_sleep_time = 0.1
     acq_loop_states_per_value = 10
-
-    elements = {}
+    motion_loop_sleep_time = 0.01
+    motion_loop_states_per_position = 10
+    motion_loop_prediction = False
+    motion_loop_stall_tolerance = 0.0
+    motion_parallel_start = False
+    ioregister_write_polling = False
+    drift_correction = True
 
     def __init__(self):
+        self.elements = {}
         self.ctrl_manager = ControllerManager()
         self.ctrl_manager.set_pool(self)
         self.ctrl_manager.setControllerPath([])
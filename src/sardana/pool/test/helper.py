@@ -24,11 +24,19 @@
 ##############################################################################
 
 __all__ = ['createPoolController', 'createPoolCounterTimer',
-           'createPoolMeasurementGroup']
+           'createPoolMeasurementGroup', 'createPoolMotor',
+           'createPoolPseudoMotor', 'createPoolMotorGroup',
+           'createPoolIORegister']
 
+from sardana import ElementType
 from sardana.pool.poolcontroller import PoolController
 from sardana.pool.poolcountertimer import PoolCounterTimer
 from sardana.pool.poolmeasurementgroup import PoolMeasurementGroup
+from sardana.pool.poolmotor import PoolMotor
+from sardana.pool.poolpseudomotor import PoolPseudoMotor
+from sardana.pool.poolmotorgroup import PoolMotorGroup
+from sardana.pool.poolioregister import PoolIORegister
+from sardana.pool.poolmetacontroller import TYPE_MAP_OBJ
 
 def createPoolController(pool, conf):
     '''Method to create a PoolController using a configuration dictionary
@@ -44,7 +52,10 @@ def createPoolController(pool, conf):
     kwargs['pool'] = pool
     kwargs['lib_info'] = ctrl_lib_info
     kwargs['class_info'] = ctrl_class_info
-    return PoolController(**kwargs)
+    # pseudo controllers need a specific PoolController class
+    klass_map = TYPE_MAP_OBJ[ElementType.Controller].klass
+    klass = klass_map.get(ElementType[kwargs['type']], PoolController)
+    return klass(**kwargs)
 
 def createPoolCounterTimer(pool, poolcontroller, conf):
     '''Method to create a PoolCounterTimer using a configuration dictionary
@@ -60,3 +71,34 @@ def createPoolMeasurementGroup(pool, conf):
     kwargs = conf
     kwargs['pool'] = pool
     return PoolMeasurementGroup(**kwargs)
+
+def createPoolMotor(pool, poolcontroller, conf):
+    '''Method to create a PoolMotor using a configuration dictionary
+    '''
+    kwargs = conf
+    kwargs['pool'] = pool
+    kwargs['ctrl'] = poolcontroller
+    return PoolMotor(**kwargs)
+
+def createPoolPseudoMotor(pool, poolcontroller, conf):
+    '''Method to create a PoolPseudoMotor using a configuration dictionary
+    '''
+    kwargs = conf
+    kwargs['pool'] = pool
+    kwargs['ctrl'] = poolcontroller
+    return PoolPseudoMotor(**kwargs)
+
+def createPoolMotorGroup(pool, conf):
+    '''Method to create a PoolMotorGroup using a configuration dictionary
+    '''
+    kwargs = conf
+    kwargs['pool'] = pool
+    return PoolMotorGroup(**kwargs)
+
+def createPoolIORegister(pool, poolcontroller, conf):
+    '''Method to create a PoolIORegister using a configuration dictionary
+    '''
+    kwargs = conf
+    kwargs['pool'] = pool
+    kwargs['ctrl'] = poolcontroller
+    return PoolIORegister(**kwargs)
@@ -0,0 +1,59 @@
+#!/usr/bin/env python
+
+##############################################################################
+##
+## This file is part of Sardana
+##
+## http://www.sardana-controls.org/
+##
+## Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+## Sardana is free software: you can redistribute it and/or modify
+## it under the terms of the GNU Lesser General Public License as published by
+## the Free Software Foundation, either version 3 of the License, or
+## (at your option) any later version.
+##
+## Sardana is distributed in the hope that it will be useful,
+## but WITHOUT ANY WARRANTY; without even the implied warranty of
+## MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+## GNU Lesser General Public License for more details.
+##
+## You should have received a copy of the GNU Lesser General Public License
+## along with Sardana.  If not, see <http://www.gnu.org/licenses/>.
+##
+##############################################################################
+
+import json
+from taurus.external import unittest
+from sardana.pool.test.benchmark import BenchmarkResult, run_benchmarks
+
+
+class BenchmarkTestCase(unittest.TestCase):
+    """Smoke test of the pool benchmark suite using the smallest possible
+    configuration"""
+
+    def test_result_statistics(self):
+        """Verify the statistics computed by BenchmarkResult"""
+        result = BenchmarkResult("test")
+        for sample in (1.0, 2.0, 3.0, 4.0):
+            result.add(sample)
+        d = result.to_dict()
+        self.assertEqual(d['samples'], 4)
+        self.assertEqual(d['min'], 1.0)
+        self.assertEqual(d['max'], 4.0)
+        self.assertEqual(d['median'], 2.5)
+        self.assertEqual(d['mean'], 2.5)
+
+    def test_run_benchmarks(self):
+        """Run all benchmarks once and verify the report is JSON friendly"""
+        report = run_benchmarks(nb_ctrls=1, nb_axes=2, repeat=2,
+                                integ_time=0.01)
+        names = [r['name'] for r in report['results']]
+        self.assertIn('acquisition_overhead', names)
+        self.assertIn('motion_start_to_stopped', names)
+        self.assertIn('pseudo_motion', names)
+        self.assertIn('step_scan_point_overhead', names)
+        self.assertIn('cached_read_throughput', names)
+        for r in report['results']:
+            self.assertGreater(r['samples'], 0, r['name'])
+        json.dumps(report)
@@ -0,0 +1,81 @@
+#!/usr/bin/env python
+
+##############################################################################
+##
+## This file is part of Sardana
+##
+## http://www.sardana-controls.org/
+##
+## Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+## Sardana is free software: you can redistribute it and/or modify
+## it under the terms of the GNU Lesser General Public License as published by
+## the Free Software Foundation, either version 3 of the License, or
+## (at your option) any later version.
+##
+## Sardana is distributed in the hope that it will be useful,
+## but WITHOUT ANY WARRANTY; without even the implied warranty of
+## MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+## GNU Lesser General Public License for more details.
+##
+## You should have received a copy of the GNU Lesser General Public License
+## along with Sardana.  If not, see <http://www.gnu.org/licenses/>.
+##
+##############################################################################
+
+import time
+from taurus.external import unittest
+from sardana.pool.poolcontrollers.DummyCounterTimerController import \
+    Channel, GatedAcquisition
+
+
+class FakeMotor(object):
+    """Position changing linearly in time"""
+
+    def __init__(self, velocity):
+        self.start_time = time.time()
+        self.velocity = velocity
+
+    def read(self):
+        return (time.time() - self.start_time) * self.velocity
+
+
+class GatedAcquisitionTestCase(unittest.TestCase):
+    """Unittest of the GatedAcquisition used by the dummy counter timer
+    controller in gate mode"""
+
+    def setUp(self):
+        self.channels = [Channel(1), Channel(2)]
+
+    def test_time_triggers(self):
+        """Verify one value per trigger is buffered by each channel"""
+        acq = GatedAcquisition(self.channels, 1, 5, 0.01, 0.0, 0.02)
+        acq.start()
+        acq.join(2)
+        self.assertFalse(acq.is_running())
+        self.assertEqual(self.channels[0].data, 5 * [0.01])
+        self.assertEqual(self.channels[1].data, 5 * [0.02])
+        self.assertEqual(acq.positions, [])
+
+    def test_position_triggers(self):
+        """Verify the triggers happen at the requested positions"""
+        motor = FakeMotor(100)
+        acq = GatedAcquisition(self.channels, 1, 4, 0.001, 1.0, 2.0,
+                               read_trigger=motor.read,
+                               read_latch=motor.read)
+        acq.start()
+        acq.join(2)
+        self.assertEqual(len(self.channels[1].data), 4)
+        self.assertEqual(len(acq.positions), 4)
+        for i, position in enumerate(acq.positions):
+            self.assertTrue(1.0 + 2 * i <= position < 1.0 + 2 * i + 1.0)
+
+    def test_stop(self):
+        """Verify a stopped acquisition does not buffer more values"""
+        acq = GatedAcquisition(self.channels, 1, 100, 0.01, 0.0, 0.05)
+        acq.start()
+        time.sleep(0.08)
+        acq.stop()
+        acq.join(1)
+        self.assertFalse(acq.is_running())
+        self.assertTrue(len(self.channels[0].data) < 100)
@@ -0,0 +1,95 @@
+#!/usr/bin/env python
+
+##############################################################################
+##
+## This file is part of Sardana
+##
+## http://www.sardana-controls.org/
+##
+## Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+## Sardana is free software: you can redistribute it and/or modify
+## it under the terms of the GNU Lesser General Public License as published by
+## the Free Software Foundation, either version 3 of the License, or
+## (at your option) any later version.
+##
+## Sardana is distributed in the hope that it will be useful,
+## but WITHOUT ANY WARRANTY; without even the implied warranty of
+## MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+## GNU Lesser General Public License for more details.
+##
+## You should have received a copy of the GNU Lesser General Public License
+## along with Sardana.  If not, see <http://www.gnu.org/licenses/>.
+##
+##############################################################################
+
+import time
+from taurus.external import unittest
+from sardana.pool.test import (FakePool, createPoolController,
+                               dummyPoolCTCtrlConf01)
+from sardana.pool.poolcontrollers.LatencyDummyController import \
+    LatencyInjector
+
+
+class LatencyInjectorTestCase(unittest.TestCase):
+    """Unittest of the LatencyInjector used by the latency dummy
+    controllers"""
+
+    def test_per_axis_and_bulk(self):
+        """Verify the bulk delay grows with the number of prepared axes"""
+        injector = LatencyInjector(latency=0.1, bulk_latency=1.0,
+                                   bulk_axis_latency=0.5)
+        self.assertEqual(injector.delay("StateOne"), 0.1)
+        injector.delay("PreReadAll")
+        for _ in range(3):
+            injector.delay("PreReadOne")
+        self.assertEqual(injector.delay("ReadAll"), 2.5)
+        # counts are consumed by the bulk call
+        self.assertEqual(injector.delay("ReadAll"), 1.0)
+
+    def test_call_latency(self):
+        """Verify per call overrides"""
+        injector = LatencyInjector(latency=0.1,
+                                   call_latency="StateOne:0.2, ReadOne:0")
+        self.assertEqual(injector.delay("StateOne"), 0.2)
+        self.assertEqual(injector.delay("ReadOne"), 0.0)
+        self.assertEqual(injector.delay("StartOne"), 0.1)
+
+    def test_distribution(self):
+        """Verify random delays are never negative"""
+        injector = LatencyInjector(latency=0.01, jitter=0.1,
+                                   distribution="normal")
+        for _ in range(100):
+            self.assertGreaterEqual(injector.delay("StateOne"), 0.0)
+        self.assertRaises(ValueError, LatencyInjector, distribution="bad")
+
+    def test_failure(self):
+        """Verify calls fail with the given failure rate"""
+        injector = LatencyInjector(failure_rate=1.0)
+        self.assertRaises(Exception, injector.apply, "StateOne")
+        self.assertEqual(injector.nb_failures, 1)
+
+
+class LatencyDummyControllerTestCase(unittest.TestCase):
+    """Verify the latency is configured through the controller properties"""
+
+    def setUp(self):
+        pool = FakePool()
+        conf = dict(dummyPoolCTCtrlConf01)
+        conf['library'] = 'LatencyDummyController.py'
+        conf['klass'] = 'LatencyDummyCounterTimerController'
+        conf['properties'] = {'Latency': 0.05}
+        self.pc = createPoolController(pool, conf)
+
+    def test_latency(self):
+        ctrl = self.pc.ctrl
+        t0 = time.time()
+        ctrl.StateAll()
+        ctrl.PreStateOne(1)
+        t1 = time.time()
+        self.assertGreaterEqual(t1 - t0, 0.05)
+        self.assertEqual(ctrl.latency_injector.nb_calls, 2)
+
+    def tearDown(self):
+        unittest.TestCase.tearDown(self)
+        self.pc = None
@@ -0,0 +1,122 @@
+#!/usr/bin/env python
+
+##############################################################################
+##
+## This file is part of Sardana
+##
+## http://www.sardana-controls.org/
+##
+## Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+## Sardana is free software: you can redistribute it and/or modify
+## it under the terms of the GNU Lesser General Public License as published by
+## the Free Software Foundation, either version 3 of the License, or
+## (at your option) any later version.
+##
+## Sardana is distributed in the hope that it will be useful,
+## but WITHOUT ANY WARRANTY; without even the implied warranty of
+## MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+## GNU Lesser General Public License for more details.
+##
+## You should have received a copy of the GNU Lesser General Public License
+## along with Sardana.  If not, see <http://www.gnu.org/licenses/>.
+##
+##############################################################################
+
+import threading
+import time
+
+from taurus.external import unittest
+
+from sardana import State
+from sardana.pool.test import (FakePool, createPoolController,
+                               createPoolIORegister, dummyIORegisterConf01,
+                               dummyPoolIORCtrlConf01)
+
+
+class PoolIORegisterWriteTestCase(unittest.TestCase):
+    """Unittest of the PoolIORegister write"""
+
+    def setUp(self):
+        self.pool = FakePool()
+        self.pc = createPoolController(self.pool, dict(dummyPoolIORCtrlConf01))
+        self.pior = createPoolIORegister(self.pool, self.pc,
+                                         dict(dummyIORegisterConf01))
+        self.pc.add_element(self.pior)
+        self.pool.add_element(self.pc)
+        self.pool.add_element(self.pior)
+        self.busy = threading.Event()
+        # the register reports Moving while the busy flag is set
+        ctrl = self.pc.ctrl
+        ctrl.StateOne = self._state_one
+
+    def _state_one(self, axis):
+        if self.busy.is_set():
+            return State.Moving, "Writing"
+        return State.On, "Device in On state"
+
+    def _wait(self, timeout=5.0):
+        action = self.pior.get_action_cache()
+        end = time.time() + timeout
+        while action.is_running() and time.time() < end:
+            time.sleep(0.01)
+        return action
+
+    def test_synchronous_write(self):
+        """Verify the default write calls the controller directly and does
+        not involve the acquisition action"""
+        self.busy.set()
+        self.pior.value = 5
+        self.assertEqual(self.pc.ctrl.myvalue, 5)
+        self.assertFalse(self.pior.get_action_cache().is_running())
+        self.assertFalse(self.pior.is_in_operation())
+        # a busy register does not prevent writing again
+        self.pior.value = 7
+        self.assertEqual(self.pc.ctrl.myvalue, 7)
+
+    def test_polling_write_completed(self):
+        """Verify an opt-in write which completes in WriteOne finishes
+        before returning"""
+        self.pool.ioregister_write_polling = True
+        self.pior.value = 5
+        self.assertEqual(self.pc.ctrl.myvalue, 5)
+        self.assertFalse(self.pior.get_action_cache().is_running())
+        self.assertFalse(self.pior.is_in_operation())
+
+    def test_polling_write_asynchronous(self):
+        """Verify an opt-in write of a busy register returns immediately and
+        is finished by the state polling"""
+        self.pool.ioregister_write_polling = True
+        self.busy.set()
+        self.pior.value = 5
+        self.assertEqual(self.pc.ctrl.myvalue, 5)
+        self.assertTrue(self.pior.is_in_operation())
+        self.busy.clear()
+        action = self._wait()
+        self.assertFalse(action.is_running())
+        self.assertFalse(self.pior.is_in_operation())
+        self.assertEqual(self.pior.get_state(cache=False), State.On)
+
+    def test_polling_write_concurrent(self):
+        """Verify writing while an opt-in write is in progress is rejected
+        and leaves the ongoing write untouched"""
+        self.pool.ioregister_write_polling = True
+        self.busy.set()
+        self.pior.value = 5
+        try:
+            self.assertRaises(Exception, self.pior.write_register, 7)
+            self.assertEqual(self.pc.ctrl.myvalue, 5)
+            self.assertTrue(self.pior.is_in_operation())
+        finally:
+            self.busy.clear()
+            self._wait()
+        self.assertFalse(self.pior.is_in_operation())
+        self.pior.value = 7
+        self.assertEqual(self.pc.ctrl.myvalue, 7)
+
+    def tearDown(self):
+        self.busy.clear()
+        unittest.TestCase.tearDown(self)
+        self.pc = None
+        self.pior = None
+        self.pool = None
@@ -0,0 +1,108 @@
+#!/usr/bin/env python
+
+##############################################################################
+##
+## This file is part of Sardana
+##
+## http://www.sardana-controls.org/
+##
+## Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+## Sardana is free software: you can redistribute it and/or modify
+## it under the terms of the GNU Lesser General Public License as published by
+## the Free Software Foundation, either version 3 of the License, or
+## (at your option) any later version.
+##
+## Sardana is distributed in the hope that it will be useful,
+## but WITHOUT ANY WARRANTY; without even the implied warranty of
+## MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+## GNU Lesser General Public License for more details.
+##
+## You should have received a copy of the GNU Lesser General Public License
+## along with Sardana.  If not, see <http://www.gnu.org/licenses/>.
+##
+##############################################################################
+
+import time
+from taurus.external import unittest
+from sardana.pool.test import (FakePool, createPoolController,
+                               createPoolMotor, dummyPoolMotorCtrlConf01,
+                               dummyMotorConf01)
+from sardana.pool.test.benchmark import BenchmarkPool, _move
+
+
+class PoolMotionPredictionTestCase(unittest.TestCase):
+    """Unittest of the motion time prediction of PoolMotion"""
+
+    def setUp(self):
+        pool = FakePool()
+        pool.motion_loop_prediction = True
+        pool.motion_loop_stall_tolerance = 0.5
+        ctrl_conf = dict(dummyPoolMotorCtrlConf01)
+        ctrl_conf['klass'] = 'DummyMotorController'
+        self.pc = createPoolController(pool, ctrl_conf)
+        self.pm = createPoolMotor(pool, self.pc, dict(dummyMotorConf01))
+        self.pc.add_element(self.pm)
+        pool.add_element(self.pc)
+        pool.add_element(self.pm)
+        self.pm.set_base_rate(0.0)
+        self.pm.set_velocity(10.0)
+        self.pm.set_acceleration(0.1)
+        self.pm.set_deceleration(0.1)
+
+    def _move(self, position):
+        motion = self.pm.motion
+        self.pm.start_move(position)
+        while motion.is_running():
+            time.sleep(0.01)
+        return motion
+
+    def test_prediction(self):
+        """Verify the predicted motion time and that the motion finishes
+        at the expected position"""
+        motion = self._move(3.0)
+        motion_item = motion._motion_info[self.pm]
+        self.assertAlmostEqual(motion_item.motion_time, 0.4)
+        self.assertEqual(motion.get_stalled(), [])
+        self.assertAlmostEqual(self.pm.get_position(cache=False).value, 3.0)
+
+    def test_stall(self):
+        """Verify a motion overrunning its prediction is reported"""
+        motion = self._move(1.0)
+        motion_item = motion._motion_info[self.pm]
+        motion_item.start_time = time.time() - 10
+        motion_item.stalled = False
+        motion._check_stall(motion_item, time.time())
+        self.assertEqual(motion.get_stalled(), [self.pm])
+
+    def tearDown(self):
+        unittest.TestCase.tearDown(self)
+        self.pc = None
+        self.pm = None
+
+
+class PoolMotionParallelStartTestCase(unittest.TestCase):
+    """Unittest of the parallel start of PoolMotion"""
+
+    def setUp(self):
+        self.pool = BenchmarkPool()
+        self.pool.motion_parallel_start = True
+        self.motors = self.pool.add_motors(3, 2)
+        self.motor_group = self.pool.add_motor_group(self.motors)
+
+    def test_parallel_start(self):
+        """Verify all motors reach their position and the start skew is
+        reported"""
+        positions = [float(i) for i in range(len(self.motors))]
+        _move(self.motor_group, positions)
+        motion = self.motor_group.motion
+        self.assertGreaterEqual(motion.get_start_skew(), 0)
+        for motor, position in zip(self.motors, positions):
+            self.assertAlmostEqual(motor.get_position(cache=False).value,
+                                   position)
+
+    def tearDown(self):
+        unittest.TestCase.tearDown(self)
+        self.pool = None
+        self.motors = None
+        self.motor_group = None
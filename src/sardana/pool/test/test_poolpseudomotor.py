@@ -0,0 +1,95 @@
+#!/usr/bin/env python
+
+##############################################################################
+##
+## This file is part of Sardana
+##
+## http://www.sardana-controls.org/
+##
+## Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+## Sardana is free software: you can redistribute it and/or modify
+## it under the terms of the GNU Lesser General Public License as published by
+## the Free Software Foundation, either version 3 of the License, or
+## (at your option) any later version.
+##
+## Sardana is distributed in the hope that it will be useful,
+## but WITHOUT ANY WARRANTY; without even the implied warranty of
+## MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+## GNU Lesser General Public License for more details.
+##
+## You should have received a copy of the GNU Lesser General Public License
+## along with Sardana.  If not, see <http://www.gnu.org/licenses/>.
+##
+##############################################################################
+
+from taurus.external import unittest
+from sardana.pool.test.benchmark import BenchmarkPool, _move
+
+
+class PoolPseudoMotorCacheTestCase(unittest.TestCase):
+    """Unittest of the pseudo position cache of the pseudo motor
+    controllers"""
+
+    def setUp(self):
+        self.pool = BenchmarkPool()
+        self.top, self.bottom = self.pool.add_motors(1, 2)
+        self.gap, self.offset = self.pool.add_slit(self.top, self.bottom)
+        ctrl = self.gap.controller.ctrl
+        self.nb_calls = 0
+        calc_all_pseudo = ctrl.CalcAllPseudo
+
+        def counted(*args, **kwargs):
+            self.nb_calls += 1
+            return calc_all_pseudo(*args, **kwargs)
+        ctrl.CalcAllPseudo = counted
+
+    def test_siblings_share_calculation(self):
+        """Verify reading sibling positions calls CalcAllPseudo once"""
+        self.gap.get_position()
+        self.offset.get_position()
+        self.gap.get_position().value
+        self.offset.get_position().value
+        self.assertEqual(self.nb_calls, 1)
+
+    def test_invalidation(self):
+        """Verify the positions are recalculated when a physical position
+        changes"""
+        gap = self.gap.get_position().value
+        _move(self.top, self.top.get_position().value + 1)
+        new_gap = self.gap.get_position().value
+        self.assertAlmostEqual(new_gap, gap + 1)
+        self.assertEqual(self.nb_calls, 2)
+
+    def test_lazy_calculation(self):
+        """Verify physical position events don't calculate the pseudo
+        positions: they are calculated when read"""
+        gap = self.gap.get_position().value
+        _move(self.top, self.top.get_position().value + 1)
+        _move(self.bottom, self.bottom.get_position().value + 1)
+        self.assertEqual(self.nb_calls, 1)
+        self.assertAlmostEqual(self.gap.get_position().value, gap + 2)
+        self.assertEqual(self.nb_calls, 2)
+
+    def test_parameter_invalidation(self):
+        """Verify writing a controller parameter discards the calculated
+        positions"""
+        self.gap.get_position().value
+        self.gap.controller.set_ctrl_par("test", 1)
+        self.gap.get_position().value
+        self.assertEqual(self.nb_calls, 2)
+
+    def test_opt_out(self):
+        """Verify nothing is cached for controllers which opt out"""
+        klass = self.gap.controller.ctrl.__class__
+        klass.cache_pseudo_positions = False
+        try:
+            self.gap.get_position().value
+            self.gap.get_position().value
+        finally:
+            del klass.cache_pseudo_positions
+        self.assertEqual(self.nb_calls, 2)
+
+    def tearDown(self):
+        unittest.TestCase.tearDown(self)
+        self.pool = None
@@ -0,0 +1,148 @@
+#!/usr/bin/env python
+
+##############################################################################
+##
+## This file is part of Sardana
+##
+## http://www.sardana-controls.org/
+##
+## Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+## Sardana is free software: you can redistribute it and/or modify
+## it under the terms of the GNU Lesser General Public License as published by
+## the Free Software Foundation, either version 3 of the License, or
+## (at your option) any later version.
+##
+## Sardana is distributed in the hope that it will be useful,
+## but WITHOUT ANY WARRANTY; without even the implied warranty of
+## MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+## GNU Lesser General Public License for more details.
+##
+## You should have received a copy of the GNU Lesser General Public License
+## along with Sardana.  If not, see <http://www.gnu.org/licenses/>.
+##
+##############################################################################
+
+import time
+import threading
+
+from taurus.external import unittest
+
+from sardana.pool.pool import Pool
+from sardana.pool.poolstartup import StartupProfile, run_parallel
+
+
+class StartupProfileTestCase(unittest.TestCase):
+
+    def test_phases(self):
+        profile = StartupProfile()
+        with profile.phase("Controller devices", count=2):
+            pass
+        profile.add("Database properties", 0.5)
+        profile.add("Controller devices", 0.25, count=3)
+        info = profile.to_dict()
+        names = [phase['name'] for phase in info['phases']]
+        self.assertEqual(names, ["Controller devices", "Database properties"])
+        ctrl_phase = info['phases'][0]
+        self.assertEqual(ctrl_phase['count'], 5)
+        self.assertTrue(ctrl_phase['time'] >= 0.25)
+        self.assertTrue(info['total'] >= 0.0)
+        self.assertTrue("Database properties" in str(profile))
+
+
+class RunParallelTestCase(unittest.TestCase):
+
+    def test_results_order(self):
+        def square(x):
+            if x == 3:
+                raise ValueError("3")
+            return x * x
+        for nb_workers in (1, 4):
+            results = run_parallel(square, range(6), nb_workers)
+            self.assertEqual([r for r, _ in results],
+                             [0, 1, 4, None, 16, 25])
+            self.assertTrue(results[3][1][0] is ValueError)
+            self.assertEqual([e for _, e in results if e is None],
+                             [None] * 5)
+
+    def test_concurrency(self):
+        threads = set()
+
+        def slow(x):
+            threads.add(threading.current_thread().name)
+            time.sleep(0.05)
+
+        start = time.time()
+        run_parallel(slow, range(8), 8)
+        self.assertTrue(time.time() - start < 0.3)
+        self.assertEqual(len(threads), 8)
+
+
+class FakeController(object):
+
+    def __init__(self, **kwargs):
+        self.name = kwargs['name']
+        time.sleep(kwargs.get('delay', 0))
+        if kwargs.get('init_error'):
+            raise RuntimeError("init " + self.name)
+
+
+class CreateControllersTestCase(unittest.TestCase):
+    """Unittest of Pool.create_controllers"""
+
+    def setUp(self):
+        self.pool = pool = Pool.__new__(Pool)
+        pool._startup_profile = StartupProfile()
+        self.added = added = []
+
+        def prepare(**kwargs):
+            if kwargs.get('prepare_error'):
+                raise KeyError(kwargs['name'])
+            return FakeController, kwargs
+
+        def add(ctrl):
+            if ctrl.name == "add_error":
+                raise ValueError(ctrl.name)
+            added.append(ctrl.name)
+            return ctrl
+
+        pool._prepare_controller = prepare
+        pool._add_controller = add
+
+    def _create(self, nb_workers):
+        self.pool._ctrl_init_workers = nb_workers
+        del self.added[:]
+        # the first controllers are the slowest to initialize
+        ctrls_kwargs = [dict(name="ctrl%d" % i, delay=0.01 * (6 - i))
+                        for i in range(6)]
+        ctrls_kwargs[1]['prepare_error'] = True
+        ctrls_kwargs[2]['init_error'] = True
+        ctrls_kwargs[4]['name'] = "add_error"
+        return self.pool.create_controllers(ctrls_kwargs)
+
+    def test_order(self):
+        """Verify the controllers are returned and added to the pool in the
+        given order"""
+        for nb_workers in (1, 4):
+            ret = self._create(nb_workers)
+            self.assertEqual(len(ret), 6)
+            self.assertEqual(self.added, ["ctrl0", "ctrl3", "ctrl5"])
+            for i in (0, 3, 5):
+                ctrl, exc_info = ret[i]
+                self.assertEqual(ctrl.name, "ctrl%d" % i)
+                self.assertEqual(exc_info, None)
+
+    def test_errors(self):
+        """Verify the errors of each phase are returned for the failing
+        controller only"""
+        for nb_workers in (1, 4):
+            ret = self._create(nb_workers)
+            for i, exc_type in ((1, KeyError), (2, RuntimeError),
+                                (4, ValueError)):
+                ctrl, exc_info = ret[i]
+                self.assertEqual(ctrl, None)
+                self.assertTrue(exc_info[0] is exc_type)
+
+    def test_default_workers(self):
+        """Verify the controllers are initialized serially by default"""
+        self.assertEqual(Pool.Default_ControllerInitWorkers, 1)
@@ -0,0 +1,109 @@
+#!/usr/bin/env python
+
+##############################################################################
+##
+## This file is part of Sardana
+##
+## http://www.sardana-controls.org/
+##
+## Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+## Sardana is free software: you can redistribute it and/or modify
+## it under the terms of the GNU Lesser General Public License as published by
+## the Free Software Foundation, either version 3 of the License, or
+## (at your option) any later version.
+##
+## Sardana is distributed in the hope that it will be useful,
+## but WITHOUT ANY WARRANTY; without even the implied warranty of
+## MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+## GNU Lesser General Public License for more details.
+##
+## You should have received a copy of the GNU Lesser General Public License
+## along with Sardana.  If not, see <http://www.gnu.org/licenses/>.
+##
+##############################################################################
+
+import numpy
+
+from taurus.external import unittest
+
+from sardana.pool.poolzerodexpchannel import LastAccumulation, \
+    SumAccumulation, AverageAccumulation, IntegralAccumulation, Value
+
+
+class AccumulationTestCase(unittest.TestCase):
+
+    values = [1.0, None, 3.0, 2.0, 6.0]
+    timestamps = [0.0, 0.5, 1.0, 2.0, 3.0]
+
+    def _accumulate(self, klass, block=False, capacity=None):
+        acc = klass(capacity=capacity)
+        if block:
+            acc.append_values(self.values, self.timestamps)
+        else:
+            for value, timestamp in zip(self.values, self.timestamps):
+                acc.append_value(value, timestamp)
+        return acc
+
+    def test_statistics(self):
+        for block in (False, True):
+            acc = self._accumulate(LastAccumulation, block=block)
+            self.assertEqual(acc.nb_points, 5)
+            self.assertEqual(acc.nb_valid_points, 4)
+            self.assertAlmostEqual(acc.sum, 12.0)
+            self.assertAlmostEqual(acc.mean, 3.0)
+            self.assertAlmostEqual(acc.std, numpy.std([1.0, 3.0, 2.0, 6.0]))
+            self.assertEqual((acc.min, acc.max), (1.0, 6.0))
+            self.assertAlmostEqual(acc.integral, 2.0 + 2.5 + 4.0)
+
+    def test_values(self):
+        for block in (False, True):
+            self.assertEqual(self._accumulate(LastAccumulation, block).value,
+                             6.0)
+            self.assertEqual(self._accumulate(SumAccumulation, block).value,
+                             12.0)
+            self.assertEqual(
+                self._accumulate(AverageAccumulation, block).value, 3.0)
+            self.assertAlmostEqual(
+                self._accumulate(IntegralAccumulation, block).value, 8.5 / 3)
+
+    def test_ring_buffer(self):
+        for block in (False, True):
+            acc = self._accumulate(AverageAccumulation, block, capacity=3)
+            numpy.testing.assert_array_equal(acc.get_value_buffer(),
+                                             [3.0, 2.0, 6.0])
+            numpy.testing.assert_array_equal(acc.get_time_buffer(),
+                                             [1.0, 2.0, 3.0])
+            # statistics include the samples no longer in the buffer
+            self.assertEqual(acc.value, 3.0)
+
+    def test_clear(self):
+        acc = self._accumulate(SumAccumulation)
+        acc.clear()
+        self.assertEqual(acc.nb_points, 0)
+        self.assertEqual(acc.value, None)
+        self.assertEqual(len(acc.get_value_buffer()), 0)
+
+
+class Owner(object):
+
+    name = "zerod"
+
+
+class ValueTestCase(unittest.TestCase):
+
+    def test_snapshot(self):
+        """The snapshot is built from the accumulated value"""
+        owner = Owner()
+        value = Value(owner, name="value", accumulation_type="Sum")
+        self.assertFalse(value.has_value())
+        self.assertFalse(value.get_snapshot().has_value())
+        value.accumulation.append_value(1.0, 10.0)
+        value.accumulation.append_value(2.0, 11.0)
+        snapshot = value.get_snapshot()
+        self.assertTrue(snapshot.has_value())
+        self.assertEqual(snapshot.value, 3.0)
+        self.assertEqual(snapshot.timestamp, 11.0)
+        self.assertFalse(snapshot.error)
+        value.clear_buffer()
+        self.assertFalse(value.get_snapshot().has_value())
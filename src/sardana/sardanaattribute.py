@@ -29,18 +29,81 @@ for Sardana attributes"""
 from __future__ import absolute_import
 
 __all__ = ["SardanaAttribute", "SardanaSoftwareAttribute",
-           "ScalarNumberAttribute", "SardanaAttributeConfiguration"]
+           "ScalarNumberAttribute", "SardanaAttributeConfiguration",
+           "SardanaAttributeSnapshot"]
 
 __docformat__ = 'restructuredtext'
 
+import sys
 import weakref
 import datetime
+import threading
 
 from .sardanaevent import EventGenerator, EventType
 from .sardanadefs import ScalarNumberFilter
 from .sardanavalue import SardanaValue
 
 
+class SardanaAttributeSnapshot(object):
+    """An immutable view of the read and write values of a
+    :class:`SardanaAttribute` at a given moment. Its members must not be
+    modified: attributes publish a new snapshot on each change"""
+
+    __slots__ = ("value_obj", "write_value_obj")
+
+    def __init__(self, value_obj=None, write_value_obj=None):
+        self.value_obj = value_obj
+        self.write_value_obj = write_value_obj
+
+    def has_value(self):
+        return self.value_obj is not None
+
+    def has_write_value(self):
+        return self.write_value_obj is not None
+
+    @property
+    def value(self):
+        if self.value_obj is not None:
+            return self.value_obj.value
+
+    @property
+    def w_value(self):
+        if self.write_value_obj is not None:
+            return self.write_value_obj.value
+
+    @property
+    def timestamp(self):
+        if self.value_obj is not None:
+            return self.value_obj.timestamp
+
+    @property
+    def w_timestamp(self):
+        if self.write_value_obj is not None:
+            return self.write_value_obj.timestamp
+
+    @property
+    def error(self):
+        return self.value_obj is not None and self.value_obj.error
+
+    @property
+    def exc_info(self):
+        if self.value_obj is not None:
+            return self.value_obj.exc_info
+
+    def __repr__(self):
+        v = None
+        if self.error:
+            v = "<Error>"
+        elif self.has_value():
+            v = self.value
+        return "{0}(value={1}, w_value={2})".format(self.__class__.__name__,
+                                                    v, self.w_value)
+
+
+#: snapshot of an attribute which has never been read nor written
+EmptySnapshot = SardanaAttributeSnapshot()
+
+
 class SardanaAttribute(EventGenerator):
     """Class representing an atomic attribute like position of a motor or a
     counter value"""
@@ -54,6 +117,11 @@ class SardanaAttribute(EventGenerator):
         self._r_value = None
         self._last_event_value = None
         self._w_value = None
+        # the snapshot is replaced (never modified) on each change so readers
+        # don't need any lock. Writers serialize on _publish_lock so that a
+        # concurrent read and write value change don't lose each other
+        self._snapshot = EmptySnapshot
+        self._publish_lock = threading.Lock()
         self.filter = lambda a, b: True
         self.config = SardanaAttributeConfiguration()
         if initial_value is not None:
@@ -129,7 +197,9 @@ class SardanaAttribute(EventGenerator):
             rvalue = value
         else:
             rvalue = SardanaValue(value=value, exc_info=exc_info, timestamp=timestamp)
-        self._r_value = rvalue
+        with self._publish_lock:
+            self._r_value = rvalue
+            self._snapshot = SardanaAttributeSnapshot(rvalue, self._w_value)
         self.fire_read_event(propagate=propagate)
 
     def get_value(self):
@@ -179,7 +249,9 @@ class SardanaAttribute(EventGenerator):
             wvalue = w_value
         else:
             wvalue = SardanaValue(value=w_value, timestamp=timestamp)
-        self._w_value = wvalue
+        with self._publish_lock:
+            self._w_value = wvalue
+            self._snapshot = SardanaAttributeSnapshot(self._r_value, wvalue)
         self.fire_write_event(propagate=propagate)
 
     def get_write_value(self):
@@ -222,6 +294,40 @@ class SardanaAttribute(EventGenerator):
             exc_info = self._r_value.exc_info
         return exc_info
 
+    def get_snapshot(self):
+        """Returns a consistent snapshot of the last read value, write value,
+        timestamps and exception information of this attribute. It never
+        blocks nor reads hardware, so it can be safely called while the
+        attribute owner is involved in an operation.
+
+        :return: the attribute snapshot
+        :rtype: :class:`SardanaAttributeSnapshot`"""
+        return self._get_snapshot()
+
+    def _get_snapshot(self):
+        return self._snapshot
+
+    def _build_snapshot(self):
+        """Builds a snapshot from the current read and write values. Used by
+        attributes whose values are calculated from other attributes
+        (which therefore never publish snapshots themselves)"""
+        r_value = w_value = None
+        if self.has_value():
+            try:
+                exc_info = self.get_exc_info()
+                value = None if exc_info else self.get_value()
+            except:
+                value, exc_info = None, sys.exc_info()
+            r_value = SardanaValue(value=value, exc_info=exc_info,
+                                   timestamp=self.get_timestamp())
+        if self.has_write_value():
+            try:
+                w_value = SardanaValue(value=self.get_write_value(),
+                                       timestamp=self.get_write_timestamp())
+            except:
+                pass
+        return SardanaAttributeSnapshot(r_value, w_value)
+
     def accepts(self, propagate):
         if propagate < 1:
             return False
@@ -289,6 +395,7 @@ class SardanaAttribute(EventGenerator):
     w_timestamp = property(get_write_timestamp, doc="the write timestamp")
     error = property(in_error)
     exc_info = property(get_exc_info)
+    snapshot = property(get_snapshot, doc="the last published snapshot")
 
     def __repr__(self):
         v = None
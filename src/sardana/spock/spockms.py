@@ -538,8 +538,26 @@ class SpockMacroServer(BaseMacroServer):
         self.call__init__(BaseMacroServer, name, **kw)
 
     def on_elements_changed(self, evt_src, evt_type, evt_value):
-        return BaseMacroServer.on_elements_changed(self, evt_src, evt_type,
-                                                   evt_value)
+        ret = BaseMacroServer.on_elements_changed(self, evt_src, evt_type,
+                                                  evt_value)
+        self._updateMacros(*ret)
+        return ret
+
+    def _updateMacros(self, added, removed, changed):
+        """Updates the macro magic commands from the elements added, removed
+        and changed by an elements event. Changed macros keep their magic
+        command (only the documentation is updated)"""
+        macros = {}
+        for element in added.union(changed):
+            if element is not None and "MacroCode" in element.interfaces:
+                macros[element.name] = element
+        for element in removed:
+            if element is None or "MacroCode" not in element.interfaces:
+                continue
+            if element.name not in macros:
+                self._removeMacro(element)
+        for macro_info in macros.values():
+            self._addMacro(macro_info)
 
     _SKIP_ELEMENTS = 'controller', 'motorgroup', 'instrument', \
         'controllerclass', 'controllerlib', 'macrolib'
@@ -547,9 +565,10 @@ class SpockMacroServer(BaseMacroServer):
     def _addElement(self, element_data):
         element = BaseMacroServer._addElement(self, element_data)
         elem_type = element.type
-        if "MacroCode" in element.interfaces:
-            self._addMacro(element)
-        elif elem_type not in self.NO_CLASS_TYPES:
+        # macro magic commands are updated once the whole event is processed
+        # (see _updateMacros)
+        if "MacroCode" not in element.interfaces and \
+           elem_type not in self.NO_CLASS_TYPES:
             # TODO: when it becomes possible to do:
             # some taurus.Device.<attr name> = <value>
             # replace device_proxy with element
@@ -560,15 +579,20 @@ class SpockMacroServer(BaseMacroServer):
     def _removeElement(self, element_data):
         element = BaseMacroServer._removeElement(self, element_data)
         elem_type = element.type
-        if "MacroCode" in element.interfaces:
-            self._removeMacro(element)
-        elif elem_type not in self.NO_CLASS_TYPES:
+        if "MacroCode" not in element.interfaces and \
+           elem_type not in self.NO_CLASS_TYPES:
             genutils.unexpose_variable(element.name)
         return element
 
     def _addMacro(self, macro_info):
         macro_name = str(macro_info.name)
 
+        macro_fn = self._local_magic.get(macro_name)
+        if macro_fn is not None:
+            # already registered: the magic command only depends on the name
+            macro_fn.__doc__ = macro_info.doc
+            return macro_info
+
         # IPython < 1 magic commands have different API
         if genutils.get_ipython_version_list() < [1, 0]:
             def macro_fn(shell, parameter_s='', name=macro_name):
@@ -598,5 +622,5 @@ class SpockMacroServer(BaseMacroServer):
 
     def _removeMacro(self, macro_info):
         macro_name = macro_info.name
-        genutils.unexpose_magic(macro_name)
-        del self._local_magic[macro_name]
+        if self._local_magic.pop(macro_name, None) is not None:
+            genutils.unexpose_magic(macro_name)
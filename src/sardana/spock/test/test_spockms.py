@@ -0,0 +1,107 @@
+#!/usr/bin/env python
+
+##############################################################################
+##
+## This file is part of Sardana
+##
+## http://www.sardana-controls.org/
+##
+## Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+## Sardana is free software: you can redistribute it and/or modify
+## it under the terms of the GNU Lesser General Public License as published by
+## the Free Software Foundation, either version 3 of the License, or
+## (at your option) any later version.
+##
+## Sardana is distributed in the hope that it will be useful,
+## but WITHOUT ANY WARRANTY; without even the implied warranty of
+## MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+## GNU Lesser General Public License for more details.
+##
+## You should have received a copy of the GNU Lesser General Public License
+## along with Sardana.  If not, see <http://www.gnu.org/licenses/>.
+##
+##############################################################################
+
+from taurus.external import unittest
+
+from sardana.spock import genutils
+from sardana.spock.spockms import SpockMacroServer
+
+
+class FakeElement(object):
+
+    def __init__(self, name, doc="", interfaces=("MacroCode",)):
+        self.name = name
+        self.doc = doc
+        self.interfaces = interfaces
+
+
+class FakeSpockMacroServer(object):
+    """Only the macro magic command handling of the SpockMacroServer"""
+
+    _updateMacros = SpockMacroServer._updateMacros.im_func
+    _addMacro = SpockMacroServer._addMacro.im_func
+    _removeMacro = SpockMacroServer._removeMacro.im_func
+
+    def __init__(self):
+        self._local_magic = {}
+
+
+class UpdateMacrosTestCase(unittest.TestCase):
+    """Unittest of the macro magic commands update of spock"""
+
+    def setUp(self):
+        self.exposed, self.unexposed = [], []
+        self._genutils = genutils.expose_magic, genutils.unexpose_magic
+        genutils.expose_magic = lambda name, fn: self.exposed.append(name)
+        genutils.unexpose_magic = lambda name: self.unexposed.append(name)
+        self.ms = FakeSpockMacroServer()
+        self.ascan = FakeElement("ascan", doc="ascan doc")
+        self.mv = FakeElement("mv", doc="mv doc")
+        motor = FakeElement("mot01", interfaces=("Motor",))
+        self.ms._updateMacros(set([self.ascan, self.mv, motor]), set(),
+                              set())
+
+    def test_add(self):
+        """Verify new macros are registered as magic commands"""
+        self.assertEqual(sorted(self.exposed), ["ascan", "mv"])
+        self.assertEqual(sorted(self.ms._local_magic), ["ascan", "mv"])
+        self.assertEqual(self.ms._local_magic["mv"].__doc__, "mv doc")
+        self.assertEqual(self.unexposed, [])
+
+    def test_change(self):
+        """Verify a changed macro only gets its documentation updated"""
+        magic = self.ms._local_magic["mv"]
+        self.ms._updateMacros(set(), set(),
+                              set([FakeElement("mv", doc="new doc")]))
+        self.assertEqual(sorted(self.exposed), ["ascan", "mv"])
+        self.assertEqual(self.unexposed, [])
+        self.assertTrue(self.ms._local_magic["mv"] is magic)
+        self.assertEqual(magic.__doc__, "new doc")
+
+    def test_reload(self):
+        """Verify a macro removed and added by the same event (ex:
+        relmaclib) keeps its magic command"""
+        magic = self.ms._local_magic["ascan"]
+        self.ms._updateMacros(set([FakeElement("ascan", doc="new doc")]),
+                              set([self.ascan]), set())
+        self.assertEqual(self.unexposed, [])
+        self.assertEqual(sorted(self.exposed), ["ascan", "mv"])
+        self.assertTrue(self.ms._local_magic["ascan"] is magic)
+        self.assertEqual(magic.__doc__, "new doc")
+
+    def test_remove(self):
+        """Verify only removed macros are unexposed"""
+        motor = FakeElement("mot01", interfaces=("Motor",))
+        unknown = FakeElement("unknown")
+        self.ms._updateMacros(set(), set([self.mv, motor, unknown]), set())
+        self.assertEqual(self.unexposed, ["mv"])
+        self.assertEqual(sorted(self.ms._local_magic), ["ascan"])
+        # a new macro with the same name is registered again
+        self.ms._updateMacros(set([FakeElement("mv")]), set(), set())
+        self.assertEqual(sorted(self.exposed), ["ascan", "mv", "mv"])
+
+    def tearDown(self):
+        genutils.expose_magic, genutils.unexpose_magic = self._genutils
+        unittest.TestCase.tearDown(self)
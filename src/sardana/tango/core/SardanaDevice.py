@@ -31,6 +31,7 @@ __all__ = ["SardanaDevice", "SardanaDeviceClass"]
 
 __docformat__ = 'restructuredtext'
 
+import copy
 import time
 import threading
 
@@ -41,7 +42,9 @@ from PyTango import Device_4Impl, DeviceClass, Util, DevState, \
 from taurus.core.util.threadpool import ThreadPool
 from taurus.core.util.log import Logger
 
-from sardana.tango.core.util import to_tango_state, NO_DB_MAP
+from sardana.tango.core.eventpusher import get_event_pusher
+from sardana.tango.core.util import to_tango_state, NO_DB_MAP, \
+    get_device_full_name, get_startup_property_cache
 
 
 __thread_pool_lock = threading.Lock()
@@ -87,7 +90,7 @@ class SardanaDevice(Device_4Impl, Logger):
             # C++ AutoTangoMonitor because it blocks the entire tango device.
             self.tango_lock = threading.RLock()
 
-            self._event_thread_pool = get_thread_pool()
+            self._event_pusher = get_event_pusher()
             self.init_device()
         finally:
             self.in_constructor = False
@@ -99,8 +102,11 @@ class SardanaDevice(Device_4Impl, Logger):
         :param str name: device name"""
 
         db = self.get_database()
+        cache = get_startup_property_cache()
         if db is None:
             self._alias = self._get_nodb_device_info()[0]
+        elif cache is not None and cache.has_device(name):
+            self._alias = cache.get_alias(name)
         else:
             try:
                 self._alias = db.get_alias(name)
@@ -124,15 +130,58 @@ class SardanaDevice(Device_4Impl, Logger):
         
         :return: this device full name
         :rtype: str"""
-        db = self.get_database()
-        if db.get_from_env_var():
-            db_name = ApiUtil.get_env_var("TANGO_HOST")
-        else:
-            if db.is_dbase_used():
-                db_name = db.get_db_host() + ":" + db.get_db_port()
-            else:
-                db_name = db.get_file_name()
-        return db_name + "/" + self.get_name()
+        return get_device_full_name(self.get_database(), self.get_name())
+
+    def get_db_device_property(self, prop_names):
+        """Reads the given device properties from the database (or from the
+        startup property cache while the server is starting)
+
+        :param prop_names: property names
+        :type prop_names: seq<:obj:`str`\>
+        :return: dict where key is the property name and value is the
+                 sequence of property value lines
+        :rtype: dict<:obj:`str`, seq<:obj:`str`\>>"""
+        name = self.get_name()
+        cache = get_startup_property_cache()
+        if cache is not None and cache.has_device(name):
+            return cache.get_device_property(name, prop_names)
+        return self.get_database().get_device_property(name, prop_names)
+
+    def get_device_properties(self, ds_class=None):
+        """Reads the device properties into the device members. While the
+        server is starting they are taken from the startup property cache
+        (see :func:`~sardana.tango.core.util.load_startup_property_cache`)"""
+        if ds_class is None:
+            ds_class = self.get_device_class()
+        name = self.get_name()
+        cache = get_startup_property_cache()
+        if cache is not None and cache.has_device(name):
+            try:
+                return self._set_device_properties(ds_class, cache)
+            except:
+                self.debug("Failed to use the startup property cache",
+                           exc_info=1)
+        return Device_4Impl.get_device_properties(self, ds_class)
+
+    def _set_device_properties(self, ds_class, cache):
+        """Internal method. Same as the :class:`PyTango.DeviceImpl`
+        implementation of :meth:`get_device_properties` with the values
+        taken from the given property cache instead of the database"""
+        # the class property util reads the device properties from its
+        # database: use a copy of it which reads them from the cache
+        pu = copy.copy(ds_class.prop_util)
+        pu.db = cache
+        self.prop_util = ds_class.prop_util
+        class_props = ds_class.class_property_list
+        self.device_property_list = dev_props = \
+            copy.deepcopy(ds_class.device_property_list)
+        pu.get_device_properties(self, class_props, dev_props)
+        for prop_name in class_props:
+            setattr(self, prop_name,
+                    pu.get_property_values(prop_name, class_props))
+        for prop_name in dev_props:
+            setattr(self, prop_name,
+                    pu.get_property_values(prop_name, dev_props))
 
     def init_device(self):
         """Initialize the device. Called during startup after :meth:`init` and
@@ -200,10 +249,22 @@ class SardanaDevice(Device_4Impl, Logger):
     def get_event_thread_pool(self):
         """Return the :class:`~taurus.core.util.ThreadPool` used by sardana to
         send tango events.
+
+        .. deprecated::
+            asynchronous events are sent through the event pusher (see
+            :meth:`get_event_pusher`)
         
         :return: the sardana :class:`~taurus.core.util.ThreadPool`
         :rtype: :class:`~taurus.core.util.ThreadPool`"""
-        return self._event_thread_pool
+        return get_thread_pool()
+
+    def get_event_pusher(self):
+        """Return the :class:`~sardana.tango.core.eventpusher.EventPusher`
+        used by sardana to send tango events asynchronously.
+
+        :return: the sardana event pusher
+        :rtype: :class:`~sardana.tango.core.eventpusher.EventPusher`"""
+        return self._event_pusher
 
     def get_attribute_by_name(self, attr_name):
         """Gets the attribute for the given name.
@@ -290,10 +351,16 @@ class SardanaDevice(Device_4Impl, Logger):
                      quality=quality, error=error, priority=priority,
                      synch=synch)
         else:
-            th_pool = self.get_event_thread_pool()
-            th_pool.add(set_attr, None, attr, value=value, w_value=w_value,
-                        timestamp=timestamp, quality=quality, error=error,
-                        priority=priority, synch=synch)
+            # non priority values of the same attribute still waiting to be
+            # pushed are replaced by the newer one. Priority events and
+            # state/status changes are all pushed, in order
+            attr_name = attr.get_name().lower()
+            coalesce = priority < 2 and attr_name not in ("state", "status")
+            self._event_pusher.push(self.get_name(), attr_name, coalesce,
+                                    set_attr, attr, value=value,
+                                    w_value=w_value, timestamp=timestamp,
+                                    quality=quality, error=error,
+                                    priority=priority, synch=synch)
 
     def set_attribute_push(self, attr, value=None, w_value=None, timestamp=None,
                            quality=None, error=None, priority=1, synch=True):
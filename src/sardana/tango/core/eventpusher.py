@@ -0,0 +1,212 @@
+#!/usr/bin/env python
+
+##############################################################################
+##
+## This file is part of Sardana
+##
+## http://www.sardana-controls.org/
+##
+## Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+## Sardana is free software: you can redistribute it and/or modify
+## it under the terms of the GNU Lesser General Public License as published by
+## the Free Software Foundation, either version 3 of the License, or
+## (at your option) any later version.
+##
+## Sardana is distributed in the hope that it will be useful,
+## but WITHOUT ANY WARRANTY; without even the implied warranty of
+## MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+## GNU Lesser General Public License for more details.
+##
+## You should have received a copy of the GNU Lesser General Public License
+## along with Sardana.  If not, see <http://www.gnu.org/licenses/>.
+##
+##############################################################################
+
+"""This module contains the asynchronous event pusher used by the sardana
+tango devices"""
+
+__all__ = ["EventLane", "EventPusher", "get_event_pusher"]
+
+__docformat__ = 'restructuredtext'
+
+import threading
+import collections
+
+from taurus.core.util.log import Logger
+
+
+class EventLane(Logger):
+    """A worker thread which executes event push jobs in order.
+
+    Pending jobs given with a key may be *coalesced*: if a new job with the
+    same key is added while the previous one is still pending, the new job
+    replaces the pending one in the queue, at its position, so only the
+    latest value is pushed. Jobs added with coalesce=False (priority events)
+    are never replaced and are executed in the order they were added. A key
+    may be a (source, name) tuple: once a priority job of a source is queued,
+    the pending jobs of that source queued before it are no longer replaced
+    (a newer value is queued after the priority job instead) so the jobs of
+    a source never overtake its priority jobs."""
+
+    def __init__(self, name):
+        Logger.__init__(self, name)
+        self._cond = threading.Condition()
+        # deque<tuple<key, list<job, args, kwargs>>>
+        self._queue = collections.deque()
+        # dict<source, dict<key, list<job, args, kwargs>>>: coalescable
+        # pending entries
+        self._pending = {}
+        self._stopped = False
+        self._busy = False
+        self.nb_added = 0
+        self.nb_coalesced = 0
+        self.nb_executed = 0
+        self.max_depth = 0
+        self._thread = threading.Thread(target=self._run, name=name)
+        self._thread.daemon = True
+        self._thread.start()
+
+    @staticmethod
+    def _get_source(key):
+        if isinstance(key, tuple):
+            return key[0]
+        return key
+
+    def add(self, key, coalesce, job, *args, **kwargs):
+        """Adds a job to the lane
+
+        :param key: the coalescing key (ex: (device name, attribute name))
+        :param coalesce: True if the job may replace a pending job with the
+                         same key (and be replaced by a newer one)
+        :param job: the callable"""
+        with self._cond:
+            self.nb_added += 1
+            source = self._get_source(key)
+            pending = self._pending.get(source)
+            if coalesce and pending is not None and key in pending:
+                pending[key][:] = job, args, kwargs
+                self.nb_coalesced += 1
+                return
+            entry = [job, args, kwargs]
+            if coalesce:
+                if pending is None:
+                    self._pending[source] = pending = {}
+                pending[key] = entry
+            else:
+                # later jobs of the same source must not overtake this one
+                self._pending.pop(source, None)
+            self._queue.append((key, entry))
+            self.max_depth = max(self.max_depth, len(self._queue))
+            self._cond.notify()
+
+    def get_depth(self):
+        """Returns the number of jobs waiting to be executed"""
+        with self._cond:
+            return len(self._queue)
+
+    def get_stats(self):
+        """Returns the lane statistics
+
+        :return: dict with keys 'depth', 'max_depth', 'added', 'coalesced'
+                 and 'executed'
+        :rtype: dict"""
+        with self._cond:
+            return dict(depth=len(self._queue), max_depth=self.max_depth,
+                        added=self.nb_added, coalesced=self.nb_coalesced,
+                        executed=self.nb_executed)
+
+    def join(self):
+        """Waits until all jobs added so far have been executed"""
+        with self._cond:
+            while self._queue or self._busy:
+                self._cond.wait()
+
+    def stop(self):
+        with self._cond:
+            self._stopped = True
+            self._cond.notify_all()
+
+    def _run(self):
+        cond, queue, pending = self._cond, self._queue, self._pending
+        while True:
+            with cond:
+                while not queue and not self._stopped:
+                    cond.wait()
+                if self._stopped:
+                    return
+                key, entry = queue.popleft()
+                source = self._get_source(key)
+                source_pending = pending.get(source)
+                if source_pending and source_pending.get(key) is entry:
+                    del source_pending[key]
+                    if not source_pending:
+                        del pending[source]
+                job, args, kwargs = entry
+                self._busy = True
+            try:
+                job(*args, **kwargs)
+            except:
+                self.warning("Exception pushing event")
+                self.debug("Details:", exc_info=1)
+            with cond:
+                self.nb_executed += 1
+                self._busy = False
+                cond.notify_all()
+
+
+class EventPusher(object):
+    """Pushes events asynchronously through a fixed number of lanes
+    (see :class:`EventLane`). Events of the same source (ex: device) always
+    go through the same lane so they are pushed in order"""
+
+    #: default number of lanes
+    NbLanes = 4
+
+    def __init__(self, nb_lanes=None, name="EventPush"):
+        if nb_lanes is None:
+            nb_lanes = self.NbLanes
+        self._lanes = [EventLane("%s-%d" % (name, i))
+                       for i in range(max(1, nb_lanes))]
+
+    def get_lane(self, source):
+        """Returns the lane for the given source name"""
+        lanes = self._lanes
+        return lanes[hash(source) % len(lanes)]
+
+    def push(self, source, key, coalesce, job, *args, **kwargs):
+        """Adds a push job in the lane of the given source (see
+        :meth:`EventLane.add`)"""
+        self.get_lane(source).add((source, key), coalesce, job, *args,
+                                  **kwargs)
+
+    def join(self):
+        """Waits until all the events added so far have been pushed"""
+        for lane in self._lanes:
+            lane.join()
+
+    def get_stats(self):
+        """Returns the statistics of each lane (see
+        :meth:`EventLane.get_stats`)
+
+        :return: list of dict
+        :rtype: list<dict>"""
+        return [lane.get_stats() for lane in self._lanes]
+
+
+__event_pusher_lock = threading.Lock()
+__event_pusher = None
+
+
+def get_event_pusher():
+    """Returns the global event pusher for the sardana tango devices
+
+    :return: the global event pusher
+    :rtype: :class:`EventPusher`"""
+    global __event_pusher
+    if __event_pusher is not None:
+        return __event_pusher
+    with __event_pusher_lock:
+        if __event_pusher is None:
+            __event_pusher = EventPusher()
+        return __event_pusher
@@ -0,0 +1,108 @@
+#!/usr/bin/env python
+
+##############################################################################
+##
+## This file is part of Sardana
+##
+## http://www.sardana-controls.org/
+##
+## Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+## Sardana is free software: you can redistribute it and/or modify
+## it under the terms of the GNU Lesser General Public License as published by
+## the Free Software Foundation, either version 3 of the License, or
+## (at your option) any later version.
+##
+## Sardana is distributed in the hope that it will be useful,
+## but WITHOUT ANY WARRANTY; without even the implied warranty of
+## MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+## GNU Lesser General Public License for more details.
+##
+## You should have received a copy of the GNU Lesser General Public License
+## along with Sardana.  If not, see <http://www.gnu.org/licenses/>.
+##
+##############################################################################
+
+import threading
+
+from taurus.external import unittest
+
+from sardana.tango.core.eventpusher import EventLane, EventPusher
+
+
+class EventLaneTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.lane = EventLane("TestLane")
+        self.pushed = []
+        # keep the lane busy until the test has queued its events
+        self.gate = threading.Event()
+        self.lane.add("gate", False, self.gate.wait)
+
+    def tearDown(self):
+        self.gate.set()
+        self.lane.stop()
+
+    def push(self, key, value):
+        self.pushed.append((key, value))
+
+    def test_coalesce(self):
+        lane, push = self.lane, self.push
+        position, state = ("motor/1", "position"), ("motor/1", "state")
+        for value in range(5):
+            lane.add(position, True, push, "position", value)
+        lane.add(state, False, push, "state", "On")
+        lane.add(position, True, push, "position", 10)
+        lane.add(position, False, push, "position", 11)
+        lane.add(position, True, push, "position", 12)
+        self.gate.set()
+        lane.join()
+        # the coalesced value keeps the position of the first pending one
+        # but values added after a priority event are pushed after it
+        self.assertEqual(self.pushed, [("position", 4), ("state", "On"),
+                                       ("position", 10), ("position", 11),
+                                       ("position", 12)])
+        stats = lane.get_stats()
+        self.assertEqual(stats['added'], 10)
+        self.assertEqual(stats['coalesced'], 4)
+        self.assertEqual(stats['executed'], 6)
+        self.assertEqual(stats['depth'], 0)
+        self.assertTrue(stats['max_depth'] >= 5)
+
+    def test_coalesce_other_source(self):
+        lane, push = self.lane, self.push
+        position = ("motor/1", "position")
+        lane.add(position, True, push, "position", 0)
+        # a priority event of another source does not stop the coalescing
+        lane.add(("motor/2", "state"), False, push, "state", "Moving")
+        lane.add(position, True, push, "position", 1)
+        self.gate.set()
+        lane.join()
+        self.assertEqual(self.pushed, [("position", 1), ("state", "Moving")])
+
+    def test_priority_order(self):
+        lane, push = self.lane, self.push
+        for value in range(5):
+            lane.add("position", False, push, "position", value)
+        self.gate.set()
+        lane.join()
+        self.assertEqual(self.pushed, [("position", v) for v in range(5)])
+
+
+class EventPusherTestCase(unittest.TestCase):
+
+    def test_source_order(self):
+        pusher = EventPusher(nb_lanes=3)
+        pushed = dict()
+
+        def push(source, value):
+            pushed.setdefault(source, []).append(value)
+
+        sources = ["motor/ctrl/%d" % i for i in range(6)]
+        for value in range(20):
+            for source in sources:
+                pusher.push(source, "position", False, push, source, value)
+        pusher.join()
+        for source in sources:
+            self.assertEqual(pushed[source], range(20))
+        self.assertEqual(len(pusher.get_stats()), 3)
@@ -0,0 +1,129 @@
+#!/usr/bin/env python
+
+##############################################################################
+##
+## This file is part of Sardana
+##
+## http://www.sardana-controls.org/
+##
+## Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+## Sardana is free software: you can redistribute it and/or modify
+## it under the terms of the GNU Lesser General Public License as published by
+## the Free Software Foundation, either version 3 of the License, or
+## (at your option) any later version.
+##
+## Sardana is distributed in the hope that it will be useful,
+## but WITHOUT ANY WARRANTY; without even the implied warranty of
+## MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+## GNU Lesser General Public License for more details.
+##
+## You should have received a copy of the GNU Lesser General Public License
+## along with Sardana.  If not, see <http://www.gnu.org/licenses/>.
+##
+##############################################################################
+
+import copy
+
+import PyTango
+from PyTango import Device_4Impl
+
+from taurus.external import unittest
+
+from sardana.tango.core.SardanaDevice import SardanaDevice
+
+try:
+    from PyTango.device_class import PropUtil
+except ImportError:
+    from PyTango.pyutil import PropUtil
+
+
+class FakePropertyCache(object):
+
+    def __init__(self, properties):
+        self.properties = properties
+
+    def get_device_property(self, dev_name, prop_names):
+        props = self.properties.get(dev_name, {})
+        return dict([(name, list(props.get(name, []))) for name in prop_names])
+
+
+class FakeDevice(object):
+
+    def __init__(self, name):
+        self.name = name
+
+    def get_name(self):
+        return self.name
+
+
+class FakeDeviceClass(object):
+
+    def __init__(self, prop_util):
+        self.prop_util = prop_util
+        self.class_property_list = {
+            'ClassDefault': [PyTango.DevString, "", ["from class"]],
+        }
+        self.device_property_list = {
+            'ClassDefault': [PyTango.DevString, "", ["from device class"]],
+            'Library': [PyTango.DevString, "", []],
+            'Number': [PyTango.DevLong, "", [5]],
+            'Flag': [PyTango.DevBoolean, "", [False]],
+            'Paths': [PyTango.DevVarStringArray, "", []],
+            'Empty': [PyTango.DevString, "", ["default"]],
+            'Missing': [PyTango.DevDouble, "", [1.5]],
+        }
+
+
+class SetDevicePropertiesTestCase(unittest.TestCase):
+    """Unittest of the device properties read from the startup property
+    cache"""
+
+    properties = {
+        "controller/dummy/1": {
+            'Library': ["DummyCtrl.py"],
+            'Number': ["12"],
+            'Flag': ["true"],
+            'Paths': ["/a", "/b"],
+            'Empty': [""],
+        },
+    }
+
+    def setUp(self):
+        self._use_db = getattr(PyTango.Util, "_UseDb", False)
+        PyTango.Util._UseDb = False
+        prop_util = PropUtil()
+        self.cache = FakePropertyCache(self.properties)
+        # the database used by the PyTango implementation
+        prop_util.db = self.cache
+        PyTango.Util._UseDb = True
+        self.ds_class = FakeDeviceClass(prop_util)
+
+    def test_same_as_tango(self):
+        """Verify the properties are the ones Device_4Impl reads from the
+        database"""
+        for dev_name in ("controller/dummy/1", "controller/dummy/2"):
+            expected = FakeDevice(dev_name)
+            Device_4Impl.get_device_properties.im_func(expected,
+                                                       self.ds_class)
+            device = FakeDevice(dev_name)
+            SardanaDevice._set_device_properties.im_func(device,
+                                                         self.ds_class,
+                                                         self.cache)
+            self.assertEqual(device.device_property_list,
+                             expected.device_property_list)
+            for name in self.ds_class.device_property_list:
+                self.assertEqual(getattr(device, name),
+                                 getattr(expected, name))
+
+    def test_class_unchanged(self):
+        """Verify the device class property lists are not modified"""
+        device_props = copy.deepcopy(self.ds_class.device_property_list)
+        SardanaDevice._set_device_properties.im_func(
+            FakeDevice("controller/dummy/1"), self.ds_class, self.cache)
+        self.assertEqual(self.ds_class.device_property_list, device_props)
+        self.assertTrue(self.ds_class.prop_util.db is self.cache)
+
+    def tearDown(self):
+        PyTango.Util._UseDb = self._use_db
+        unittest.TestCase.tearDown(self)
@@ -0,0 +1,141 @@
+#!/usr/bin/env python
+
+##############################################################################
+##
+## This file is part of Sardana
+##
+## http://www.sardana-controls.org/
+##
+## Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+## Sardana is free software: you can redistribute it and/or modify
+## it under the terms of the GNU Lesser General Public License as published by
+## the Free Software Foundation, either version 3 of the License, or
+## (at your option) any later version.
+##
+## Sardana is distributed in the hope that it will be useful,
+## but WITHOUT ANY WARRANTY; without even the implied warranty of
+## MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+## GNU Lesser General Public License for more details.
+##
+## You should have received a copy of the GNU Lesser General Public License
+## along with Sardana.  If not, see <http://www.gnu.org/licenses/>.
+##
+##############################################################################
+
+import PyTango
+
+from taurus.external import unittest
+
+from sardana.tango.core.util import DevicePropertyCache
+
+
+def _db_error():
+    PyTango.Except.throw_exception("DB_SQLError", "DbMySqlSelect refused",
+                                   "FakeDatabase.command_inout")
+
+
+class FakeDatabase(object):
+    """Database with the devices of a pool server. The aliases and
+    properties are given by rows as returned by the bulk query"""
+
+    Rows = [
+        ("Pool/demo/1", "pool_demo", "PoolPath", "/ctrls/a"),
+        ("Pool/demo/1", "pool_demo", "PoolPath", "/ctrls/b"),
+        ("Pool/demo/1", "pool_demo", "Version", "1.2"),
+        ("controller/dummy/1", None, "Description", None),
+        ("controller/dummy/1", None, "Library", "DummyCtrl.py"),
+        ("motor/dummy/1", "mot01", None, None),
+    ]
+
+    def __init__(self, bulk=True):
+        self.bulk = bulk
+        self.queries = []
+
+    def command_inout(self, cmd_name, query):
+        self.queries.append(query)
+        if not self.bulk:
+            _db_error()
+        flags, values = [], []
+        for row in self.Rows:
+            for value in row:
+                # a NULL is an empty string with a 0 flag
+                flags.append(int(value is not None))
+                values.append(value or "")
+        flags.extend((len(self.Rows), 4))
+        return flags, values
+
+    def _properties(self, dev_name):
+        props = {}
+        for name, _, prop_name, value in self.Rows:
+            if name == dev_name and prop_name is not None:
+                props.setdefault(prop_name, []).append(value or "")
+        return props
+
+    def get_device_class_list(self, server_name):
+        ret = []
+        for dev_name in sorted(set([row[0] for row in self.Rows])):
+            ret.extend((dev_name, "Class"))
+        return ret
+
+    def get_device_property_list(self, dev_name, wildcard):
+        return self._properties(dev_name).keys()
+
+    def get_device_property(self, dev_name, prop_names):
+        props = self._properties(dev_name)
+        return dict([(name, props.get(name, [])) for name in prop_names])
+
+    def get_alias(self, dev_name):
+        for name, alias, _, _ in self.Rows:
+            if name == dev_name and alias is not None:
+                return alias
+        _db_error()
+
+
+class DevicePropertyCacheTestCase(unittest.TestCase):
+    """Unittest of the bulk read of device properties"""
+
+    def _check(self, cache):
+        self.assertTrue(cache.has_device("pool/demo/1"))
+        self.assertTrue(cache.has_device("Motor/Dummy/1"))
+        self.assertFalse(cache.has_device("motor/dummy/2"))
+        self.assertEqual(cache.get_alias("pool/demo/1"), "pool_demo")
+        self.assertEqual(cache.get_alias("controller/dummy/1"), None)
+        self.assertEqual(cache.get_alias("motor/dummy/1"), "mot01")
+        props = cache.get_device_property("pool/demo/1",
+                                          ["poolpath", "Version", "Other"])
+        # multi-line values keep their order
+        self.assertEqual(list(props["poolpath"]), ["/ctrls/a", "/ctrls/b"])
+        self.assertEqual(list(props["Version"]), ["1.2"])
+        self.assertEqual(list(props["Other"]), [])
+        props = cache.get_device_property("controller/dummy/1",
+                                          ["Description", "Library"])
+        self.assertEqual(list(props["Description"]), [""])
+        self.assertEqual(list(props["Library"]), ["DummyCtrl.py"])
+        props = cache.get_device_property("motor/dummy/1", ["Offset"])
+        self.assertEqual(list(props["Offset"]), [])
+
+    def test_bulk(self):
+        """Verify the single query result (NULL flags, multi-line values
+        and devices without properties) is parsed"""
+        db = FakeDatabase()
+        cache = DevicePropertyCache()
+        cache.load(db, "Pool/demo")
+        self.assertEqual(len(db.queries), 1)
+        self.assertTrue("'Pool/demo'" in db.queries[0])
+        self._check(cache)
+
+    def test_per_device(self):
+        """Verify the devices are read one by one if the database refuses
+        the bulk query"""
+        db = FakeDatabase(bulk=False)
+        cache = DevicePropertyCache()
+        cache.load(db, "Pool/demo")
+        self.assertEqual(len(db.queries), 1)
+        self._check(cache)
+
+    def test_quote(self):
+        """Verify quotes in the server name are escaped"""
+        db = FakeDatabase()
+        DevicePropertyCache().load(db, "Pool/it's")
+        self.assertTrue("'Pool/it''s'" in db.queries[0])
@@ -38,6 +38,9 @@ __all__ = ["get_tango_version_str", "get_tango_version_number",
            "from_tango_state_to_state",
            "from_deviceattribute_value", "from_deviceattribute",
            "throw_sardana_exception",
+           "get_device_full_name",
+           "DevicePropertyCache", "get_startup_property_cache",
+           "load_startup_property_cache", "clear_startup_property_cache",
            "prepare_tango_logging", "prepare_rconsole", "run_tango_server",
            "run"]
 
@@ -57,6 +60,7 @@ from PyTango import Util, Database, WAttribute, DbDevInfo, DevFailed, \
 
 import taurus
 from taurus.core.util.log import Logger
+from taurus.core.util.containers import CaselessDict
 
 import sardana
 from sardana import State, SardanaServer, DataType, DataFormat, InvalidId, \
@@ -210,6 +214,122 @@ def clean_server_memorized(db, server_name, server_instance):
     for dev_name in dev_names:
         clean_device_memorized(db, dev_name)
 
+def get_device_full_name(db, dev_name):
+    """Returns the device full name in format
+    dbname:dbport/<domain>/<family>/<member>"""
+    if db.get_from_env_var():
+        db_name = PyTango.ApiUtil.get_env_var("TANGO_HOST")
+    else:
+        if db.is_dbase_used():
+            db_name = db.get_db_host() + ":" + db.get_db_port()
+        else:
+            db_name = db.get_file_name()
+    return db_name + "/" + dev_name
+
+
+class DevicePropertyCache(object):
+    """Device aliases and properties of all devices of a server read in bulk
+    from the Tango database. Used during the server startup to avoid one (or
+    more) database requests per device"""
+
+    #: single database query returning the aliases and properties of all
+    #: devices of a server (one row per property value line)
+    Query = "SELECT device.name, device.alias, property_device.name, " \
+            "property_device.value FROM device LEFT JOIN property_device ON " \
+            "property_device.device = device.name WHERE device.server = " \
+            "'%s' ORDER BY device.name, property_device.name, " \
+            "property_device.count"
+
+    def __init__(self):
+        # dict<str, CaselessDict<str, list<str>>>: device name -> properties
+        self._properties = CaselessDict()
+        self._aliases = CaselessDict()
+
+    def load(self, db, server_name):
+        """Reads the aliases and properties of all devices of the given server
+        (ex: 'Pool/demo1'). If the database does not support the bulk query,
+        the devices are read one by one"""
+        self._properties = CaselessDict()
+        self._aliases = CaselessDict()
+        try:
+            self._load_bulk(db, server_name)
+        except DevFailed:
+            self._properties = CaselessDict()
+            self._aliases = CaselessDict()
+            self._load_per_device(db, server_name)
+
+    def _load_bulk(self, db, server_name):
+        query = self.Query % server_name.replace("'", "''")
+        flags, values = db.command_inout("DbMySqlSelect", query)
+        nb_rows, nb_cols = flags[-2:]
+        if nb_rows and len(flags) == nb_rows * nb_cols + 2:
+            # a flag per value tells if the value is not NULL
+            values = [v if f else None for f, v in zip(flags, values)]
+        for i in range(0, nb_rows * nb_cols, nb_cols):
+            dev_name, alias, prop_name, prop_value = values[i:i + 4]
+            props = self._properties.get(dev_name)
+            if props is None:
+                self._properties[dev_name] = props = CaselessDict()
+                if alias:
+                    self._aliases[dev_name] = alias
+            if prop_name:
+                props.setdefault(prop_name, []).append(prop_value or "")
+
+    def _load_per_device(self, db, server_name):
+        dev_names = db.get_device_class_list(server_name)[::2]
+        for dev_name in dev_names:
+            prop_names = db.get_device_property_list(dev_name, "*")
+            props = CaselessDict()
+            if len(prop_names):
+                for name, value in db.get_device_property(dev_name,
+                                                          prop_names).items():
+                    props[name] = list(value)
+            self._properties[dev_name] = props
+            try:
+                self._aliases[dev_name] = db.get_alias(dev_name)
+            except DevFailed:
+                pass
+
+    def has_device(self, dev_name):
+        return dev_name in self._properties
+
+    def get_alias(self, dev_name):
+        """Returns the device alias or None if the device has no alias"""
+        return self._aliases.get(dev_name)
+
+    def get_device_property(self, dev_name, prop_names):
+        """Same as :meth:`PyTango.Database.get_device_property` with a
+        sequence of property names
+
+        :return: dict where key is the property name and value is the list of
+                 property value lines (empty if the property is not defined)
+        :rtype: dict<str, seq<str>>"""
+        props = self._properties.get(dev_name, {})
+        return dict([(name, props.get(name, [])) for name in prop_names])
+
+
+_STARTUP_PROPERTY_CACHE = None
+
+def get_startup_property_cache():
+    """Returns the device property cache loaded for the server startup or None
+    if there is no such cache"""
+    return _STARTUP_PROPERTY_CACHE
+
+def load_startup_property_cache(db, server_name):
+    """Reads in bulk the device aliases and properties of the given server to
+    be used while its devices are created"""
+    global _STARTUP_PROPERTY_CACHE
+    cache = DevicePropertyCache()
+    cache.load(db, server_name)
+    _STARTUP_PROPERTY_CACHE = cache
+    return cache
+
+def clear_startup_property_cache():
+    """Discards the startup device property cache (the devices will read the
+    database directly)"""
+    global _STARTUP_PROPERTY_CACHE
+    _STARTUP_PROPERTY_CACHE = None
+
 def __set_last_write_value(attribute, lrv):
     attribute._last_write_value = lrv
     return lrv
@@ -887,6 +1007,7 @@ def run_tango_server(tango_util=None, start_time=None):
         util = Util.instance()
         SardanaServer.server_state = State.Init
         util.server_init()
+        clear_startup_property_cache()
         SardanaServer.server_state = State.Running
         if start_time is not None:
             import datetime
@@ -41,10 +41,11 @@ from PyTango import READ_WRITE, READ
 from taurus.core.util.log import DebugIt
 from taurus.core.util.containers import CaselessDict
 
-from sardana import DataType, DataFormat
+from sardana import DataType, DataFormat, InvalidId
 from sardana import State, SardanaServer
 from sardana.sardanaattribute import SardanaAttribute
-from sardana.tango.core.util import to_tango_attr_info
+from sardana.tango.core.util import to_tango_attr_info, \
+    get_startup_property_cache, get_device_full_name
 
 from PoolDevice import PoolDevice, PoolDeviceClass
 
@@ -53,6 +54,57 @@ def to_bool(s):
     return s.lower() == "true"
 
 
+def get_role_ids(db_props):
+    """Returns the controller role ids from the given device properties (as
+    returned by :meth:`PyTango.Database.get_device_property`)"""
+    role_ids = db_props.get('motor_role_ids')
+    if not role_ids:
+        role_ids = db_props.get('counter_role_ids')
+        if not role_ids:
+            role_ids = db_props.get('Role_ids') or []
+    return map(int, role_ids)
+
+
+def get_ctrl_properties(pool, klass, db_props):
+    """Converts the given controller properties (as returned by
+    :meth:`PyTango.Database.get_device_property`) according to the controller
+    class property information
+
+    :return: the controller properties and the list of missing mandatory
+             properties
+    :rtype: tuple<dict, list<str>>"""
+    try:
+        ctrl_info = pool.get_controller_class_info(klass)
+        prop_infos = ctrl_info.ctrl_properties
+    except:
+        return {}, []
+
+    ret = {}
+    missing_props = []
+    for prop_name, prop_info in prop_infos.items():
+        prop_value = db_props.get(prop_name)
+        if not prop_value:
+            dv = prop_info.default_value
+            if dv is None:
+                missing_props.append(prop_name)
+            ret[prop_name] = dv
+            continue
+        dtype, dformat = prop_info.dtype, prop_info.dformat
+
+        op = str
+        if dtype == DataType.Integer:
+            op = int
+        elif dtype == DataType.Double:
+            op = float
+        elif dtype == DataType.Boolean:
+            op = to_bool
+        prop_value = map(op, prop_value)
+        if dformat == DataFormat.Scalar:
+            prop_value = prop_value[0]
+        ret[prop_name] = prop_value
+    return ret, missing_props
+
+
 class Controller(PoolDevice):
 
     def __init__(self, dclass, name):
@@ -82,14 +134,19 @@ class Controller(PoolDevice):
         self.set_change_events(detect_evts, non_detect_evts)
         ctrl = self.ctrl
         if ctrl is None:
-            role_ids = self.get_role_ids()
-            full_name = self.get_full_name()
-            name = self.alias or full_name
-            args = dict(type=self.Type, name=name, full_name=full_name,
-                        library=self.Library, klass=self.Klass,
-                        id=self.Id, role_ids=role_ids,
-                        properties=self._get_ctrl_properties())
-            ctrl = self.pool.create_controller(**args)
+            # controllers may have already been created at startup (see
+            # ControllerClass.device_factory)
+            ctrl = self.get_device_class().pop_startup_ctrl(self.get_name())
+            if ctrl is None:
+                properties = self._get_ctrl_properties()
+                role_ids = self.get_role_ids()
+                full_name = self.get_full_name()
+                name = self.alias or full_name
+                args = dict(type=self.Type, name=name, full_name=full_name,
+                            library=self.Library, klass=self.Klass,
+                            id=self.Id, role_ids=role_ids,
+                            properties=properties)
+                ctrl = self.pool.create_controller(**args)
             ctrl.add_listener(self.on_controller_changed)
             self.ctrl = ctrl
             self.set_state(DevState.ON)
@@ -102,56 +159,25 @@ class Controller(PoolDevice):
         db = Util.instance().get_database()
         if db is None:
             return []
-        role_ids = db.get_device_property(self.get_name(), ['motor_role_ids'])['motor_role_ids']
-        if len(role_ids) == 0:
-            role_ids = db.get_device_property(self.get_name(), ['counter_role_ids'])['counter_role_ids']
-            if len(role_ids) == 0:
-                role_ids = self.Role_ids
-        role_ids = map(int, role_ids)
-
-        return role_ids
+        db_props = self.get_db_device_property(['motor_role_ids',
+                                                'counter_role_ids'])
+        db_props['Role_ids'] = self.Role_ids
+        return get_role_ids(db_props)
 
     def _get_ctrl_properties(self):
+        db = Util.instance().get_database()
+        if db is None:
+            return {}
         try:
             ctrl_info = self.pool.get_controller_class_info(self.Klass)
-            prop_infos = ctrl_info.ctrl_properties
+            prop_names = ctrl_info.ctrl_properties.keys()
         except:
             return {}
-        db = Util.instance().get_database()
-
-        if db is None:
-            return {}
-
-        props = {}
-        if prop_infos:
-            props.update(db.get_device_property(self.get_name(), prop_infos.keys()))
-        for p in props.keys():
-            if len(props[p]) == 0: props[p] = None
-
-        ret = {}
-        missing_props = []
-        for prop_name, prop_value in props.items():
-            if prop_value is None:
-                dv = prop_infos[prop_name].default_value
-                if dv is None:
-                    missing_props.append(prop_name)
-                ret[prop_name] = dv
-                continue
-            prop_info = prop_infos[prop_name]
-            dtype, dformat = prop_info.dtype, prop_info.dformat
-
-            op = str
-            if dtype == DataType.Integer:
-                op = int
-            elif dtype == DataType.Double:
-                op = float
-            elif dtype == DataType.Boolean:
-                op = to_bool
-            prop_value = map(op, prop_value)
-            if dformat == DataFormat.Scalar:
-                prop_value = prop_value[0]
-            ret[prop_name] = prop_value
-
+        db_props = {}
+        if prop_names:
+            db_props = self.get_db_device_property(prop_names)
+        ret, missing_props = get_ctrl_properties(self.pool, self.Klass,
+                                                 db_props)
         if missing_props:
             self.set_state(DevState.ALARM)
             missing_props = ", ".join(missing_props)
@@ -286,6 +312,72 @@ class ControllerClass(PoolDeviceClass):
         }
     attr_list.update(PoolDeviceClass.attr_list)
 
+    def __init__(self, name):
+        PoolDeviceClass.__init__(self, name)
+        # dict<str, PoolController> controllers created at startup, not yet
+        # associated with their device
+        self._startup_ctrls = CaselessDict()
+
+    def pop_startup_ctrl(self, dev_name):
+        """Returns (and forgets) the controller created at startup for the
+        given device or None if the controller was not created at startup"""
+        return self._startup_ctrls.pop(dev_name, None)
+
+    def device_factory(self, device_list):
+        cache = get_startup_property_cache()
+        if cache is not None and SardanaServer.server_state == State.Init:
+            self._create_startup_ctrls(device_list, cache)
+        PoolDeviceClass.device_factory(self, device_list)
+
+    def _create_startup_ctrls(self, device_list, cache):
+        """Creates the controllers of the given devices (initializing them
+        concurrently) from the properties read in bulk at startup. Controllers
+        which fail to be created are created later on by their device."""
+        util = Util.instance()
+        db = util.get_database()
+        pool = util.get_device_list_by_class("Pool")[0].pool
+        profile = pool.startup_profile
+        dev_names, ctrls_kwargs = [], []
+        with profile.phase("Controller properties", count=len(device_list)):
+            for dev_name in device_list:
+                if not cache.has_device(dev_name):
+                    continue
+                try:
+                    db_props = CaselessDict(cache.get_device_property(
+                        dev_name, ('Type', 'Library', 'Klass', 'Id',
+                                   'Role_ids', 'motor_role_ids',
+                                   'counter_role_ids')))
+                    klass = db_props['Klass'][0]
+                    info = pool.get_controller_class_info(klass)
+                    prop_names = info.ctrl_properties.keys()
+                    db_props.update(cache.get_device_property(dev_name,
+                                                              prop_names))
+                    props, _ = get_ctrl_properties(pool, klass, db_props)
+                    eid = db_props['Id']
+                    eid = int(eid[0]) if eid else InvalidId
+                    full_name = get_device_full_name(db, dev_name)
+                    name = cache.get_alias(dev_name) or full_name
+                    kwargs = dict(type=db_props['Type'][0], name=name,
+                                  full_name=full_name,
+                                  library=db_props['Library'][0],
+                                  klass=klass, id=eid,
+                                  role_ids=get_role_ids(db_props),
+                                  properties=props)
+                except:
+                    pool.debug("Cannot prepare %s at startup", dev_name,
+                               exc_info=1)
+                    continue
+                dev_names.append(dev_name)
+                ctrls_kwargs.append(kwargs)
+
+        results = pool.create_controllers(ctrls_kwargs)
+        for dev_name, (ctrl, exc_info) in zip(dev_names, results):
+            if ctrl is None:
+                pool.debug("Cannot create %s at startup", dev_name,
+                           exc_info=exc_info)
+                continue
+            self._startup_ctrls[dev_name] = ctrl
+
     def _get_class_properties(self):
         ret = PoolDeviceClass._get_class_properties(self)
         ret['Description'] = "Controller device class"
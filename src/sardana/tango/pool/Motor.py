@@ -445,7 +445,10 @@ with this value is sent to clients using events.
         motor = self.motor
         use_cache = motor.is_in_operation() and not self.Force_HW_Read
         state = motor.get_state(cache=use_cache, propagate=0)
-        position = motor.get_position(cache=use_cache, propagate=0)
+        # read the position from a single snapshot so that value, write
+        # value and timestamp are consistent even if the motion updates it
+        position = motor.get_position(cache=use_cache,
+                                      propagate=0).get_snapshot()
         if position.error:
             Except.throw_python_exception(*position.exc_info)
         quality = None
@@ -44,7 +44,16 @@ from sardana import State, SardanaServer, ElementType, Interface, \
     TYPE_ACQUIRABLE_ELEMENTS, TYPE_PSEUDO_ELEMENTS
 from sardana.pool.pool import Pool as POOL
 from sardana.pool.poolmetacontroller import TYPE_MAP_OBJ
-from sardana.tango.core.util import get_tango_version_number
+from sardana.tango.core.util import get_tango_version_number, \
+    load_startup_property_cache
+
+#: element types listed in each <family>List attribute
+FAMILY_TYPES = {
+    "Motor": (ElementType.Motor, ElementType.PseudoMotor),
+    "ExpChannel": (ElementType.CTExpChannel, ElementType.ZeroDExpChannel,
+                   ElementType.OneDExpChannel, ElementType.TwoDExpChannel,
+                   ElementType.PseudoCounter),
+}
 
 
 class Pool(PyTango.Device_4Impl, Logger):
@@ -95,6 +104,11 @@ class Pool(PyTango.Device_4Impl, Logger):
         p.set_path(self.PoolPath)
         p.set_motion_loop_sleep_time(self.MotionLoop_SleepTime / 1000.0)
         p.set_motion_loop_states_per_position(self.MotionLoop_StatesPerPosition)
+        p.set_motion_loop_prediction(self.MotionLoop_Prediction)
+        p.set_motion_loop_stall_tolerance(self.MotionLoop_StallTolerance)
+        p.set_motion_parallel_start(self.MotionParallelStart)
+        p.set_ctrl_init_workers(self.ControllerInitWorkers)
+        p.set_ioregister_write_polling(self.IORegister_WritePolling)
         p.set_acq_loop_sleep_time(self.AcqLoop_SleepTime / 1000.0)
         p.set_acq_loop_states_per_value(self.AcqLoop_StatesPerValue)
         p.set_drift_correction(self.DriftCorrection)
@@ -170,14 +184,20 @@ class Pool(PyTango.Device_4Impl, Logger):
         info = self.pool.get_elements_str_info(ElementType.Instrument)
         attr.set_value(info)
 
+    def _get_family_str_info(self, family):
+        """Returns the value of the <family>List attribute"""
+        elem_types = FAMILY_TYPES.get(family)
+        if elem_types is None:
+            elem_types = [ elem_type for elem_type, td in TYPE_MAP_OBJ.items()
+                           if td.family == family ]
+        info = []
+        for elem_type in elem_types:
+            info.extend(self.pool.get_elements_str_info(elem_type))
+        return info
+
     #@DebugIt()
     def read_ExpChannelList(self, attr):
-        info = []
-        info.extend(self.pool.get_elements_str_info(ElementType.CTExpChannel))
-        info.extend(self.pool.get_elements_str_info(ElementType.ZeroDExpChannel))
-        info.extend(self.pool.get_elements_str_info(ElementType.OneDExpChannel))
-        info.extend(self.pool.get_elements_str_info(ElementType.TwoDExpChannel))
-        info.extend(self.pool.get_elements_str_info(ElementType.PseudoCounter))
+        info = self._get_family_str_info("ExpChannel")
         attr.set_value(info)
 
     #@DebugIt()
@@ -192,8 +212,7 @@ class Pool(PyTango.Device_4Impl, Logger):
 
     #@DebugIt()
     def read_MotorList(self, attr):
-        info = self.pool.get_elements_str_info(ElementType.Motor)
-        info.extend(self.pool.get_elements_str_info(ElementType.PseudoMotor))
+        info = self._get_family_str_info("Motor")
         attr.set_value(info)
 
     #@DebugIt()
@@ -230,6 +249,9 @@ class Pool(PyTango.Device_4Impl, Logger):
         return True
         return SardanaServer.server_state == State.Running
 
+    def read_StartupProfile(self, attr):
+        attr.set_value(json.dumps(self.pool.startup_profile.to_dict()))
+
     is_ControllerLibList_allowed = \
     is_ControllerClassList_allowed = \
     is_ControllerList_allowed = \
@@ -454,8 +476,17 @@ class Pool(PyTango.Device_4Impl, Logger):
     #@DebugIt()
     def CreateElement(self, argin):
         kwargs_seq = self._format_CreateElement_arguments(argin)
-        for kwargs in kwargs_seq:
-            self._create_single_element(kwargs)
+        if len(kwargs_seq) == 1:
+            self._create_single_element(kwargs_seq[0])
+            return
+        # notify clients about all new elements with a single event
+        pool = self.pool
+        pool.start_element_events_batch()
+        try:
+            for kwargs in kwargs_seq:
+                self._create_single_element(kwargs)
+        finally:
+            pool.end_element_events_batch()
 
     def RenameElement(self, argin):
         old_name = argin[0]
@@ -698,15 +729,7 @@ class Pool(PyTango.Device_4Impl, Logger):
 
         if evt_name in ("elementcreated", "elementdeleted", "elementchanged"):
             elem = evt_value
-            elem_type = elem.get_type()
-            td = TYPE_MAP_OBJ[elem_type]
-            attribute_list_name = td.family + "List"
-            info = self.pool.get_elements_str_info(elem_type)
-            self.push_change_event(attribute_list_name, info)
-
-            if elem_type in TYPE_ACQUIRABLE_ELEMENTS:
-                info = self.pool.get_acquisition_elements_str_info()
-                self.push_change_event('AcqChannelList', info)
+            self._push_element_lists((elem,))
 
             # force the element list cache to be rebuild next time someone reads
             # the element list
@@ -727,6 +750,8 @@ class Pool(PyTango.Device_4Impl, Logger):
             # force the element list cache to be rebuild next time someone reads
             # the element list
             self.ElementsCache = None
+            self._push_element_lists(evt_value['new'] + evt_value['change'] +
+                                     evt_value['del'])
             pool_name = self.pool.full_name
             new_values, changed_values, deleted_values = [], [], []
             for elem in evt_value['new']:
@@ -743,6 +768,25 @@ class Pool(PyTango.Device_4Impl, Logger):
             value = CodecFactory().getCodec('json').encode(('', value))
             self.push_change_event('Elements', *value)
 
+    def _push_element_lists(self, elems):
+        """Pushes a change event for each <family>List attribute affected by
+        the given elements (only once per attribute)"""
+        families, acquirable = set(), False
+        for elem in elems:
+            elem_type = elem.get_type()
+            td = TYPE_MAP_OBJ.get(elem_type)
+            if td is None:
+                # controller classes and libraries
+                continue
+            families.add(td.family)
+            acquirable = acquirable or elem_type in TYPE_ACQUIRABLE_ELEMENTS
+        for family in families:
+            info = self._get_family_str_info(family)
+            self.push_change_event(family + "List", info)
+        if acquirable:
+            info = self.pool.get_acquisition_elements_str_info()
+            self.push_change_event('AcqChannelList', info)
+
     def _format_create_json_arguments(self, argin):
         elems, ret = json.loads(argin[0]), []
         if operator.isMappingType(elems):
@@ -1300,6 +1344,35 @@ class PoolClass(PyTango.DeviceClass):
             "Number of State reads done before doing a position read in the "
             "motion loop [default: %d]" % POOL.Default_MotionLoop_StatesPerPosition,
             POOL.Default_MotionLoop_StatesPerPosition],
+        'MotionLoop_Prediction':
+            [PyTango.DevBoolean,
+            "Use the motion time predicted from the motor parameters to "
+            "avoid reading the state during the motion [default: %d]" %
+            POOL.Default_MotionLoop_Prediction,
+            POOL.Default_MotionLoop_Prediction],
+        'MotionLoop_StallTolerance':
+            [PyTango.DevDouble,
+            "Fraction of the predicted motion time a motor may overrun "
+            "before being reported as stalled. 0 disables the stall "
+            "detection [default: %s]" % POOL.Default_MotionLoop_StallTolerance,
+            POOL.Default_MotionLoop_StallTolerance],
+        'MotionParallelStart':
+            [PyTango.DevBoolean,
+            "Start the controllers involved in a motion concurrently "
+            "[default: %d]" % POOL.Default_MotionParallelStart,
+            POOL.Default_MotionParallelStart],
+        'ControllerInitWorkers':
+            [PyTango.DevLong,
+            "Maximum number of controllers initialized concurrently at "
+            "startup. 1 initializes them one by one "
+            "[default: %d]" % POOL.Default_ControllerInitWorkers,
+            POOL.Default_ControllerInitWorkers],
+        'IORegister_WritePolling':
+            [PyTango.DevBoolean,
+            "Write IORegisters asynchronously, polling their state until the "
+            "write finishes. Otherwise writes are synchronous "
+            "[default: %d]" % POOL.Default_IORegister_WritePolling,
+            POOL.Default_IORegister_WritePolling],
         'AcqLoop_SleepTime':
             [PyTango.DevLong,
             "Sleep time in the acquisition loop in mS [default: %dms]" %
@@ -1489,12 +1562,39 @@ class PoolClass(PyTango.DeviceClass):
                 'label':"Elements",
                 'description':"the list of all elements (a JSON encoded dict)",
             } ],
+        'StartupProfile':
+            [[PyTango.DevString,
+            PyTango.SCALAR,
+            PyTango.READ],
+            {
+                'label':"Startup profile",
+                'description':"time spent in each phase of the server "
+                              "startup (a JSON encoded dict)",
+                'Display level':PyTango.DispLevel.EXPERT,
+            } ],
         }
 
     def __init__(self, name):
         PyTango.DeviceClass.__init__(self, name)
         self.set_type(name)
 
+    def device_factory(self, device_list):
+        PyTango.DeviceClass.device_factory(self, device_list)
+        # the pool is created first: read in bulk the properties of all the
+        # other devices of the server (controllers, elements, groups...)
+        util = PyTango.Util.instance()
+        db = util.get_database()
+        if db is None or not device_list:
+            return
+        pool = util.get_device_list_by_class("Pool")[0].pool
+        with pool.startup_profile.phase("Database properties"):
+            try:
+                load_startup_property_cache(db, util.get_ds_name())
+            except:
+                pool.warning("Failed to read the server device properties "
+                             "in bulk")
+                pool.debug("Details:", exc_info=1)
+
     def _get_class_properties(self):
         return dict(ProjectTitle="Sardana", Description="Device Pool management class",
                     doc_url="http://sardana-controls.org/",
@@ -39,7 +39,9 @@ from PyTango import Util, DevVoid, DevLong64, DevBoolean, DevString, \
 
 from taurus.core.util.containers import CaselessDict
 
-from sardana import InvalidId, InvalidAxis, ElementType
+from sardana import InvalidId, InvalidAxis, ElementType, State, \
+    SardanaServer
+from sardana.sardanaevent import EventType
 from sardana.pool.poolmetacontroller import DataInfo
 from sardana.tango.core.SardanaDevice import SardanaDevice, SardanaDeviceClass
 from sardana.tango.core.util import GenericScalarAttr, GenericSpectrumAttr, \
@@ -552,6 +554,15 @@ class PoolDeviceClass(SardanaDeviceClass):
 
     standard_attr_list = {}
 
+    def device_factory(self, device_list):
+        if SardanaServer.server_state != State.Init or not device_list:
+            return SardanaDeviceClass.device_factory(self, device_list)
+        # during startup keep track of the time spent creating the devices
+        pool = Util.instance().get_device_list_by_class("Pool")[0].pool
+        phase = "%s devices" % self.get_name()
+        with pool.startup_profile.phase(phase, count=len(device_list)):
+            SardanaDeviceClass.device_factory(self, device_list)
+
     def _get_class_properties(self):
         ret = SardanaDeviceClass._get_class_properties(self)
         ret['Description'] = "Generic Pool device class"
@@ -614,6 +625,9 @@ class PoolElementDevice(PoolDevice):
             if instrument.get_type() != ElementType.Instrument:
                 raise Exception("%s is not an instrument" % name)
         self.element.instrument = instrument
+        # the instrument is part of the element serialization: let the pool
+        # discard its cached serialization and notify the element lists
+        self.pool.fire_event(EventType("ElementChanged"), self.element)
         db = Util.instance().get_database()
         db.put_device_property(self.get_name(), { "Instrument_id" : instrument.id })
 
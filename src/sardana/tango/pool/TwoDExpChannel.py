@@ -165,7 +165,7 @@ class TwoDExpChannel(PoolElementDevice):
     def read_Value(self, attr):
         twod = self.twod
         use_cache = twod.is_in_operation() and not self.Force_HW_Read
-        value = twod.get_value(cache=use_cache, propagate=0)
+        value = twod.get_value(cache=use_cache, propagate=0).get_snapshot()
         if value.error:
             Except.throw_python_exception(*value.exc_info)
         state = twod.get_state(cache=use_cache, propagate=0)
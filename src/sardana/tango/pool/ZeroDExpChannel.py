@@ -32,7 +32,7 @@ __docformat__ = 'restructuredtext'
 import time
 
 from PyTango import Except
-from PyTango import DevVoid, DevDouble, DevString
+from PyTango import DevVoid, DevDouble, DevString, DevLong
 from PyTango import DispLevel, DevState, AttrQuality
 from PyTango import READ, READ_WRITE, SCALAR, SPECTRUM
 
@@ -199,6 +199,15 @@ class ZeroDExpChannel(PoolElementDevice):
     def write_CumulationType(self, attr):
         self.zerod.set_cumulation_type(attr.get_write_value())
 
+    def read_SamplingPeriod(self, attr):
+        attr.set_value(self.zerod.get_sampling_period() or 0.0)
+
+    def write_SamplingPeriod(self, attr):
+        self.zerod.set_sampling_period(attr.get_write_value())
+
+    def read_NbSamples(self, attr):
+        attr.set_value(self.zerod.get_nb_samples())
+
     def _is_allowed(self, req_type):
         return PoolElementDevice._is_allowed(self, req_type)
 
@@ -207,6 +216,8 @@ class ZeroDExpChannel(PoolElementDevice):
     is_CumulationType_allowed = _is_allowed
     is_ValueBuffer_allowed = _is_allowed
     is_TimeBuffer_allowed = _is_allowed
+    is_SamplingPeriod_allowed = _is_allowed
+    is_NbSamples_allowed = _is_allowed
 
 
 _DFT_VALUE_INFO = ZeroDController.standard_axis_attributes['Value']
@@ -238,6 +249,20 @@ class ZeroDExpChannelClass(PoolElementDeviceClass):
                              { 'Memorized'     : "true",
                                'label'         : "Cumulation Type",
                                'Display level' : DispLevel.EXPERT } ],
+        'SamplingPeriod' : [ [ DevDouble, SCALAR, READ_WRITE ],
+                             { 'Memorized'     : "true",
+                               'label'         : "Sampling period",
+                               'unit'          : "s",
+                               'description'   : "period at which the channel "
+                                                 "is read during an "
+                                                 "acquisition (0 means the "
+                                                 "pool acquisition loop "
+                                                 "period)",
+                               'Display level' : DispLevel.EXPERT } ],
+        'NbSamples'      : [ [ DevLong, SCALAR, READ ],
+                             { 'label'         : "Nb. samples",
+                               'description'   : "number of samples "
+                                                 "integrated in the value" } ],
     }
     attr_list.update(PoolElementDeviceClass.attr_list)
 
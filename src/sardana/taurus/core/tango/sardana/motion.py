@@ -29,10 +29,23 @@ __all__ = ["Moveable", "MoveableSource", "Motion", "MotionGroup"]
 
 __docformat__ = 'restructuredtext'
 
+import sys
 import time
 
+from PyTango import DevState
+
 from taurus.core.util.containers import CaselessDict
 
+
+def get_motion_state(states):
+    """Returns the state of a motion from the state of its moveables"""
+    for state in (DevState.FAULT, DevState.ALARM, DevState.UNKNOWN,
+                  DevState.MOVING):
+        if state in states:
+            return state
+    return DevState.ON
+
+
 class Moveable:
     """ An item that can 'move'. In order to move it you need to provide a list
     of values (normally interpreted as motor positions).
@@ -48,6 +61,22 @@ class Moveable:
         the movement."""
         pass
 
+    def startMoveAsynch(self, new_pos, timeout=None):
+        """ startMoveAsynch(sequence<float> new_pos, double timeout=None) -> request
+
+        Sends the request to start the movement without waiting for the
+        movement to start. The returned request must be given to
+        :meth:`startMoveReply`. This allows starting several moveables
+        concurrently. The default implementation starts synchronously."""
+        return self.startMove(new_pos, timeout=timeout)
+
+    def startMoveReply(self, req, timeout=None):
+        """ startMoveReply(request req, double timeout=None) -> sequence<id>
+
+        Waits for the movement requested with :meth:`startMoveAsynch` to
+        start. Returns the same as :meth:`startMove`."""
+        return req
+
     def waitMove(self, timeout=None, id=None):
         """ waitMove(float timeout=None, sequence<id> id=None) -> None
         
@@ -79,6 +108,10 @@ class Moveable:
     def readPosition(self, force=False):
         pass
 
+    def getLastState(self):
+        """Returns the last known state without reading it (if possible)"""
+        pass
+
     def getMoveableSource(self):
         return None
 
@@ -128,6 +161,64 @@ class BaseMotion(Moveable):
             if moveable is not None:
                 return moveable
 
+    def _startMoveables(self, pos_list, timeout=None):
+        """Starts all moveables concurrently: all start requests are sent
+        before waiting for any of the movements to start. If a moveable fails
+        to start, the moveables already started are aborted and the (first)
+        error is raised.
+
+        :return: list of ids (one per moveable)"""
+        moveables = self.moveable_list
+        reqs, error = [], None
+        for moveable, pos in zip(moveables, pos_list):
+            try:
+                reqs.append(moveable.startMoveAsynch(pos, timeout=timeout))
+            except:
+                error = sys.exc_info()
+                break
+        ids = []
+        # collect all replies even if one of them fails
+        for moveable, req in zip(moveables, reqs):
+            try:
+                ids.append(moveable.startMoveReply(req, timeout=timeout))
+            except:
+                ids.append(None)
+                if error is None:
+                    error = sys.exc_info()
+        if error is not None:
+            self._abortMoveables(moveables[:len(reqs)])
+            raise error[0], error[1], error[2]
+        return ids
+
+    def _abortMoveables(self, moveables):
+        """Aborts the given moveables without waiting for them to stop.
+        Errors are ignored"""
+        for moveable in moveables:
+            try:
+                moveable.abort(wait_ready=False)
+            except:
+                pass
+
+    def _waitMoveables(self, timeout=None, id=None):
+        """Waits for all moveables to finish. The timeout applies to the
+        whole motion (not to each moveable)"""
+        moveables = self.moveable_list
+        if id is None:
+            id = len(moveables) * [None]
+        deadline = None
+        if timeout is not None:
+            deadline = time.time() + timeout
+        for moveable, moveable_id in zip(moveables, id):
+            if deadline is not None:
+                timeout = max(0, deadline - time.time())
+            moveable.waitMove(timeout=timeout, id=moveable_id)
+
+    def _getLastState(self):
+        """Returns the motion state from the last known state of each
+        moveable"""
+        states = [moveable.getLastState() for moveable in self.moveable_list]
+        return get_motion_state(states)
+
 
 class MotionGroup(BaseMotion):
     """ A virtual motion group object """
@@ -161,34 +252,24 @@ class MotionGroup(BaseMotion):
         if len(pos_list) != len(self.moveable_list):
             raise Exception("Invalid number of position values")
 
-        ids = []
-        for i, moveable in enumerate(self.moveable_list):
-            ids.append(moveable.startMove(pos_list[i], timeout=timeout))
-        return ids
+        return self._startMoveables(pos_list, timeout=timeout)
 
     def waitMove(self, timeout=None, id=None):
-        if id is None:
-            id = len(self.moveable_list) * [None]
-        for i, moveable in enumerate(self.moveable_list):
-            moveable.waitMove(timeout=timeout, id=id[i])
+        self._waitMoveables(timeout=timeout, id=id)
 
     def move(self, new_pos, timeout=None):
         start_time = time.time()
-        states, positions = [], []
-        for moveable, pos in zip(self.moveable_list, new_pos):
-            res = moveable.move(pos, timeout=timeout)
-            states.append(res[0])
-            positions.extend(res[1])
-        import PyTango
-        state = PyTango.DevState.ON
-        if PyTango.DevState.FAULT in states:
-            state = PyTango.DevState.FAULT
-        elif PyTango.DevState.ALARM in states:
-            state = PyTango.DevState.ALARM
-        elif PyTango.DevState.UNKNOWN in states:
-            state = PyTango.DevState.UNKNOWN
-        elif PyTango.DevState.MOVING in states:
-            state = PyTango.DevState.MOVING
+        if len(self.moveable_list) == 1:
+            state, positions = self.moveable_list[0].move(new_pos[0],
+                                                          timeout=timeout)
+        else:
+            ids = self.startMove(new_pos, timeout=timeout)
+            self.waitMove(timeout=timeout, id=ids)
+            # state and positions are already known from the events
+            state = self._getLastState()
+            positions = []
+            for moveable in self.moveable_list:
+                positions.extend(moveable.readPosition())
         self.__total_motion_time = time.time() - start_time
         return state, positions
 
@@ -355,16 +436,10 @@ class Motion(BaseMotion):
             pos = pos_list[i]
             buff[pair[0]][pair[1]] = pos
 
-        ids = []
-        for i, moveable in enumerate(self.moveable_list):
-            ids.append(moveable.startMove(buff[i], timeout=timeout))
-        return ids
+        return self._startMoveables(buff, timeout=timeout)
 
     def waitMove(self, timeout=None, id=None):
-        if id is None:
-            id = len(self.moveable_list) * [None]
-        for i, moveable in enumerate(self.moveable_list):
-            moveable.waitMove(timeout=timeout, id=id[i])
+        self._waitMoveables(timeout=timeout, id=id)
 
     def move(self, new_pos, timeout=None):
         start_time = time.time()
@@ -372,28 +447,12 @@ class Motion(BaseMotion):
             moveable = self.moveable_list[0]
             ret = moveable.move(new_pos, timeout=timeout)
         else:
-            start, ids = 0, []
-            for moveable in self.moveable_list:
-                end = start + moveable.getSize()
-                pos = new_pos[start:end]
-                id = moveable.startMove(pos, timeout=timeout)
-                ids.append(id)
-                start = end
-            for moveable, id in zip(self.moveable_list, ids):
-                moveable.waitMove(id=id, timeout=timeout)
-            states, positions = self.readState(), self.readPosition()
-            import PyTango
-            state = PyTango.DevState.ON
-            if PyTango.DevState.FAULT in states:
-                state = PyTango.DevState.FAULT
-            elif PyTango.DevState.ALARM in states:
-                state = PyTango.DevState.ALARM
-            elif PyTango.DevState.UNKNOWN in states:
-                state = PyTango.DevState.UNKNOWN
-            elif PyTango.DevState.MOVING in states:
-                state = PyTango.DevState.MOVING
-            ret = state, positions
-        self.__total_motion_time = time.time()
+            ids = self.startMove(new_pos, timeout=timeout)
+            self.waitMove(timeout=timeout, id=ids)
+            # state and positions are already known from the events: the
+            # (not forced) position read comes from the attribute cache
+            ret = self._getLastState(), self.readPosition()
+        self.__total_motion_time = time.time() - start_time
         return ret
 
     def iterMove(self, new_pos, timeout=None):
@@ -27,7 +27,7 @@
 
 __all__ = ["InterruptException", "StopException", "AbortException",
            "BaseElement", "ControllerClass", "ControllerLibrary",
-           "PoolElement", "Controller", "ComChannel", "ExpChannel",
+           "AttributeEventRecorder", "PoolElement", "Controller", "ComChannel", "ExpChannel",
            "CTExpChannel", "ZeroDExpChannel", "OneDExpChannel", "TwoDExpChannel",
            "PseudoCounter", "Motor", "PseudoMotor", "MotorGroup",
            "MeasurementGroup", "IORegister", "Instrument", "Pool",
@@ -36,12 +36,16 @@ __all__ = ["InterruptException", "StopException", "AbortException",
 __docformat__ = 'restructuredtext'
 
 import os
+import re
 import sys
 import time
 import copy
+import errno
 import weakref
 import operator
+import threading
 import traceback
+import collections
 
 from PyTango import DevState, AttrDataFormat, AttrQuality, DevFailed, \
     DeviceProxy
@@ -59,8 +63,7 @@ from taurus.core.util.log import Logger
 from taurus.core.util.singleton import Singleton
 from taurus.core.util.codecs import CodecFactory
 from taurus.core.util.containers import CaselessDict
-from taurus.core.util.event import EventGenerator, AttributeEventWait, \
-    AttributeEventIterator
+from taurus.core.util.event import EventGenerator, AttributeEventIterator
 from taurus.core.tango import TangoDevice, FROM_TANGO_TO_STR_TYPE
 
 from .sardana import BaseSardanaElementContainer, BaseSardanaElement
@@ -75,6 +78,10 @@ CHANGE_EVT_TYPES = TaurusEventType.Change, TaurusEventType.Periodic
 
 MOVEABLE_TYPES = 'Motor', 'PseudoMotor', 'MotorGroup'
 
+#: name of the motor groups created by :meth:`Pool.getMoveable`
+MS_MG_NAME = "_mg_ms_{0}_{1}"
+_MS_MG_RE = re.compile(r"^_mg_ms_(\d+)_\d+$", re.IGNORECASE)
+
 QUALITY = {
     AttrQuality.ATTR_VALID : 'VALID',
     AttrQuality.ATTR_INVALID : 'INVALID',
@@ -240,6 +247,150 @@ class TangoAttributeEG(Logger, EventGenerator):
         return getattr(self._attr, name)
 
 
+class AttributeEventRecorder(Logger):
+    """A long-lived listener of a (state) attribute which records the last
+    value transitions, together with the time they were received, in a ring.
+
+    Unlike :class:`~taurus.core.util.event.AttributeEventWait`, it does not
+    need to be connected and disconnected for each operation: the reception
+    time of the events is used to match the events with the operation which
+    caused them (see :meth:`waitEvent`)"""
+
+    #: default number of recorded transitions
+    RecordSize = 64
+
+    def __init__(self, attr, size=None):
+        if size is None:
+            size = self.RecordSize
+        self._attr = attr
+        self.call__init__(Logger, 'EventRecorder', attr)
+        self._cond = threading.Condition()
+        # deque<tuple<float, object>>: (reception time, value)
+        self._transitions = collections.deque(maxlen=size)
+        self._connected = False
+        self.connect()
+
+    def getAttribute(self):
+        return self._attr
+
+    def connect(self):
+        if self._connected:
+            return
+        self._connected = True
+        self._attr.addListener(self)
+
+    def disconnect(self):
+        if not self._connected:
+            return
+        self._connected = False
+        self._attr.removeListener(self)
+
+    def isConnected(self):
+        return self._connected
+
+    def eventReceived(self, evt_src, evt_type, evt_value):
+        """Event handler from Taurus"""
+        if evt_type not in CHANGE_EVT_TYPES or evt_value is None:
+            return
+        self.recordEvent(evt_value.value)
+
+    def recordEvent(self, value, timestamp=None):
+        """Records the given value if it is different from the last recorded
+        one and wakes up the threads waiting for events"""
+        if timestamp is None:
+            timestamp = time.time()
+        with self._cond:
+            transitions = self._transitions
+            if transitions and transitions[-1][1] == value:
+                return
+            transitions.append((timestamp, value))
+            self._cond.notify_all()
+
+    def getLastEvent(self):
+        """Returns the last recorded transition
+
+        :return: (reception time, value) or None if no event was received
+        :rtype: tuple<float, object>"""
+        with self._cond:
+            if self._transitions:
+                return self._transitions[-1]
+
+    def getTransitions(self):
+        """Returns the recorded transitions, oldest first
+
+        :return: list of (reception time, value)
+        :rtype: list<tuple<float, object>>"""
+        with self._cond:
+            return list(self._transitions)
+
+    def getRecordedEvents(self):
+        """Returns the last reception time of each of the recorded values
+
+        :return: dict where key is the value and value is the reception time
+        :rtype: dict"""
+        with self._cond:
+            return dict((v, t) for t, v in self._transitions)
+
+    def _findEvent(self, val, after, equal):
+        for t, v in reversed(self._transitions):
+            if t < after:
+                break
+            if (v == val) == equal:
+                return t
+
+    def findEvent(self, val, after=0, equal=True):
+        """Returns the reception time of the last transition to the given
+        value (if equal is True) or to a different value (if equal is False)
+        received at or after the given time or None if there is no such
+        transition"""
+        with self._cond:
+            return self._findEvent(val, after, equal)
+
+    def waitEvent(self, val, after=0, equal=True, timeout=None, retries=-1):
+        """Waits for a transition to the given value (if equal is True) or to
+        a different value (if equal is False) received at or after the given
+        time.
+
+        :param timeout: maximum time (s) to wait for the event on each try
+                        [default: None meaning wait forever]
+        :param retries: number of times to retry after a timeout [default:
+                        -1 meaning retry forever]
+        :return: the reception time of the event or None if it timed out
+        :rtype: float"""
+        # number of waits of timeout seconds left (negative means forever)
+        tries = retries + 1
+        with self._cond:
+            t = self._findEvent(val, after, equal)
+            while t is None:
+                if timeout is None:
+                    self._cond.wait()
+                    t = self._findEvent(val, after, equal)
+                    continue
+                deadline = time.time() + timeout
+                while t is None:
+                    remaining = deadline - time.time()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                    t = self._findEvent(val, after, equal)
+                tries -= 1
+                if tries == 0:
+                    break
+            return t
+
+    def waitValue(self, val, equal=True, timeout=None, retries=-1):
+        """Waits until the last recorded value is (if equal is True) or is
+        not (if equal is False) the given value. Returns immediately if it
+        already is.
+
+        :return: the reception time of the transition or None if it timed out
+        :rtype: float"""
+        last = self.getLastEvent()
+        after = 0 if last is None else last[0]
+        return self.waitEvent(val, after=after, equal=equal, timeout=timeout,
+                              retries=retries)
+
+
 def reservedOperation(fn):
     def new_fn(*args, **kwargs):
         self = args[0]
@@ -291,6 +442,9 @@ class PoolElement(BaseElement, TangoDevice):
         return pool.getElementInfo(self.getFullName())._data
 
     def cleanUp(self):
+        if self._evt_wait is not None:
+            self._evt_wait.disconnect()
+            self._evt_wait = None
         TangoDevice.cleanUp(self)
         self._reserved = None
         f = self.factory()
@@ -355,13 +509,16 @@ class PoolElement(BaseElement, TangoDevice):
 
     def _getEventWait(self):
         if self._evt_wait is None:
-            # create an object that waits for attribute events.
-            # each time we use it we have to connect and disconnect to an attribute
-            self._evt_wait = AttributeEventWait()
+            # create an object that records the state events. It stays
+            # subscribed for the whole life of the element so each operation
+            # does not need to subscribe and unsubscribe to the state
+            self._evt_wait = AttributeEventRecorder(self.getAttribute("state"))
         return self._evt_wait
 
     def _clearEventWait(self):
-        self._evt_wait = None
+        # the recorded transitions are matched by time so they do not need
+        # to be cleared
+        pass
 
     def getStateEG(self):
         return self._getAttrEG('state')
@@ -385,6 +542,14 @@ class PoolElement(BaseElement, TangoDevice):
     def waitReady(self, timeout=None):
         return self.getStateEG().waitEvent(Moving, equal=False, timeout=timeout)
 
+    def getLastState(self):
+        """Returns the last state received by event (no read is done unless
+        no state event was received yet)"""
+        last = self._getEventWait().getLastEvent()
+        if last is None:
+            return self.getStateEG().readValue()
+        return last[1]
+
     def getAttrEG(self, name):
         """Returns the TangoAttributeEG object"""
         return self._attrEG.get(name)
@@ -410,40 +575,72 @@ class PoolElement(BaseElement, TangoDevice):
         if not instr_name: return None
         return self.getPoolObj().getObj("Instrument", instr_name)
 
-    @reservedOperation
-    def start(self, *args, **kwargs):
-        evt_wait = self._getEventWait()
-        evt_wait.connect(self.getAttribute("state"))
-        evt_wait.lock()
+    def _startAsynch(self, *args, **kwargs):
+        """Sends the start request without waiting for its reply and returns
+        the request identifier (to be given to :meth:`_startReply`). The
+        default implementation starts synchronously and returns None"""
+        self._start(*args, **kwargs)
+
+    def _startPositionAsynch(self, *args, **kwargs):
+        """:meth:`_startAsynch` of the elements moved by writing their
+        position attribute (motors and pseudo motors)"""
+        new_pos = args[0]
+        if operator.isSequenceType(new_pos):
+            new_pos = new_pos[0]
+        req_id = self.write_attribute_asynch('position', new_pos)
+        self.final_pos = new_pos
+        return req_id
+
+    def _startReply(self, req_id):
+        """Waits for the reply of a start request sent by
+        :meth:`_startAsynch`"""
+        if req_id is None:
+            return
         try:
-            evt_wait.waitEvent(DevState.MOVING, equal=False)
-            self.__go_time = 0
-            self.__go_start_time = ts1 = time.time()
-            self._start(*args, **kwargs)
-            ts2 = time.time()
-            evt_wait.waitEvent(DevState.MOVING, after=ts1)
-        except:
-            evt_wait.disconnect()
+            self.write_attribute_reply(req_id)
+        except DevFailed, df:
+            for err in df:
+                if err.reason == 'API_AttrNotAllowed':
+                    raise RuntimeError('%s is already moving' % self)
             raise
-        finally:
-            evt_wait.unlock()
-        ts2 = evt_wait.getRecordedEvents().get(DevState.MOVING, ts2)
+
+    @reservedOperation
+    def startAsynch(self, *args, **kwargs):
+        """Sends the start request without waiting for the operation to
+        start. Allows starting several elements concurrently. The returned
+        request must be given to :meth:`startReply`"""
+        evt_wait = self._getEventWait()
+        # wait for the end of a previous operation
+        evt_wait.waitValue(DevState.MOVING, equal=False)
+        self.__go_time = 0
+        self.__go_start_time = ts1 = time.time()
+        return ts1, self._startAsynch(*args, **kwargs)
+
+    @reservedOperation
+    def startReply(self, req, timeout=None):
+        """Waits for the operation started with :meth:`startAsynch` to start.
+        Returns the operation id to be given to :meth:`waitFinish`"""
+        ts1, req_id = req
+        self._startReply(req_id)
+        ts2 = self._getEventWait().waitEvent(DevState.MOVING, after=ts1)
         return (ts2,)
 
+    def start(self, *args, **kwargs):
+        return self.startReply(self.startAsynch(*args, **kwargs))
+
     @reservedOperation
     def waitFinish(self, timeout=None, id=None):
         if id is not None:
             id = id[0]
+        else:
+            id = 0
         evt_wait = self._getEventWait()
-        evt_wait.lock()
         try:
             evt_wait.waitEvent(DevState.MOVING, after=id, equal=False,
-                               timeout=timeout)
+                               timeout=timeout, retries=0)
         finally:
             self.__go_end_time = time.time()
             self.__go_time = self.__go_end_time - self.__go_start_time
-            evt_wait.unlock()
-            evt_wait.disconnect()
 
     @reservedOperation
     def go(self, *args, **kwargs):
@@ -734,6 +931,8 @@ class Motor(PoolElement, Moveable):
                     raise
         self.final_pos = new_pos
 
+    _startAsynch = PoolElement._startPositionAsynch
+
     def go(self, *args, **kwargs):
         start_time = time.time()
         PoolElement.go(self, *args, **kwargs)
@@ -742,6 +941,8 @@ class Motor(PoolElement, Moveable):
         return ret
 
     startMove = PoolElement.start
+    startMoveAsynch = PoolElement.startAsynch
+    startMoveReply = PoolElement.startReply
     waitMove = PoolElement.waitFinish
     move = go
     getLastMotionTime = PoolElement.getLastGoTime
@@ -754,26 +955,19 @@ class Motor(PoolElement, Moveable):
         state, pos = self.getAttribute("state"), self.getAttribute("position")
 
         evt_wait = self._getEventWait()
-        evt_wait.connect(state)
-        evt_wait.lock()
+        time_stamp = time.time()
         try:
-            #evt_wait.waitEvent(DevState.MOVING, equal=False)
-            time_stamp = time.time()
-            try:
-                self.getPositionObj().write(new_pos)
-            except DevFailed, err_traceback:
-                for err in err_traceback:
-                    if err.reason == 'API_AttrNotAllowed':
-                        raise RuntimeError, '%s is already moving' % self
-                    else:
-                        raise
-            self.final_pos = new_pos
-            # putting timeout=0.1 and retries=1 is a patch for the case the when the initial
-            # moving event doesn't arrive do to an unknow tango/pytango error at the time
-            evt_wait.waitEvent(DevState.MOVING, time_stamp, timeout=0.1, retries=1)
-        finally:
-            evt_wait.unlock()
-            evt_wait.disconnect()
+            self.getPositionObj().write(new_pos)
+        except DevFailed, err_traceback:
+            for err in err_traceback:
+                if err.reason == 'API_AttrNotAllowed':
+                    raise RuntimeError, '%s is already moving' % self
+                else:
+                    raise
+        self.final_pos = new_pos
+        # putting timeout=0.1 and retries=1 is a patch for the case the when the initial
+        # moving event doesn't arrive do to an unknow tango/pytango error at the time
+        evt_wait.waitEvent(DevState.MOVING, time_stamp, timeout=0.1, retries=1)
 
         evt_iter_wait = AttributeEventIterator(state, pos)
         evt_iter_wait.lock()
@@ -863,6 +1057,8 @@ class PseudoMotor(PoolElement, Moveable):
                     raise
         self.final_pos = new_pos
 
+    _startAsynch = PoolElement._startPositionAsynch
+
     def go(self, *args, **kwargs):
         start_time = time.time()
         PoolElement.go(self, *args, **kwargs)
@@ -871,6 +1067,8 @@ class PseudoMotor(PoolElement, Moveable):
         return ret
 
     startMove = PoolElement.start
+    startMoveAsynch = PoolElement.startAsynch
+    startMoveReply = PoolElement.startReply
     waitMove = PoolElement.waitFinish
     move = go
     getLastMotionTime = PoolElement.getLastGoTime
@@ -954,6 +1152,12 @@ class MotorGroup(PoolElement, Moveable):
                     raise
         self.final_pos = new_pos
 
+    def _startAsynch(self, *args, **kwargs):
+        new_pos = args[0]
+        req_id = self.write_attribute_asynch('position', new_pos)
+        self.final_pos = new_pos
+        return req_id
+
     def go(self, *args, **kwargs):
         start_time = time.time()
         PoolElement.go(self, *args, **kwargs)
@@ -962,6 +1166,8 @@ class MotorGroup(PoolElement, Moveable):
         return ret
 
     startMove = PoolElement.start
+    startMoveAsynch = PoolElement.startAsynch
+    startMoveReply = PoolElement.startReply
     waitMove = PoolElement.waitFinish
     move = go
     getLastMotionTime = PoolElement.getLastGoTime
@@ -1643,6 +1849,14 @@ class Instrument(BaseElement):
         return self._pool_obj
 
 
+def _pid_exists(pid):
+    try:
+        os.kill(pid, 0)
+    except OSError, e:
+        return e.errno == errno.EPERM
+    return True
+
+
 class Pool(TangoDevice, MoveableSource):
     """ Class encapsulating device Pool functionality."""
 
@@ -1651,6 +1865,10 @@ class Pool(TangoDevice, MoveableSource):
         self.call__init__(MoveableSource)
 
         self._elements = BaseSardanaElementContainer()
+        # dict<tuple<str>, motor group> key is the sequence of (lower case)
+        # element names
+        self._mg_index = None
+        self._mg_lock = threading.RLock()
         self.getAttribute("Elements").addListener(self.on_elements_changed)
 
     def getObject(self, element_info):
@@ -1706,6 +1924,7 @@ class Pool(TangoDevice, MoveableSource):
         for element_data in elems.get('change', ()):
             element = self._removeElement(element_data)
             element = self._addElement(element_data)
+        self._mg_index = None
         return elems
 
     def _addElement(self, element_data):
@@ -1781,40 +2000,69 @@ class Pool(TangoDevice, MoveableSource):
             name = names[0]
             return self.getObj(name, elem_type=MOVEABLE_TYPES)
 
-        # find a motor group that contains elements
-        moveable = self.__findMotorGroupWithElems(names)
-
-        # if none exists create one
-        if moveable is None:
-            mgs = self.getElementsOfType('MotorGroup')
-            i = 1
-            pid = os.getpid()
-            while True:
-                name = "_mg_ms_{0}_{1}".format(pid, i)
-                exists = False
-                for mg in mgs.values():
-                    if mg.name == name:
-                        exists = True
-                        break
-                if not exists:
-                    break
-                i += 1
-            moveable = self.createMotorGroup(name, names)
+        # the motion and the motor group send the positions in the order of
+        # the motor group elements so only a motor group with the same
+        # elements in the same order can be used
+        key = tuple([name.lower() for name in names])
+        with self._mg_lock:
+            # find a motor group that contains elements
+            index = self.__getMotorGroupIndex()
+            moveable = index.get(key)
+
+            # if none exists create one
+            if moveable is None:
+                moveable = self.__createMotorGroupWithElems(names)
+                if moveable is not None:
+                    index[key] = moveable
         return moveable
 
-    def __findMotorGroupWithElems(self, names):
-        names_lower = map(str.lower, names)
-        len_names = len(names)
-        mgs = self.getElementsOfType('MotorGroup')
-        for mg in mgs.values():
-            mg_elems = mg.elements
-            if len(mg_elems) != len_names:
+    def __getMotorGroupIndex(self):
+        index = self._mg_index
+        if index is None:
+            index = {}
+            for mg in self.getElementsOfType('MotorGroup').values():
+                mg_key = tuple([elem.lower() for elem in mg.elements])
+                index.setdefault(mg_key, mg)
+            self._mg_index = index
+        return index
+
+    def __createMotorGroupWithElems(self, names):
+        mg_names = set([name.lower() for name in
+                        self.getElementNamesOfType('MotorGroup')])
+        i = 1
+        pid = os.getpid()
+        while True:
+            name = MS_MG_NAME.format(pid, i)
+            if name not in mg_names:
+                break
+            i += 1
+        return self.createMotorGroup(name, names)
+
+    def cleanupMotorGroups(self):
+        """Deletes the motor groups created by :meth:`getMoveable` of
+        processes which do not exist anymore. Process existence is checked on
+        the local host so this should only be used when all the macro servers
+        using this pool run on the same host.
+
+        :return: the names of the deleted motor groups
+        :rtype: seq<str>"""
+        pid = os.getpid()
+        deleted = []
+        for name in self.getElementNamesOfType('MotorGroup'):
+            match = _MS_MG_RE.match(name)
+            if match is None:
                 continue
-            for mg_elem, name in zip(mg_elems, names_lower):
-                if mg_elem.lower() != name:
-                    break
-            else:
-                return mg
+            mg_pid = int(match.group(1))
+            if mg_pid == pid or _pid_exists(mg_pid):
+                continue
+            try:
+                self.deleteElement(name)
+            except:
+                self.warning("Failed to delete stale motor group %s", name)
+                self.debug("Details:", exc_info=1)
+                continue
+            deleted.append(name)
+        return deleted
 
     #
     # End of MoveableSource interface
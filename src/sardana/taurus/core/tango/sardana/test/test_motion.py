@@ -0,0 +1,129 @@
+#!/usr/bin/env python
+
+##############################################################################
+##
+## This file is part of Sardana
+##
+## http://www.sardana-controls.org/
+##
+## Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+## Sardana is free software: you can redistribute it and/or modify
+## it under the terms of the GNU Lesser General Public License as published by
+## the Free Software Foundation, either version 3 of the License, or
+## (at your option) any later version.
+##
+## Sardana is distributed in the hope that it will be useful,
+## but WITHOUT ANY WARRANTY; without even the implied warranty of
+## MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+## GNU Lesser General Public License for more details.
+##
+## You should have received a copy of the GNU Lesser General Public License
+## along with Sardana.  If not, see <http://www.gnu.org/licenses/>.
+##
+##############################################################################
+
+"""Module with tests for the client motion objects."""
+
+import time
+
+from taurus.external import unittest
+
+from sardana.taurus.core.tango.sardana.motion import Moveable, MotionGroup
+
+
+class FakeMoveable(Moveable):
+
+    def __init__(self, name, log, start_error=None, reply_error=None,
+                 move_time=0.0):
+        self.name = name
+        self.log = log
+        self.start_error = start_error
+        self.reply_error = reply_error
+        self.move_time = move_time
+        self.timeouts = []
+
+    def startMoveAsynch(self, new_pos, timeout=None):
+        if self.start_error is not None:
+            raise self.start_error
+        self.log.append(("send", self.name))
+        return self.name, new_pos
+
+    def startMoveReply(self, req, timeout=None):
+        self.log.append(("reply", self.name))
+        if self.reply_error is not None:
+            raise self.reply_error
+        return req
+
+    def waitMove(self, timeout=None, id=None):
+        self.timeouts.append(timeout)
+        time.sleep(self.move_time)
+
+    def abort(self, wait_ready=True, timeout=None):
+        self.log.append(("abort", self.name))
+
+
+class MotionGroupStartTestCase(unittest.TestCase):
+    """Unittest of the concurrent start of the moveables of a motion"""
+
+    def setUp(self):
+        self.log = []
+
+    def _motion(self, nb, **kwargs):
+        """Returns a motion of nb moveables (m0, m1...). The keyword
+        arguments are the extra FakeMoveable arguments of each moveable"""
+        moveables = [FakeMoveable("m%d" % i, self.log,
+                                  **kwargs.get("m%d" % i, {}))
+                     for i in range(nb)]
+        return MotionGroup(moveables, []), moveables
+
+    def test_concurrent_start(self):
+        """Verify all start requests are sent before waiting for any
+        movement to start"""
+        motion, _ = self._motion(3)
+        ids = motion.startMove([1.0, 2.0, 3.0])
+        self.assertEqual(ids, [("m0", 1.0), ("m1", 2.0), ("m2", 3.0)])
+        self.assertEqual(self.log, [("send", "m0"), ("send", "m1"),
+                                    ("send", "m2"), ("reply", "m0"),
+                                    ("reply", "m1"), ("reply", "m2")])
+
+    def test_start_error(self):
+        """Verify the moveables already started are aborted when a start
+        request fails and the error is raised"""
+        motion, _ = self._motion(4, m2=dict(start_error=ValueError("m2")))
+        self.assertRaises(ValueError, motion.startMove, [1.0] * 4)
+        self.assertEqual(self.log, [("send", "m0"), ("send", "m1"),
+                                    ("reply", "m0"), ("reply", "m1"),
+                                    ("abort", "m0"), ("abort", "m1")])
+
+    def test_reply_error(self):
+        """Verify all replies are collected before aborting the started
+        moveables and raising the first error"""
+        motion, _ = self._motion(3, m0=dict(reply_error=KeyError("m0")),
+                                 m1=dict(reply_error=ValueError("m1")))
+        self.assertRaises(KeyError, motion.startMove, [1.0] * 3)
+        self.assertEqual(self.log, [("send", "m0"), ("send", "m1"),
+                                    ("send", "m2"), ("reply", "m0"),
+                                    ("reply", "m1"), ("reply", "m2"),
+                                    ("abort", "m0"), ("abort", "m1"),
+                                    ("abort", "m2")])
+
+    def test_single_deadline(self):
+        """Verify the wait timeout applies to the whole motion"""
+        motion, moveables = self._motion(3)
+        for moveable in moveables:
+            moveable.move_time = 0.05
+        motion.waitMove(timeout=10.0)
+        timeouts = [moveable.timeouts[0] for moveable in moveables]
+        self.assertTrue(timeouts[0] <= 10.0)
+        self.assertTrue(timeouts[0] >= timeouts[1] >= timeouts[2])
+        self.assertTrue(timeouts[0] - timeouts[2] >= 0.1)
+        # once the deadline is reached the moveables are not waited for
+        motion.waitMove(timeout=0.05)
+        self.assertEqual(moveables[2].timeouts[1], 0)
+
+    def test_no_timeout(self):
+        """Verify the moveables are waited without timeout by default"""
+        motion, moveables = self._motion(2)
+        motion.waitMove(id=["id0", "id1"])
+        self.assertEqual([m.timeouts for m in moveables], [[None], [None]])
@@ -0,0 +1,151 @@
+#!/usr/bin/env python
+
+##############################################################################
+##
+## This file is part of Sardana
+##
+## http://www.sardana-controls.org/
+##
+## Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+## Sardana is free software: you can redistribute it and/or modify
+## it under the terms of the GNU Lesser General Public License as published by
+## the Free Software Foundation, either version 3 of the License, or
+## (at your option) any later version.
+##
+## Sardana is distributed in the hope that it will be useful,
+## but WITHOUT ANY WARRANTY; without even the implied warranty of
+## MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+## GNU Lesser General Public License for more details.
+##
+## You should have received a copy of the GNU Lesser General Public License
+## along with Sardana.  If not, see <http://www.gnu.org/licenses/>.
+##
+##############################################################################
+"""Module with tests for the pool element client utils."""
+
+import time
+import threading
+
+from taurus.external import unittest
+from taurus.core.taurusbasetypes import TaurusEventType
+
+from sardana.taurus.core.tango.sardana.pool import AttributeEventRecorder, \
+    Pool
+
+ON, MOVING = "ON", "MOVING"
+
+
+class FakeValue(object):
+
+    def __init__(self, value):
+        self.value = value
+
+
+class FakeAttribute(object):
+
+    def __init__(self):
+        self.listeners = []
+
+    def addListener(self, listener):
+        self.listeners.append(listener)
+
+    def removeListener(self, listener):
+        self.listeners.remove(listener)
+
+    def fire(self, value):
+        for listener in self.listeners:
+            listener.eventReceived(self, TaurusEventType.Change,
+                                   FakeValue(value))
+
+
+class AttributeEventRecorderTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.attr = FakeAttribute()
+        self.recorder = AttributeEventRecorder(self.attr, size=4)
+        self.attr.fire(ON)
+
+    def test_transitions(self):
+        recorder, attr = self.recorder, self.attr
+        self.assertEqual(attr.listeners, [recorder])
+        # repeated values are not transitions
+        attr.fire(ON)
+        attr.fire(MOVING)
+        attr.fire(MOVING)
+        attr.fire(ON)
+        self.assertEqual([v for _, v in recorder.getTransitions()],
+                         [ON, MOVING, ON])
+        for _ in range(3):
+            attr.fire(MOVING)
+            attr.fire(ON)
+        self.assertEqual(len(recorder.getTransitions()), 4)
+        self.assertEqual(recorder.getLastEvent()[1], ON)
+        recorder.disconnect()
+        self.assertEqual(attr.listeners, [])
+
+    def test_wait(self):
+        recorder, attr = self.recorder, self.attr
+        self.assertIsNotNone(recorder.waitValue(MOVING, equal=False))
+        start = time.time()
+        self.assertIsNone(recorder.waitEvent(MOVING, after=start,
+                                             timeout=0.01, retries=1))
+
+        def move():
+            attr.fire(MOVING)
+            time.sleep(0.05)
+            attr.fire(ON)
+        threading.Thread(target=move).start()
+        moving = recorder.waitEvent(MOVING, after=start)
+        self.assertTrue(moving >= start)
+        stopped = recorder.waitEvent(MOVING, after=moving, equal=False)
+        self.assertTrue(stopped >= moving)
+        self.assertEqual(recorder.getRecordedEvents()[ON], stopped)
+
+
+class FakeMotorGroup(object):
+
+    def __init__(self, name, elements):
+        self.name = name
+        self.elements = list(elements)
+
+
+class PoolGetMoveableTestCase(unittest.TestCase):
+    """Verify the motor groups used by Pool.getMoveable keep the order of
+    the given moveables"""
+
+    def setUp(self):
+        self.mgs = {}
+        pool = Pool.__new__(Pool)
+        pool._mg_index = None
+        pool._mg_lock = threading.RLock()
+        pool.getElementsOfType = lambda elem_type: dict(self.mgs)
+        pool.getElementNamesOfType = lambda elem_type: self.mgs.keys()
+        pool.createMotorGroup = self.createMotorGroup
+        self.pool = pool
+
+    def createMotorGroup(self, name, elements):
+        self.mgs[name] = mg = FakeMotorGroup(name, elements)
+        return mg
+
+    def test_reuse(self):
+        pool = self.pool
+        mg = pool.getMoveable(["mot01", "mot02"])
+        self.assertEqual(mg.elements, ["mot01", "mot02"])
+        self.assertIs(pool.getMoveable(["MOT01", "mot02"]), mg)
+        self.assertEqual(len(self.mgs), 1)
+
+    def test_reversed_names(self):
+        pool = self.pool
+        mg = pool.getMoveable(["mot01", "mot02"])
+        reversed_mg = pool.getMoveable(["mot02", "mot01"])
+        self.assertIsNot(reversed_mg, mg)
+        self.assertEqual(reversed_mg.elements, ["mot02", "mot01"])
+
+    def test_existing_motor_group(self):
+        existing = self.createMotorGroup("mg1", ["mot02", "mot01"])
+        pool = self.pool
+        self.assertIs(pool.getMoveable(["mot02", "mot01"]), existing)
+        mg = pool.getMoveable(["mot01", "mot02"])
+        self.assertIsNot(mg, existing)
+        self.assertEqual(mg.elements, ["mot01", "mot02"])
@@ -0,0 +1,93 @@
+#!/usr/bin/env python
+
+##############################################################################
+##
+## This file is part of Sardana
+##
+## http://www.sardana-controls.org/
+##
+## Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+## Sardana is free software: you can redistribute it and/or modify
+## it under the terms of the GNU Lesser General Public License as published by
+## the Free Software Foundation, either version 3 of the License, or
+## (at your option) any later version.
+##
+## Sardana is distributed in the hope that it will be useful,
+## but WITHOUT ANY WARRANTY; without even the implied warranty of
+## MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+## GNU Lesser General Public License for more details.
+##
+## You should have received a copy of the GNU Lesser General Public License
+## along with Sardana.  If not, see <http://www.gnu.org/licenses/>.
+##
+##############################################################################
+
+"""Unit tests for sardanaattribute module"""
+
+import threading
+
+from taurus.external import unittest
+from sardana.sardanaattribute import SardanaAttribute
+
+
+class Owner(object):
+
+    name = "owner"
+
+
+class SardanaAttributeSnapshotTestCase(unittest.TestCase):
+    """Verify the snapshots published by SardanaAttribute"""
+
+    def setUp(self):
+        self.owner = Owner()
+        self.attr = SardanaAttribute(self.owner, name="value")
+
+    def test_empty(self):
+        """A new attribute publishes a snapshot without values"""
+        snapshot = self.attr.get_snapshot()
+        self.assertFalse(snapshot.has_value())
+        self.assertFalse(snapshot.has_write_value())
+        self.assertIsNone(snapshot.value)
+        self.assertFalse(snapshot.error)
+
+    def test_publish(self):
+        """Setting the read and write values publishes a new snapshot while
+        the previous ones remain unchanged"""
+        attr = self.attr
+        attr.set_value(1.0, timestamp=10.0, propagate=0)
+        first = attr.snapshot
+        attr.set_write_value(2.0, timestamp=11.0, propagate=0)
+        second = attr.snapshot
+        attr.set_value(3.0, exc_info=(Exception, Exception("x"), None),
+                       timestamp=12.0, propagate=0)
+        third = attr.snapshot
+        self.assertEqual((first.value, first.timestamp), (1.0, 10.0))
+        self.assertIsNone(first.w_value)
+        self.assertEqual((second.value, second.w_value, second.w_timestamp),
+                         (1.0, 2.0, 11.0))
+        self.assertTrue(third.error)
+        self.assertEqual(third.w_value, 2.0)
+
+    def test_consistency(self):
+        """Concurrent readers always see a value with its own timestamp"""
+        attr = self.attr
+        attr.set_value(0.0, timestamp=0.0, propagate=0)
+        stop = threading.Event()
+        torn = []
+
+        def read():
+            while not stop.is_set():
+                snapshot = attr.get_snapshot()
+                if snapshot.value != snapshot.timestamp:
+                    torn.append(snapshot)
+
+        readers = [threading.Thread(target=read) for _ in range(2)]
+        for reader in readers:
+            reader.start()
+        for i in range(1, 20000):
+            attr.set_value(float(i), timestamp=float(i), propagate=0)
+        stop.set()
+        for reader in readers:
+            reader.join()
+        self.assertEqual(torn, [])
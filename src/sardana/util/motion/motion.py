@@ -25,13 +25,16 @@
 
 """This module contains the definition for a simulated motor"""
 
-__all__ = ["MotionPath", "Motion", "BaseMotor", "Motor", "DemoMotor"]
+__all__ = ["MotionPath", "Motion", "BaseMotor", "Motor", "DemoMotor",
+           "get_motion_durations"]
 
 __docformat__ = 'restructuredtext'
 
 import time
 from math import pow, sqrt
 
+import numpy
+
 
 class MotionPath(object):
     """Active motion path description"""
@@ -263,6 +266,44 @@ class MotionPath(object):
         print "For long movements (where top vel is possible), necessary displacement to stop from maximum velocity =", self.displacement_reach_min_vel
 
 
+def get_motion_durations(motor, displacements):
+    """Returns the time each of the given displacements takes. It is the
+    vectorized equivalent of :attr:`MotionPath.duration`: a trapezoidal
+    velocity profile for the displacements long enough to reach the maximum
+    velocity and a triangular one for the others.
+
+    :param motor: the motor
+    :type motor: :class:`BaseMotor`
+    :param displacements: displacements (user units; the sign is ignored)
+    :type displacements: seq<float> or numpy.ndarray
+    :return: the duration (s) of each displacement
+    :rtype: numpy.ndarray"""
+    displacements = numpy.abs(numpy.asarray(displacements, dtype='d'))
+    displacements = displacements * motor.step_per_unit
+    durations = numpy.zeros_like(displacements)
+    min_vel, max_vel = motor.min_vel, motor.max_vel
+    if max_vel == float('inf'):
+        return durations
+    # inverse of the acceleration and deceleration (0 means instantaneous)
+    inv_accel = 0.0 if abs(motor.accel) == float('inf') else 1.0 / abs(motor.accel)
+    inv_decel = 0.0 if abs(motor.decel) == float('inf') else 1.0 / abs(motor.decel)
+    inv_accels = inv_accel + inv_decel
+    reach_displacement = motor.displacement_reach_max_vel + \
+        motor.displacement_reach_min_vel
+    moving = displacements > 0
+    small = moving & (displacements < reach_displacement)
+    large = moving & ~small
+    # time to accelerate + time to decelerate + time at maximum velocity
+    durations[large] = (max_vel - min_vel) * inv_accels + \
+        (displacements[large] - reach_displacement) / max_vel
+    if inv_accels > 0:
+        # the maximum velocity reached is lower than the motor maximum
+        top_vel = numpy.sqrt(min_vel ** 2 +
+                             2 * displacements[small] / inv_accels)
+        durations[small] = (top_vel - min_vel) * inv_accels
+    return durations
+
+
 class Motion(object):
     """Active motion description"""
 
@@ -0,0 +1,270 @@
+#!/usr/bin/env python
+
+##############################################################################
+##
+## This file is part of Sardana
+##
+## http://www.sardana-controls.org/
+##
+## Copyright 2011 CELLS / ALBA Synchrotron, Bellaterra, Spain
+##
+## Sardana is free software: you can redistribute it and/or modify
+## it under the terms of the GNU Lesser General Public License as published by
+## the Free Software Foundation, either version 3 of the License, or
+## (at your option) any later version.
+##
+## Sardana is distributed in the hope that it will be useful,
+## but WITHOUT ANY WARRANTY; without even the implied warranty of
+## MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+## GNU Lesser General Public License for more details.
+##
+## You should have received a copy of the GNU Lesser General Public License
+## along with Sardana.  If not, see <http://www.gnu.org/licenses/>.
+##
+##############################################################################
+
+"""This module contains a ring buffer of records in a memory mapped file
+(shared memory). It allows a writer (ex: the macro server scan recorder) to
+publish records that any number of local processes can read live, without
+copies and without any communication with the writer.
+
+The file has the following layout (little endian):
+
+====== ====== ========= =====================================================
+Offset Size   Type      Field
+====== ====== ========= =====================================================
+0      8      char[8]   magic: ``SARDRING``
+8      4      uint32    layout version (1)
+12     4      uint32    state: 1 running, 2 ended
+16     8      uint64    write index: number of records written so far
+24     8      int64     serial number (ex: scan ID)
+32     4      uint32    capacity: number of record slots
+36     4      uint32    record size (bytes)
+40     4      uint32    schema offset (bytes)
+44     4      uint32    schema size (bytes)
+48     8      uint64    data offset (bytes)
+56     8      float64   time of the last write index update
+====== ====== ========= =====================================================
+
+The schema is an utf-8 JSON object with the keys:
+
+- ``columns``: list of ``[name, dtype, shape]`` (the fields of the packed
+  numpy structured dtype of a record)
+- ``env``: dictionary with extra information (ex: the scan title)
+
+Record *i* is stored in the slot *i* modulo capacity. The writer writes the
+record and only then increments the write index, so records below the write
+index are complete. A record *i* read while the write index is *w* may be
+overwritten unless *i* > *w* - capacity. Readers must check the write index
+*after* copying a record to know if it is valid (see
+:meth:`RingBufferReader.read`).
+
+Each writer creates a new file and atomically renames it to its final path,
+so readers attached to a previous file keep a consistent view (see
+:meth:`RingBufferReader.isReplaced`)."""
+
+__all__ = ["RingBufferWriter", "RingBufferReader", "get_default_path"]
+
+__docformat__ = 'restructuredtext'
+
+import os
+import re
+import json
+import mmap
+import time
+import struct
+import tempfile
+
+import numpy
+
+MAGIC = 'SARDRING'
+VERSION = 1
+
+StateRunning = 1
+StateEnded = 2
+
+HeaderFormat = '<8sIIQqIIIIQd'
+HeaderSize = 64
+WriteIndexOffset = 16
+StateOffset = 12
+UpdateTimeOffset = 56
+DataAlignment = 64
+
+
+def get_default_path(name):
+    """Returns the default ring buffer file path for the given name (ex: the
+    door name): in /dev/shm if available or in the temporary directory"""
+    directory = '/dev/shm'
+    if not os.path.isdir(directory):
+        directory = tempfile.gettempdir()
+    return os.path.join(directory, 'sardana_' + re.sub(r'[^\w.-]', '_', name))
+
+
+def _get_dtype(columns):
+    return numpy.dtype([(str(name), dtype, tuple(shape))
+                        for name, dtype, shape in columns])
+
+
+class RingBufferWriter(object):
+    """Creates the ring buffer file and writes records in it.
+
+    :param path: the file path
+    :param columns: sequence of (name, dtype, shape) of the record fields
+    :param capacity: number of record slots
+    :param serialno: serial number (ex: scan ID)
+    :param env: dictionary with extra information (must be JSON
+                serializable)"""
+
+    def __init__(self, path, columns, capacity, serialno=0, env=None):
+        self.path = path
+        self.columns = columns = [(str(name), str(numpy.dtype(dtype)),
+                                   list(shape))
+                                  for name, dtype, shape in columns]
+        self.dtype = dtype = _get_dtype(columns)
+        self.capacity = capacity
+        self.write_index = 0
+        schema = json.dumps(dict(columns=columns, env=env or {}))
+        schema = schema.encode('utf-8')
+        data_offset = HeaderSize + len(schema)
+        data_offset += -data_offset % DataAlignment
+        size = data_offset + capacity * dtype.itemsize
+
+        tmp_path = '%s.%d.tmp' % (path, os.getpid())
+        with open(tmp_path, 'w+b') as f:
+            f.truncate(size)
+            self._mmap = mm = mmap.mmap(f.fileno(), size)
+        header = struct.pack(HeaderFormat, MAGIC, VERSION, StateRunning, 0,
+                             serialno, capacity, dtype.itemsize, HeaderSize,
+                             len(schema), data_offset, time.time())
+        mm[:len(header)] = header
+        mm[HeaderSize:HeaderSize + len(schema)] = schema
+        self.records = numpy.ndarray((capacity,), dtype=dtype, buffer=mm,
+                                     offset=data_offset)
+        os.rename(tmp_path, path)
+
+    def write(self, data):
+        """Writes a record.
+
+        :param data: dictionary with the value of each field. Missing fields
+                     (or with None value) are filled with NaN (0 for
+                     integers)"""
+        index = self.write_index
+        slot = self.records[index % self.capacity]
+        for name in self.dtype.names:
+            value = data.get(name)
+            try:
+                if value is None:
+                    raise ValueError
+                slot[name] = value
+            except (ValueError, TypeError):
+                slot[name] = _get_missing(self.dtype.fields[name][0])
+        self._publish(index + 1)
+
+    def _publish(self, write_index):
+        self.write_index = write_index
+        mm = self._mmap
+        struct.pack_into('<Q', mm, WriteIndexOffset, write_index)
+        struct.pack_into('<d', mm, UpdateTimeOffset, time.time())
+
+    def close(self):
+        """Marks the ring buffer as ended and releases it"""
+        if self._mmap is None:
+            return
+        struct.pack_into('<I', self._mmap, StateOffset, StateEnded)
+        self.records = None
+        self._mmap.close()
+        self._mmap = None
+
+
+def _get_missing(dtype):
+    if dtype.base.kind == 'f':
+        return numpy.nan
+    return 0
+
+
+class RingBufferReader(object):
+    """Attaches to a ring buffer file in read only mode.
+
+    :attr:`records` is a read only (zero copy) view of all the slots of the
+    ring. :meth:`read` returns copies of the new records which are
+    guaranteed not to have been overwritten while being copied.
+
+    :param path: the file path"""
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            self._inode = os.fstat(f.fileno()).st_ino
+            self._mmap = mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        header = struct.unpack_from(HeaderFormat, mm, 0)
+        magic, version, _, _, self.serialno, self.capacity, record_size, \
+            schema_offset, schema_size, data_offset, _ = header
+        if magic != MAGIC:
+            raise ValueError("%s is not a ring buffer" % path)
+        if version != VERSION:
+            raise ValueError("Unsupported ring buffer version %d" % version)
+        schema = mm[schema_offset:schema_offset + schema_size]
+        schema = json.loads(schema.decode('utf-8'))
+        self.columns = [tuple(column) for column in schema['columns']]
+        self.env = schema['env']
+        self.dtype = _get_dtype(self.columns)
+        if self.dtype.itemsize != record_size:
+            raise ValueError("Inconsistent ring buffer record size")
+        self.records = numpy.ndarray((self.capacity,), dtype=self.dtype,
+                                     buffer=mm, offset=data_offset)
+        self.records.flags.writeable = False
+
+    def getWriteIndex(self):
+        """Returns the number of records written so far"""
+        return struct.unpack_from('<Q', self._mmap, WriteIndexOffset)[0]
+
+    def getUpdateTime(self):
+        """Returns the time of the last record write"""
+        return struct.unpack_from('<d', self._mmap, UpdateTimeOffset)[0]
+
+    def isEnded(self):
+        """Tells if the writer finished writing records"""
+        state = struct.unpack_from('<I', self._mmap, StateOffset)[0]
+        return state == StateEnded
+
+    def isReplaced(self):
+        """Tells if a new ring buffer was created in the same path (ex: a
+        new scan started). If so, a new reader must be created to read it"""
+        try:
+            return os.stat(self.path).st_ino != self._inode
+        except OSError:
+            return False
+
+    def getOldestIndex(self, write_index=None):
+        """Returns the index of the oldest record that is still valid"""
+        if write_index is None:
+            write_index = self.getWriteIndex()
+        return max(0, write_index - self.capacity + 1)
+
+    def read(self, start=0):
+        """Returns copies of the records from the given index until the last
+        written record. Records already overwritten are skipped.
+
+        :return: (first index, records, next index). next index is the start
+                 of the following read
+        :rtype: tuple<int, numpy.ndarray, int>"""
+        capacity, records = self.capacity, self.records
+        end = self.getWriteIndex()
+        start = max(start, self.getOldestIndex(end))
+        first, last = start % capacity, end % capacity
+        if start >= end:
+            return end, records[:0].copy(), end
+        elif first < last:
+            data = records[first:last].copy()
+        else:
+            data = numpy.concatenate((records[first:], records[:last]))
+        # discard the records overwritten while copying
+        lost = self.getOldestIndex() - start
+        if lost > 0:
+            data = data[lost:]
+            start += lost
+        return start, data, end
+
+    def close(self):
+        self.records = None
+        self._mmap.close()